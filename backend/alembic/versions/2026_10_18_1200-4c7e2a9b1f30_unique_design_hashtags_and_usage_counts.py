@@ -0,0 +1,51 @@
+"""Unique design hashtags and hashtag usage counts
+
+Makes (design_id, hashtag) unique so hashtags can be written with one
+INSERT ... ON CONFLICT per design, and backfills hashtags.usage_count,
+which was never maintained before.
+
+Also merges the two heads (10641ba5505d, 8a1b2c3d4e5f).
+
+Revision ID: 4c7e2a9b1f30
+Revises: 10641ba5505d, 8a1b2c3d4e5f
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4c7e2a9b1f30'
+down_revision = ('10641ba5505d', '8a1b2c3d4e5f')
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Remove duplicate (design_id, hashtag) rows, keeping the first one
+    op.execute("""
+        DELETE FROM design_hashtags a
+        USING design_hashtags b
+        WHERE a.design_id = b.design_id
+          AND a.hashtag = b.hashtag
+          AND a.id > b.id
+    """)
+    
+    op.execute("DROP INDEX IF EXISTS idx_design_hashtag")
+    op.create_index('idx_design_hashtag', 'design_hashtags', ['design_id', 'hashtag'], unique=True)
+    
+    # Backfill usage counts from existing design hashtags
+    op.execute("""
+        INSERT INTO hashtags (name, usage_count)
+        SELECT hashtag, COUNT(*)
+        FROM design_hashtags
+        WHERE char_length(hashtag) <= 50
+        GROUP BY hashtag
+        ON CONFLICT (name) DO UPDATE SET usage_count = EXCLUDED.usage_count, updated_at = now()
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_design_hashtag', table_name='design_hashtags')
+    op.create_index('idx_design_hashtag', 'design_hashtags', ['design_id', 'hashtag'], unique=False)
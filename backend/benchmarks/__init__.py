@@ -0,0 +1,3 @@
+"""
+Benchmarks for performance-sensitive code paths. Run with python -m from backend/.
+"""
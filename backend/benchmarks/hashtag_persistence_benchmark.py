@@ -0,0 +1,101 @@
+"""
+Round-trip benchmark for design hashtag persistence.
+
+Counts the statements sent to PostgreSQL while saving the hashtags of one
+design, for the previous ORM path (one DesignHashtag object per tag, Python
+duplicate check, its own commit) and the bulk path
+(HashtagService.save_hashtags_to_db: one INSERT ... ON CONFLICT statement that
+also upserts hashtags.usage_count, committed with the design).
+
+Everything runs inside a transaction that is rolled back, so the database is
+left unchanged. Needs the database from .env with the 4c7e2a9b1f30 migration
+applied.
+
+Usage (from backend/):
+    python -m benchmarks.hashtag_persistence_benchmark [--designs 50]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from typing import List
+
+from sqlalchemy import event
+
+from config.database import engine, async_session_maker
+from models.design_models_db import Design, DesignHashtag
+from services.design.hashtag_service import HashtagService
+
+SAMPLE_HASHTAGS = [
+    "#ic_tasarim", "#ev_tasarimi", "#salon_dekorasyonu", "#modern_salon", "#minimalist",
+    "#notr_renkler", "#aile_dostu", "#rahat", "#fonksiyonel", "#dogal_isik"
+]
+
+
+class StatementCounter:
+    """Counts statements executed on the engine."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+async def legacy_save(db, design_id: str, english_hashtags: List[str], turkish_hashtags: List[str]):
+    """Previous HashtagService.save_hashtags_to_db (without its commit)."""
+    all_hashtags = []
+    for i, en_tag in enumerate(english_hashtags):
+        if en_tag.strip():
+            all_hashtags.append((en_tag, i))
+    for i, tr_tag in enumerate(turkish_hashtags):
+        if tr_tag.strip() and tr_tag not in [h[0] for h in all_hashtags]:
+            all_hashtags.append((tr_tag, len(english_hashtags) + i))
+    for hashtag_text, order_index in all_hashtags:
+        db.add(DesignHashtag(design_id=design_id, hashtag=hashtag_text, order_index=order_index))
+    await db.flush()
+
+
+async def run(designs: int):
+    counter = StatementCounter()
+    hashtag_service = HashtagService()
+    results = {}
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+
+    async with async_session_maker() as db:
+        for name in ("legacy ORM", "bulk upsert"):
+            statements = 0
+            elapsed = 0.0
+            for _ in range(designs):
+                design_id = str(uuid.uuid4())
+                db.add(Design(id=design_id, title="benchmark", description="benchmark", room_type="salon", design_style="modern"))
+                await db.flush()
+
+                counter.count = 0
+                started = time.perf_counter()
+                if name == "legacy ORM":
+                    await legacy_save(db, design_id, [], SAMPLE_HASHTAGS)
+                else:
+                    await hashtag_service.save_hashtags_to_db(db, design_id, [], SAMPLE_HASHTAGS)
+                elapsed += time.perf_counter() - started
+                statements += counter.count
+            results[name] = (statements / designs, elapsed / designs * 1000)
+        await db.rollback()
+    event.remove(engine.sync_engine, "before_cursor_execute", counter)
+
+    print(f"{'path':<14}{'statements/design':>20}{'ms/design':>12}")
+    for name, (statements, ms) in results.items():
+        print(f"{name:<14}{statements:>20.1f}{ms:>12.2f}")
+    print("\nlegacy ORM also committed separately from the design (+1 COMMIT) and never updated usage_count.")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--designs", type=int, default=50)
+    args = arg_parser.parse_args()
+
+    asyncio.run(run(args.designs))
+
+
+if __name__ == "__main__":
+    main()
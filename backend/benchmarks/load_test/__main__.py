@@ -0,0 +1,386 @@
+"""
+End-to-end load test of the design request and room visualization pipeline.
+
+Starts the real app (benchmarks.load_test.server) with Gemini and Vertex Imagen
+replaced by deterministic stubs, then runs concurrent virtual users. Each user
+keeps one WebSocket open like the frontend does and sends design requests to
+POST /api/design/test with its connection_id, waiting for the room
+visualization to finish before the next request.
+
+Stages (measured from the moment the design request is sent):
+    design_request      response of POST /api/design/test
+    first_progress      first room_visualization_progress frame
+    room_visualization  room_visualization_completed frame
+
+Every request is unique by default (the user and request number are added to
+the notes), so the run measures generation throughput rather than request
+coalescing or the Imagen result cache. --duplicate-rate sends that fraction
+of requests as one of the shared sample payloads instead. The Imagen cache
+starts empty in every run.
+
+The server runs in a temporary working directory, so generated mood board
+images, the Imagen cache and log files never land in the source tree; only
+data/products (read-only inputs) and .env are linked into it. Without a .env
+the placeholders of .env.example are used (Gemini and Imagen are stubbed).
+
+The database is a fresh SQLite file by default; pass --database-url to use a
+scratch PostgreSQL database instead (the schema is created if missing, rows
+written by the run are left in place).
+
+With --baseline the p50/p95/p99 of every stage are compared with a stored run
+and the process exits with status 1 when one is slower than
+baseline * (1 + tolerance) + min-delta, or when the error rate grew. Baselines
+are only compared with runs using the same load and stub settings.
+
+Usage (from backend/):
+    python -m benchmarks.load_test [--clients 20] [--requests 5] [--baseline benchmarks/load_test/baseline.json]
+    python -m benchmarks.load_test --baseline benchmarks/load_test/baseline.json --update-baseline
+    python -m benchmarks.load_test --imagen-latency 6:0.4 --imagen-failure-rate 0.1 --no-websocket
+    python -m benchmarks.load_test --duplicate-rate 0.3
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+import websockets
+
+from .stubs import STUB_TITLE_PREFIX, StubConfig, add_stub_arguments
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+STAGES = ("design_request", "first_progress", "room_visualization")
+PERCENTILES = ("p50", "p95", "p99")
+
+SAMPLE_REQUESTS = [
+    {"room_type": "Oturma Odası", "design_style": "Modern", "notes": "Geniş bir kitaplık ve rahat bir okuma koltuğu istiyorum, doğal ışık önemli."},
+    {"room_type": "Yatak Odası", "design_style": "Minimalist", "notes": "Az eşya, açık renkler ve bol depolama alanı olsun."},
+    {"room_type": "Çalışma Odası", "design_style": "İskandinav", "notes": "Çalışma masası pencere önünde olsun, bitkiler ekleyelim."},
+    {"room_type": "Yemek Odası", "design_style": "Klasik", "notes": "Altı kişilik yemek masası ve büfe, sıcak tonlar."},
+]
+
+
+class StageRecorder:
+    """Collects stage latencies (seconds) and error counts of all virtual users."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+        self.errors: Dict[str, int] = {}
+        self.designs = 0
+        self.wall_seconds = 0.0
+
+    def record(self, stage: str, seconds: float):
+        self.samples[stage].append(seconds)
+
+    def error(self, kind: str):
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    @property
+    def error_rate(self) -> float:
+        return sum(self.errors.values()) / self.designs if self.designs else 0.0
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Percentiles per stage in milliseconds."""
+        summary = {}
+        for stage, samples in self.samples.items():
+            if not samples:
+                continue
+            if len(samples) == 1:
+                cuts = samples * 99
+            else:
+                cuts = statistics.quantiles(samples, n=100, method="inclusive")
+            summary[stage] = {
+                "count": len(samples),
+                "p50": round(cuts[49] * 1000, 1),
+                "p95": round(cuts[94] * 1000, 1),
+                "p99": round(cuts[98] * 1000, 1),
+                "max": round(max(samples) * 1000, 1),
+            }
+        return summary
+
+
+async def read_frames(ws, frames: asyncio.Queue):
+    """Route server frames to the user and answer application-level pings."""
+    async for text in ws:
+        message = json.loads(text)
+        if message.get("type") == "ping":
+            await ws.send(json.dumps({"type": "pong"}))
+        else:
+            await frames.put(message)
+
+
+async def wait_for_visualization(frames: asyncio.Queue, started: float, recorder: StageRecorder, timeout: float):
+    """Wait for the job's progress frames until it completes or fails."""
+    deadline = started + timeout
+    first_progress = False
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            recorder.error("visualization_timeout")
+            return
+        try:
+            message = await asyncio.wait_for(frames.get(), remaining)
+        except asyncio.TimeoutError:
+            continue
+
+        message_type = message.get("type")
+        if message_type == "room_visualization_progress" and not first_progress:
+            first_progress = True
+            recorder.record("first_progress", time.perf_counter() - started)
+        elif message_type == "room_visualization_completed":
+            recorder.record("room_visualization", time.perf_counter() - started)
+            return
+        elif message_type == "room_visualization_error":
+            recorder.error("visualization_error")
+            return
+
+
+def design_payload(index: int, number: int, rng: random.Random, duplicate_rate: float) -> Dict[str, Any]:
+    """Request ``number`` of user ``index``: a shared sample payload or a unique variant of one."""
+    payload = dict(SAMPLE_REQUESTS[(index + number) % len(SAMPLE_REQUESTS)])
+    if rng.random() >= duplicate_rate:
+        payload["notes"] += f" (kullanıcı {index}, istek {number})"
+    return payload
+
+
+async def virtual_user(index: int, base_url: str, requests: int, recorder: StageRecorder, args: argparse.Namespace):
+    """One frontend session: a WebSocket plus sequential design requests."""
+    ws = None
+    reader = None
+    frames: asyncio.Queue = asyncio.Queue()
+    connection_id = None
+    rng = random.Random(args.seed * 1009 + index)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout) as client:
+        try:
+            if not args.no_websocket:
+                ws_url = base_url.replace("http://", "ws://", 1) + "/api/ws"
+                ws = await websockets.connect(ws_url, max_size=None)  # completed frames carry the image
+                connection_id = json.loads(await ws.recv())["connection_id"]
+                reader = asyncio.create_task(read_frames(ws, frames))
+
+            for number in range(requests):
+                payload = design_payload(index, number, rng, args.duplicate_rate)
+                payload.update({"width": 400, "length": 500, "height": 270, "price": 50000, "connection_id": connection_id})
+                while not frames.empty():
+                    frames.get_nowait()
+
+                recorder.designs += 1
+                started = time.perf_counter()
+                try:
+                    response = await client.post("/api/design/test", json=payload)
+                    response.raise_for_status()
+                    body = response.json()
+                except (httpx.HTTPError, ValueError):
+                    recorder.error("design_http_error")
+                    continue
+                recorder.record("design_request", time.perf_counter() - started)
+
+                if not body.get("success") or not body.get("design_id"):
+                    # Error response: no visualization is scheduled
+                    recorder.error("design_error")
+                    continue
+                if not (body.get("design_title") or "").startswith(STUB_TITLE_PREFIX):
+                    # Gemini failed and the service answered with its fallback design
+                    recorder.error("design_fallback")
+                if ws is not None:
+                    await wait_for_visualization(frames, started, recorder, args.timeout)
+        finally:
+            if reader is not None:
+                reader.cancel()
+            if ws is not None:
+                await ws.close()
+
+
+async def run_load(base_url: str, args: argparse.Namespace) -> StageRecorder:
+    if args.warmup:
+        # Own user index, so warm-up payloads are not repeated by the measured users
+        await virtual_user(args.clients, base_url, args.warmup, StageRecorder(), args)
+
+    recorder = StageRecorder()
+    started = time.perf_counter()
+    await asyncio.gather(*(virtual_user(index, base_url, args.requests, recorder, args) for index in range(args.clients)))
+    recorder.wall_seconds = time.perf_counter() - started
+    return recorder
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def prepare_server_dir(temp_dir: str) -> str:
+    """Working directory for the server: relative data/ and logs/ paths resolve inside the run's temp dir."""
+    server_dir = os.path.join(temp_dir, "server")
+    os.makedirs(os.path.join(server_dir, "data"))
+    # Product images (reference images for Imagen) and settings are only read
+    env_file = BACKEND_DIR / ".env"
+    if not env_file.exists():
+        env_file = BACKEND_DIR / ".env.example"
+    for source, target in ((BACKEND_DIR / "data" / "products", os.path.join("data", "products")), (env_file, ".env")):
+        if source.exists():
+            os.symlink(source, os.path.join(server_dir, target), target_is_directory=source.is_dir())
+    return server_dir
+
+
+def start_server(port: int, database_url: str, config: StubConfig, server_dir: str, log_path: str) -> subprocess.Popen:
+    command = [
+        sys.executable, "-m", "benchmarks.load_test.server",
+        "--port", str(port), "--database-url", database_url, *config.to_argv()
+    ]
+    log_file = open(log_path, "w", encoding="utf-8")
+    python_path = os.pathsep.join(filter(None, [str(BACKEND_DIR), os.environ.get("PYTHONPATH")]))
+    env = dict(os.environ, PYTHONPATH=python_path)
+    return subprocess.Popen(command, cwd=server_dir, env=env, stdout=log_file, stderr=subprocess.STDOUT)
+
+
+def wait_until_ready(process: subprocess.Popen, base_url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with status {process.returncode}")
+        try:
+            if httpx.get(base_url + "/", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server not ready after {timeout:.0f}s")
+
+
+def run_settings(args: argparse.Namespace, config: StubConfig, database_url: str) -> Dict[str, Any]:
+    """Settings that must match for two runs to be comparable."""
+    return {
+        "clients": args.clients,
+        "requests": args.requests,
+        "duplicate_rate": args.duplicate_rate,
+        "websocket": not args.no_websocket,
+        "database": database_url.split(":", 1)[0],
+        "stubs": config.__dict__,
+    }
+
+
+def compare_with_baseline(result: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, min_delta_ms: float, max_error_rate_increase: float) -> List[str]:
+    """Regressions of result against baseline (empty when it passes)."""
+    regressions = []
+    for stage, percentiles in baseline["stages"].items():
+        current = result["stages"].get(stage)
+        if current is None:
+            regressions.append(f"{stage}: no samples (baseline had {percentiles['count']})")
+            continue
+        for name in PERCENTILES:
+            limit = percentiles[name] * (1 + tolerance) + min_delta_ms
+            if current[name] > limit:
+                regressions.append(f"{stage} {name}: {current[name]:.1f} ms > {limit:.1f} ms (baseline {percentiles[name]:.1f} ms)")
+
+    if result["error_rate"] > baseline["error_rate"] + max_error_rate_increase:
+        regressions.append(f"error rate: {result['error_rate']:.1%} > baseline {baseline['error_rate']:.1%}")
+    return regressions
+
+
+def print_report(result: Dict[str, Any], baseline: Optional[Dict[str, Any]]):
+    print(f"{'stage':<20}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'base p95':>10}")
+    for stage in STAGES:
+        row = result["stages"].get(stage)
+        if row is None:
+            continue
+        base = baseline["stages"].get(stage, {}).get("p95") if baseline else None
+        base_text = f"{base:.1f}" if base is not None else "-"
+        print(f"{stage:<20}{row['count']:>7}{row['p50']:>10.1f}{row['p95']:>10.1f}{row['p99']:>10.1f}{row['max']:>10.1f}{base_text:>10}")
+    print()
+    print(f"designs: {result['designs']}, {result['throughput']:.2f} designs/s, error rate {result['error_rate']:.1%} {result['errors'] or ''}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--clients", type=int, default=20, help="Concurrent virtual users")
+    arg_parser.add_argument("--requests", type=int, default=5, help="Design requests per user")
+    arg_parser.add_argument("--duplicate-rate", type=float, default=0.0,
+                            help="Fraction of requests sent as shared sample payloads (coalesced / cached)")
+    arg_parser.add_argument("--warmup", type=int, default=2, help="Unmeasured requests before the run")
+    arg_parser.add_argument("--timeout", type=float, default=120.0, help="Seconds per design request and visualization")
+    arg_parser.add_argument("--no-websocket", action="store_true", help="Only measure design requests (no visualization)")
+    arg_parser.add_argument("--database-url", help="Default: a fresh SQLite file (sqlite+aiosqlite)")
+    arg_parser.add_argument("--baseline", help="Baseline JSON to compare with (or to write with --update-baseline)")
+    arg_parser.add_argument("--update-baseline", action="store_true")
+    arg_parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown per percentile")
+    arg_parser.add_argument("--min-delta-ms", type=float, default=50.0, help="Allowed absolute slowdown per percentile")
+    arg_parser.add_argument("--max-error-rate-increase", type=float, default=0.01)
+    add_stub_arguments(arg_parser)
+    args = arg_parser.parse_args()
+    config = StubConfig.from_args(args)
+
+    with tempfile.TemporaryDirectory(prefix="deko_loadtest_") as temp_dir:
+        database_url = args.database_url or f"sqlite+aiosqlite:///{os.path.join(temp_dir, 'loadtest.db')}"
+        log_path = os.path.join(temp_dir, "server.log")
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+
+        process = start_server(port, database_url, config, prepare_server_dir(temp_dir), log_path)
+        try:
+            wait_until_ready(process, base_url)
+            print(f"Server ready on {base_url} ({database_url.split(':', 1)[0]}), "
+                  f"{args.clients} clients x {args.requests} requests")
+            recorder = asyncio.run(run_load(base_url, args))
+        except RuntimeError as e:
+            with open(log_path, encoding="utf-8") as f:
+                print(f.read()[-4000:])
+            print(f"Load test failed: {e}")
+            sys.exit(2)
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    result = {
+        "settings": run_settings(args, config, database_url),
+        "stages": recorder.summary(),
+        "designs": recorder.designs,
+        "errors": recorder.errors,
+        "error_rate": round(recorder.error_rate, 4),
+        "throughput": round(recorder.designs / recorder.wall_seconds, 3),
+    }
+
+    baseline = None
+    if args.baseline and not args.update_baseline:
+        if not os.path.exists(args.baseline):
+            print(f"Baseline {args.baseline} not found; record one with --update-baseline")
+            sys.exit(2)
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print()
+    print_report(result, baseline)
+
+    if args.update_baseline:
+        if not args.baseline:
+            arg_parser.error("--update-baseline needs --baseline")
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+        return
+
+    if baseline is not None:
+        if baseline["settings"] != result["settings"]:
+            print("\nBaseline was recorded with different load or stub settings; re-record it with --update-baseline")
+            sys.exit(2)
+        regressions = compare_with_baseline(result, baseline, args.tolerance, args.min_delta_ms, args.max_error_rate_increase)
+        if regressions:
+            print("\nREGRESSIONS:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("\nNo regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Application server for the load test: the real app with Gemini and Imagen stubbed.
+
+Started by the runner in its own process, so the load generator does not share
+the server's event loop. Creates the schema (create_all) before serving.
+
+Usage (from backend/):
+    python -m benchmarks.load_test.server --port 8765 --database-url sqlite+aiosqlite:///loadtest.db
+"""
+import argparse
+import asyncio
+import os
+
+from .stubs import StubConfig, add_stub_arguments, install_stubs
+
+
+async def create_schema():
+    from config.database import Base, engine
+    import models.user_models  # noqa: F401 - registers the tables
+    import models.design_models_db  # noqa: F401
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    # The pool's connections belong to this event loop; uvicorn starts a new one
+    await engine.dispose()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8765)
+    arg_parser.add_argument("--database-url", required=True)
+    add_stub_arguments(arg_parser)
+    args = arg_parser.parse_args()
+
+    # Settings are read on import: point them at the load test database first
+    os.environ["DATABASE_URL"] = args.database_url
+    install_stubs(StubConfig.from_args(args))
+    asyncio.run(create_schema())
+
+    import uvicorn
+    from config import settings
+    from main import app
+
+    uvicorn.run(
+        app,
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+        ws_ping_interval=settings.WS_PING_INTERVAL,
+        ws_ping_timeout=settings.WS_PING_TIMEOUT
+    )
+
+
+if __name__ == "__main__":
+    main()
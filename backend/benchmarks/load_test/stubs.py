@@ -0,0 +1,288 @@
+"""
+Deterministic local stand-ins for Gemini and Vertex Imagen.
+
+Latencies are drawn from seeded log-normal distributions and calls fail with
+a configured probability, so two runs with the same settings put the same
+load on the application. The stubs replace only the model objects behind the
+network calls; rate limiting, resilience policies, the function calling loop,
+prompt building, product searches, response parsing, database writes,
+WebSocket progress and image encoding all run the real application code.
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+import types
+from dataclasses import asdict, dataclass
+from typing import List, Optional, Tuple
+
+from PIL import Image
+
+# Categories the stub "asks" the product tool for (FunctionCallHandler round trips)
+STUB_CATEGORIES = ["koltuk", "sehpa", "tv_unitesi", "kitaplik", "aydinlatma", "hali", "berjer", "yemek_masasi"]
+STUB_TITLE_PREFIX = "Load test design"
+STUB_HASHTAGS = ["#modern", "#cozy", "#minimalist", "#natural_light", "#family_friendly", "#warm_tones", "#scandinavian", "#plants"]
+
+
+class StubFailure(Exception):
+    """Failure injected by a stub."""
+
+
+class LatencyDistribution:
+    """Log-normal latency: median seconds, spread sigma (0 = constant)."""
+
+    def __init__(self, median: float, sigma: float, seed: int):
+        self.median = median
+        self.sigma = sigma
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()  # Imagen stubs are called from executor threads
+
+    @classmethod
+    def parse(cls, value: str, seed: int) -> "LatencyDistribution":
+        """Parse "MEDIAN" or "MEDIAN:SIGMA" (seconds)."""
+        median, _, sigma = value.partition(":")
+        return cls(float(median), float(sigma or 0.0), seed)
+
+    def sample(self) -> float:
+        with self._lock:
+            return self.median * math.exp(self.sigma * self._random.gauss(0.0, 1.0))
+
+    def fails(self, rate: float) -> bool:
+        with self._lock:
+            return self._random.random() < rate
+
+
+@dataclass
+class StubConfig:
+    """Stub behaviour; recorded with baselines so only like-for-like runs are compared."""
+    seed: int = 42
+    gemini_latency: str = "1.5:0.35"  # Function calling session (design suggestion)
+    gemini_failure_rate: float = 0.0
+    tool_calls: int = 3  # find_product round trips per design
+    prompt_latency: str = "0.8:0.3"  # Imagen prompt enhancement (blocking generate_content)
+    prompt_failure_rate: float = 0.0
+    imagen_latency: str = "4.0:0.25"
+    imagen_failure_rate: float = 0.0
+    image_size: int = 1024
+
+    def to_argv(self) -> List[str]:
+        argv = []
+        for name, value in asdict(self).items():
+            argv += [f"--{name.replace('_', '-')}", str(value)]
+        return argv
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> "StubConfig":
+        return cls(**{name: getattr(args, name) for name in cls.__dataclass_fields__})
+
+
+def add_stub_arguments(parser: argparse.ArgumentParser):
+    """Stub options shared by the runner and the server process."""
+    defaults = StubConfig()
+    group = parser.add_argument_group("stubs", "latency is MEDIAN[:SIGMA] in seconds (log-normal)")
+    group.add_argument("--seed", type=int, default=defaults.seed)
+    group.add_argument("--gemini-latency", default=defaults.gemini_latency)
+    group.add_argument("--gemini-failure-rate", type=float, default=defaults.gemini_failure_rate)
+    group.add_argument("--tool-calls", type=int, default=defaults.tool_calls)
+    group.add_argument("--prompt-latency", default=defaults.prompt_latency)
+    group.add_argument("--prompt-failure-rate", type=float, default=defaults.prompt_failure_rate)
+    group.add_argument("--imagen-latency", default=defaults.imagen_latency)
+    group.add_argument("--imagen-failure-rate", type=float, default=defaults.imagen_failure_rate)
+    group.add_argument("--image-size", type=int, default=defaults.image_size)
+
+
+def build_design_response(seed: int, categories: List[str]) -> str:
+    """Design JSON in the shape Gemini returns (see services/ai/design_schema.py)."""
+    rng = random.Random(seed)
+    return json.dumps({
+        "title": f"{STUB_TITLE_PREFIX} {seed}",
+        "description": "A calm living room with natural materials, soft light and a clear walking path. " * 4,
+        "hashtags": rng.sample(STUB_HASHTAGS, 5),
+        "products": [
+            {
+                "category": category,
+                "name": f"Stub {category} {index}",
+                "description": f"A {category} that fits the room's style and dimensions.",
+                "price": rng.randint(500, 25000),
+                "style": "modern",
+                "color": rng.choice(["beyaz", "gri", "bej", "siyah"]),
+            }
+            for index, category in enumerate(categories)
+        ],
+    }, ensure_ascii=False)
+
+
+class StubGemini:
+    """Stand-ins for the Gemini model objects; GeminiClient's own code (limiter, resilience, tool loop) runs on top."""
+
+    def __init__(self, config: StubConfig):
+        self.config = config
+        self.design_latency = LatencyDistribution.parse(config.gemini_latency, config.seed)
+        self.prompt_latency = LatencyDistribution.parse(config.prompt_latency, config.seed + 1)
+        self._designs = 0
+        self._lock = threading.Lock()
+
+    def _next_design(self) -> Tuple[int, List[str]]:
+        """Number and product categories of the next design."""
+        with self._lock:
+            self._designs += 1
+            number = self._designs
+        rng = random.Random(self.config.seed * 100003 + number)
+        return number, rng.sample(STUB_CATEGORIES, min(max(self.config.tool_calls, 1), len(STUB_CATEGORIES)))
+
+    def tools_model(self) -> "StubToolsModel":
+        return StubToolsModel(self)
+
+    def text_model(self) -> "StubTextModel":
+        return StubTextModel(self)
+
+    def prompt_model(self) -> "StubPromptModel":
+        return StubPromptModel(self)
+
+
+def _stub_response(parts: list, text: str = "") -> types.SimpleNamespace:
+    """Response shaped like the SDK's GenerateContentResponse (candidates[0].content.parts, text)."""
+    return types.SimpleNamespace(
+        candidates=[types.SimpleNamespace(content=types.SimpleNamespace(parts=parts))],
+        text=text
+    )
+
+
+class StubStream:
+    """Streamed response: iterating yields chunks (blocking, like the SDK); candidates holds the whole answer."""
+
+    def __init__(self, response: types.SimpleNamespace, chunk_size: int = 200, chunk_delay: float = 0.02):
+        self.candidates = response.candidates
+        self.text = response.text
+        self._response = response
+        self._chunk_size = chunk_size
+        self._chunk_delay = chunk_delay
+
+    def __iter__(self):
+        if not self.text:
+            yield self._response
+            return
+        for start in range(0, len(self.text), self._chunk_size):
+            time.sleep(self._chunk_delay)
+            chunk = self.text[start:start + self._chunk_size]
+            yield _stub_response([types.SimpleNamespace(text=chunk)], chunk)
+
+
+class StubChat:
+    """
+    One function calling session: a find_product call per category (answered by the
+    real FunctionCallHandler and product search), then the design JSON.
+    The session's model time is spread across its turns.
+    """
+
+    def __init__(self, gemini: StubGemini):
+        self._gemini = gemini
+        self.number, categories = gemini._next_design()
+        self.categories = categories[:gemini.config.tool_calls]
+        self._turn_latency = gemini.design_latency.sample() / (len(self.categories) + 1)
+        self._turn = 0
+
+    def send_message(self, message, stream: bool = False):
+        time.sleep(self._turn_latency)
+        if self._turn < len(self.categories):
+            category = self.categories[self._turn]
+            self._turn += 1
+            function_call = types.SimpleNamespace(name="find_product", args={"category": category, "limit": 2})
+            response = _stub_response([types.SimpleNamespace(function_call=function_call)])
+        else:
+            if self._gemini.design_latency.fails(self._gemini.config.gemini_failure_rate):
+                raise StubFailure("stub Gemini failure")
+            text = build_design_response(self.number, self.categories)
+            response = _stub_response([types.SimpleNamespace(text=text)], text)
+        return StubStream(response) if stream else response
+
+
+class StubToolsModel:
+    """Stand-in for GeminiClient.model_with_tools."""
+
+    def __init__(self, gemini: StubGemini):
+        self._gemini = gemini
+
+    def start_chat(self) -> StubChat:
+        return StubChat(self._gemini)
+
+
+class StubTextModel:
+    """Stand-in for GeminiClient.model (plain generate_content and schema repair calls)."""
+
+    def __init__(self, gemini: StubGemini):
+        self._gemini = gemini
+
+    def generate_content(self, prompt: str, **kwargs):
+        time.sleep(self._gemini.design_latency.sample())
+        if self._gemini.design_latency.fails(self._gemini.config.gemini_failure_rate):
+            raise StubFailure("stub Gemini failure")
+        text = build_design_response(0, STUB_CATEGORIES[:self._gemini.config.tool_calls])
+        return _stub_response([types.SimpleNamespace(text=text)], text)
+
+
+class StubPromptModel:
+    """Stand-in for genai.GenerativeModel used synchronously by MoodBoardService."""
+
+    def __init__(self, gemini: StubGemini):
+        self._gemini = gemini
+
+    def generate_content(self, prompt: str):
+        # Blocking like the real SDK call (MoodBoardService runs it in a worker thread)
+        time.sleep(self._gemini.prompt_latency.sample())
+        if self._gemini.prompt_latency.fails(self._gemini.config.prompt_failure_rate):
+            raise StubFailure("stub prompt enhancement failure")
+        return types.SimpleNamespace(text=f"Photorealistic interior render. {prompt[:400]}")
+
+
+class StubImageGenerationModel:
+    """Stand-in for vertexai.preview.vision_models.ImageGenerationModel."""
+
+    _config: Optional[StubConfig] = None
+    _latency: Optional[LatencyDistribution] = None
+    _image: Optional[Image.Image] = None
+
+    @classmethod
+    def configure(cls, config: StubConfig):
+        cls._config = config
+        cls._latency = LatencyDistribution.parse(config.imagen_latency, config.seed + 2)
+        # Noise compresses like a photo, so PNG encoding costs what a real render costs
+        cls._image = Image.effect_noise((config.image_size, config.image_size), 48).convert("RGB")
+
+    @classmethod
+    def from_pretrained(cls, model_name: str) -> "StubImageGenerationModel":
+        return cls()
+
+    def generate_images(self, prompt: str, number_of_images: int = 1, **kwargs):
+        time.sleep(self._latency.sample())
+        if self._latency.fails(self._config.imagen_failure_rate):
+            raise StubFailure("stub Imagen failure")
+        images = [types.SimpleNamespace(_pil_image=self._image.copy()) for _ in range(number_of_images)]
+        return types.SimpleNamespace(images=images)
+
+
+def install_stubs(config: StubConfig):
+    """
+    Patch the Gemini and Vertex entry points. Must run before main is imported
+    (the app's startup warm-up imports the Imagen SDK).
+    """
+    from google.cloud import aiplatform
+    aiplatform.init = lambda *args, **kwargs: None
+
+    StubImageGenerationModel.configure(config)
+    vision_models = types.ModuleType("vertexai.preview.vision_models")
+    vision_models.ImageGenerationModel = StubImageGenerationModel
+    sys.modules["vertexai.preview.vision_models"] = vision_models
+
+    # Replace the model objects (not GeminiClient's methods), so the rate limiter,
+    # the resilience policy and the function calling loop run under load
+    gemini = StubGemini(config)
+    from services.ai.gemini_client import GeminiClient
+    GeminiClient.model = gemini.text_model()
+    GeminiClient.model_with_tools = gemini.tools_model()
+
+    from services.design.mood_board_service import mood_board_service
+    mood_board_service.gemini_model = gemini.prompt_model()
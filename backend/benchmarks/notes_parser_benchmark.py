@@ -0,0 +1,129 @@
+"""
+Microbenchmark for NotesParser keyword detection.
+
+Compares the previous per-keyword substring search (one scan of the notes per
+keyword) with the compiled KeywordMatcher (one scan in total). Notes are taken
+from the recorded requests in logs/gemini_prompts_*.json and
+data/mood_board_history.json; long notes are built by concatenating them.
+
+The second table grows the keyword list with generated words to show how
+both approaches scale as keywords are added.
+
+Usage (from backend/):
+    python -m benchmarks.notes_parser_benchmark [--sizes 200,10000,100000] [--keyword-counts 250,1000] [--repeat 200]
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import time
+from typing import Callable, Dict, List, Tuple
+
+from services.ai.keyword_matcher import KeywordMatcher
+from services.ai.notes_parser import KEYWORD_MAPPING
+
+
+def load_recorded_notes(logs_dir: str, history_path: str) -> List[str]:
+    notes = []
+    for path in sorted(glob.glob(os.path.join(logs_dir, "gemini_prompts_*.json"))):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    notes.append(json.loads(line).get("prompt_data", {}).get("notes") or "")
+    if os.path.exists(history_path):
+        with open(history_path, encoding="utf-8") as f:
+            notes.extend(entry.get("user_input", {}).get("notes") or "" for entry in json.load(f))
+    return list(dict.fromkeys(note for note in notes if note.strip()))
+
+
+def legacy_find(notes: str, mapping: Dict[str, List[str]] = KEYWORD_MAPPING) -> List[Tuple[str, str]]:
+    """Previous NotesParser behaviour: substring search per keyword on notes.lower()."""
+    notes_lower = notes.lower()
+    found = []
+    for category, keywords in mapping.items():
+        for keyword in keywords:
+            if keyword in notes_lower:
+                found.append((category, keyword))
+                break
+    return found
+
+
+def grow_mapping(keyword_count: int, seed: int = 7) -> Dict[str, List[str]]:
+    """KEYWORD_MAPPING padded with generated Turkish-looking words up to ``keyword_count`` keywords."""
+    rng = random.Random(seed)
+    letters = "abcçdefgğhıijklmnoöprsştuüvyz"
+    mapping = {category: list(keywords) for category, keywords in KEYWORD_MAPPING.items()}
+    categories = list(mapping)
+    total = sum(len(keywords) for keywords in mapping.values())
+    while total < keyword_count:
+        word = "".join(rng.choice(letters) for _ in range(rng.randint(5, 12)))
+        mapping[categories[total % len(categories)]].append(word)
+        total += 1
+    return mapping
+
+
+def build_long_notes(notes: List[str], size: int) -> str:
+    parts, length, index = [], 0, 0
+    while length < size:
+        note = notes[index % len(notes)]
+        parts.append(note)
+        length += len(note) + 1
+        index += 1
+    return "\n".join(parts)[:size]
+
+
+def time_per_call(func: Callable[[str], object], text: str, repeat: int) -> float:
+    """Mean microseconds per call."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(text)
+    return (time.perf_counter() - started) / repeat * 1_000_000
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--logs-dir", default="logs")
+    arg_parser.add_argument("--history", default=os.path.join("data", "mood_board_history.json"))
+    arg_parser.add_argument("--sizes", default="200,10000,100000", help="Comma separated note lengths (chars)")
+    arg_parser.add_argument("--keyword-counts", default="250,1000", help="Comma separated keyword list sizes")
+    arg_parser.add_argument("--repeat", type=int, default=200)
+    args = arg_parser.parse_args()
+
+    notes = load_recorded_notes(args.logs_dir, args.history)
+    if not notes:
+        print("No recorded notes found")
+        return
+
+    started = time.perf_counter()
+    matcher = KeywordMatcher(KEYWORD_MAPPING)
+    compile_ms = (time.perf_counter() - started) * 1000
+    keyword_count = sum(len(keywords) for keywords in KEYWORD_MAPPING.values())
+    print(f"{keyword_count} keywords in {len(KEYWORD_MAPPING)} categories, compiled in {compile_ms:.2f} ms")
+
+    differences = [(note, legacy_find(note), matcher.find(note)) for note in notes if legacy_find(note) != matcher.find(note)]
+    print(f"Recorded notes: {len(notes)}, identical findings: {len(notes) - len(differences)}")
+    for note, legacy, current in differences:
+        print(f"  differs: {note[:80]!r}\n    legacy:  {legacy}\n    matcher: {current}")
+
+    print()
+    print(f"{'chars':>10}{'legacy us':>12}{'matcher us':>12}{'speedup':>10}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        text = build_long_notes(notes, size)
+        legacy_us = time_per_call(legacy_find, text, args.repeat)
+        matcher_us = time_per_call(matcher.find, text, args.repeat)
+        print(f"{len(text):>10}{legacy_us:>12.1f}{matcher_us:>12.1f}{legacy_us / matcher_us:>9.2f}x")
+
+    text = build_long_notes(notes, 10000)
+    print()
+    print(f"{'keywords':>10}{'legacy us':>12}{'matcher us':>12}{'speedup':>10}   (10000 chars)")
+    for keyword_count in [keyword_count] + [int(value) for value in args.keyword_counts.split(",")]:
+        mapping = grow_mapping(keyword_count)
+        grown_matcher = KeywordMatcher(mapping)
+        legacy_us = time_per_call(lambda notes_text: legacy_find(notes_text, mapping), text, args.repeat)
+        matcher_us = time_per_call(grown_matcher.find, text, args.repeat)
+        print(f"{keyword_count:>10}{legacy_us:>12.1f}{matcher_us:>12.1f}{legacy_us / matcher_us:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
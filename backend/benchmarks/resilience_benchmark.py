@@ -0,0 +1,152 @@
+"""
+Resilience policy benchmark against a stubbed model with injected latency spikes.
+
+Simulated calls draw their latency from the load test's seeded log-normal
+distribution (benchmarks/load_test/stubs.py); a fraction of attempts is hit
+by a spike (latency multiplied). The same calls run:
+
+- without a policy (one attempt, as before),
+- with the design policy's hedging (second attempt after the observed p95),
+
+and the report compares p50/p95/p99 and the extra attempts spent. A last
+scenario makes the model fail for a while and shows the circuit breaker
+failing fast instead of waiting, then closing again after the outage.
+
+Times are scaled down (--time-scale) so a run takes seconds.
+
+Usage (from backend/):
+    python -m benchmarks.resilience_benchmark [--calls 400] [--concurrency 20] [--spike-rate 0.05] [--spike-factor 8]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import List
+
+from benchmarks.load_test.stubs import LatencyDistribution, StubFailure
+from services.ai.resilience import CircuitOpenError, ResilienceConfig, ResiliencePolicy
+
+
+class SpikyModel:
+    """Stub model call: log-normal latency, spikes, optional outage."""
+
+    def __init__(self, latency: LatencyDistribution, spike_rate: float, spike_factor: float, seed: int):
+        self.latency = latency
+        self.spike_rate = spike_rate
+        self.spike_factor = spike_factor
+        self.failing = False
+        self.attempts = 0
+        self._random = random.Random(seed)
+
+    async def call(self, attempt: int) -> str:
+        self.attempts += 1
+        if self.failing:
+            await asyncio.sleep(self.latency.median)  # A degraded API answers slowly, then fails
+            raise StubFailure("injected outage")
+        seconds = self.latency.sample()
+        if self._random.random() < self.spike_rate:
+            seconds *= self.spike_factor
+        await asyncio.sleep(seconds)
+        return "ok"
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run_calls(call, calls: int, concurrency: int) -> List[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one():
+        async with semaphore:
+            started_at = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - started_at)
+
+    await asyncio.gather(*[one() for _ in range(calls)])
+    return latencies
+
+
+def report(name: str, latencies: List[float], calls: int, attempts: int, scale: float):
+    print(f"{name:<12} p50 {percentile(latencies, 0.5) / scale:7.2f}s  p95 {percentile(latencies, 0.95) / scale:7.2f}s  "
+          f"p99 {percentile(latencies, 0.99) / scale:7.2f}s  max {max(latencies) / scale:7.2f}s  "
+          f"extra attempts {(attempts - calls) / calls:6.1%}")
+
+
+async def main_async(args):
+    scale = args.time_scale
+    median, _, sigma = args.latency.partition(":")
+
+    def model() -> SpikyModel:
+        latency = LatencyDistribution(float(median) * scale, float(sigma or 0.0), args.seed)
+        return SpikyModel(latency, args.spike_rate, args.spike_factor, args.seed + 1)
+
+    config = ResilienceConfig(
+        attempt_timeout=120.0 * scale,
+        hedge=True,
+        hedge_default_delay=15.0 * scale,
+        hedge_min_delay=0.5 * scale,
+        max_retries=1,
+        retry_backoff=0.5 * scale,
+        reset_timeout=5.0 * scale
+    )
+    print(f"{args.calls} calls, concurrency {args.concurrency}, latency {args.latency} s, "
+          f"{args.spike_rate:.0%} spikes x{args.spike_factor:g}\n")
+
+    baseline_model = model()
+    latencies = await run_calls(lambda: baseline_model.call(0), args.calls, args.concurrency)
+    report("no policy", latencies, args.calls, baseline_model.attempts, scale)
+
+    hedged_model = model()
+    policy = ResiliencePolicy("benchmark", config)
+    await run_calls(lambda: policy.call(hedged_model.call), args.calls, args.concurrency)  # learn the p95
+    hedged_model.attempts = 0
+    latencies = await run_calls(lambda: policy.call(hedged_model.call), args.calls, args.concurrency)
+    report("hedged", latencies, args.calls, hedged_model.attempts, scale)
+    print(f"{'':<12} hedge delay {policy.hedge_delay() / scale:.2f}s, stats {policy.get_stats()}")
+
+    # Outage: breaker opens after a few failures, later calls fail fast until a probe succeeds
+    outage_model = model()
+    policy = ResiliencePolicy("outage", config)
+    outage_model.failing = True
+    outcomes = {"failed": 0, "short_circuited": 0}
+    durations = {"failed": [], "short_circuited": []}
+    for _ in range(40):
+        started_at = time.perf_counter()
+        try:
+            await policy.call(outage_model.call)
+        except CircuitOpenError:
+            outcome = "short_circuited"
+        except StubFailure:
+            outcome = "failed"
+        outcomes[outcome] += 1
+        durations[outcome].append(time.perf_counter() - started_at)
+    print(f"\noutage: {outcomes['failed']} calls failed after "
+          f"{statistics.mean(durations['failed']) / scale:.2f}s on average, "
+          f"{outcomes['short_circuited']} failed fast (breaker {policy.breaker.state}, "
+          f"{outage_model.attempts} model attempts)")
+
+    outage_model.failing = False
+    await asyncio.sleep(config.reset_timeout)
+    await policy.call(outage_model.call)
+    print(f"after recovery: breaker {policy.breaker.state}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--calls", type=int, default=400)
+    arg_parser.add_argument("--concurrency", type=int, default=20)
+    arg_parser.add_argument("--latency", default="6.0:0.3", help="MEDIAN[:SIGMA] seconds of a design session")
+    arg_parser.add_argument("--spike-rate", type=float, default=0.05)
+    arg_parser.add_argument("--spike-factor", type=float, default=8.0)
+    arg_parser.add_argument("--time-scale", type=float, default=0.01, help="Simulated seconds per reported second")
+    arg_parser.add_argument("--seed", type=int, default=42)
+    args = arg_parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Benchmark for the design response parser on recorded Gemini responses.
+
+Compares the previous approach (strip markdown fences, json.loads the whole
+text) with DesignStreamParser fed the whole text and fed in small chunks the
+way the Gemini stream delivers it.
+
+Responses are read from logs/gemini_api_calls_*.json. The logger keeps only the
+first 500 characters of each response, so most recorded responses are
+truncated, which also exercises truncation recovery.
+
+Usage (from backend/):
+    python -m benchmarks.response_parser_benchmark [--logs-dir logs] [--chunk-size 16] [--repeat 200]
+"""
+import argparse
+import glob
+import json
+import os
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from services.ai.stream_parser import DesignStreamParser
+
+RESPONSE_API_TYPES = {"function_calling_response", "function_calling_stream_response"}
+TRUNCATION_MARKER = "..."
+PREVIEW_LENGTH = 500
+
+
+def load_recorded_responses(logs_dir: str) -> List[str]:
+    """Load recorded Gemini responses from the API call logs."""
+    responses = []
+    for path in sorted(glob.glob(os.path.join(logs_dir, "gemini_api_calls_*.json"))):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                text = entry.get("response_preview")
+                if entry.get("api_type") not in RESPONSE_API_TYPES or not text:
+                    continue
+                # Drop the marker the logger appends to cut-off previews
+                if len(text) == PREVIEW_LENGTH + len(TRUNCATION_MARKER) and text.endswith(TRUNCATION_MARKER):
+                    text = text[:PREVIEW_LENGTH]
+                responses.append(text)
+    return responses
+
+
+def legacy_parse(text: str) -> Optional[Dict[str, Any]]:
+    """Previous ResponseProcessor behaviour: strip fences and decode the whole text."""
+    cleaned = text.strip()
+    if cleaned.startswith("```json"):
+        cleaned = cleaned[7:]
+    elif cleaned.startswith("```"):
+        cleaned = cleaned[3:]
+    if cleaned.endswith("```"):
+        cleaned = cleaned[:-3]
+    try:
+        document = json.loads(cleaned.strip())
+    except json.JSONDecodeError:
+        return None
+    if not all(key in document for key in ("title", "description", "products")):
+        return None
+    return document
+
+
+def incremental_parse(text: str) -> Optional[Dict[str, Any]]:
+    parser = DesignStreamParser()
+    parser.feed(text)
+    return parser.finish()
+
+
+def streamed_parse(text: str, chunk_size: int) -> Dict[str, Any]:
+    """Feed the text in chunks and record where the first event appeared."""
+    parser = DesignStreamParser()
+    first_event_at = None
+    for offset in range(0, len(text), chunk_size):
+        if parser.feed(text[offset:offset + chunk_size]) and first_event_at is None:
+            first_event_at = min(offset + chunk_size, len(text))
+    return {"document": parser.finish(), "first_event_at": first_event_at}
+
+
+def time_per_call(func: Callable[[str], Any], responses: List[str], repeat: int) -> float:
+    """Mean microseconds per response."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text in responses:
+            func(text)
+    elapsed = time.perf_counter() - started
+    return elapsed / (repeat * len(responses)) * 1_000_000
+
+
+def summarize(documents: List[Optional[Dict[str, Any]]]) -> Dict[str, int]:
+    usable = [doc for doc in documents if doc and isinstance(doc.get("title"), str)]
+    return {
+        "usable": len(usable),
+        "with_description": sum(1 for doc in usable if doc.get("description")),
+        "hashtags": sum(len(doc.get("hashtags") or []) for doc in usable),
+        "products": sum(len(doc.get("products") or []) for doc in usable)
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--logs-dir", default="logs")
+    arg_parser.add_argument("--chunk-size", type=int, default=16, help="Characters per simulated stream chunk")
+    arg_parser.add_argument("--repeat", type=int, default=200)
+    args = arg_parser.parse_args()
+
+    responses = load_recorded_responses(args.logs_dir)
+    if not responses:
+        print(f"No recorded responses found in {args.logs_dir}")
+        return
+
+    total_chars = sum(len(text) for text in responses)
+    print(f"Recorded responses: {len(responses)} ({total_chars} chars, mean {total_chars // len(responses)})")
+    print()
+
+    streamed = [streamed_parse(text, args.chunk_size) for text in responses]
+    results = {
+        "legacy json.loads": summarize([legacy_parse(text) for text in responses]),
+        "incremental": summarize([incremental_parse(text) for text in responses]),
+        f"incremental, {args.chunk_size}-char chunks": summarize([item["document"] for item in streamed])
+    }
+    timings = {
+        "legacy json.loads": time_per_call(legacy_parse, responses, args.repeat),
+        "incremental": time_per_call(incremental_parse, responses, args.repeat),
+        f"incremental, {args.chunk_size}-char chunks": time_per_call(
+            lambda text: streamed_parse(text, args.chunk_size), responses, args.repeat
+        )
+    }
+
+    print(f"{'parser':<32}{'usable':>8}{'desc':>8}{'tags':>8}{'products':>10}{'us/resp':>10}")
+    for name, summary in results.items():
+        print(
+            f"{name:<32}{summary['usable']:>8}{summary['with_description']:>8}"
+            f"{summary['hashtags']:>8}{summary['products']:>10}{timings[name]:>10.1f}"
+        )
+
+    first_events = [
+        item["first_event_at"] / len(text)
+        for item, text in zip(streamed, responses)
+        if item["first_event_at"] is not None
+    ]
+    if first_events:
+        print()
+        print(
+            f"First streamed event after {statistics.median(first_events) * 100:.0f}% of the response "
+            f"(median, {len(first_events)} responses); the blocking parser needs 100%."
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Cold start benchmark: import-time profile and startup time of the app.
+
+Each measurement runs in a fresh interpreter, so nothing is cached between
+runs except the OS page cache (the first run is a warm-up and not counted).
+
+- Import profile: ``python -X importtime -c "import main"``, reported as the
+  slowest modules by cumulative time and the time per top-level package.
+- Startup: median wall time of ``import main`` over --runs interpreters.
+- First use: time to build what the startup warm-up builds in the background
+  (Gemini models, Pillow and the Imagen SDK), i.e. the cost a request pays
+  when it arrives before the warm-up has finished.
+
+The app needs its settings (.env) to import; no network calls are made.
+
+Usage (from backend/):
+    python -m benchmarks.startup_benchmark [--runs 5] [--top 25]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+STARTUP_SCRIPT = """
+import time
+started = time.perf_counter()
+import main
+print(f"import {time.perf_counter() - started:.6f}")
+"""
+
+FIRST_USE_SCRIPT = """
+import time
+import main
+from services.ai.provider import ai_services
+from services.ai.warmup import import_image_sdks
+
+steps = [
+    ("gemini_service", lambda: ai_services.gemini_service),
+    ("gemini_model", lambda: ai_services.gemini_service.gemini_client.model),
+    ("gemini_model_with_tools", lambda: ai_services.gemini_service.gemini_client.model_with_tools),
+    ("mood_board_prompt_model", lambda: ai_services.mood_board_service.gemini_model),
+    ("image_sdks", import_image_sdks),
+]
+for name, step in steps:
+    started = time.perf_counter()
+    step()
+    print(f"{name} {time.perf_counter() - started:.6f}")
+"""
+
+
+def run_python(args: List[str]) -> subprocess.CompletedProcess:
+    result = subprocess.run([sys.executable, *args], capture_output=True, text=True)
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr[-4000:])
+        raise SystemExit(f"Interpreter exited with {result.returncode}: {' '.join(args[:2])}")
+    return result
+
+
+def parse_timings(stdout: str) -> Dict[str, float]:
+    timings = {}
+    for line in stdout.splitlines():
+        name, _, value = line.rpartition(" ")
+        try:
+            timings[name] = float(value)
+        except ValueError:
+            continue  # output printed by the app itself
+    return timings
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) rows of -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((module.rstrip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def report_import_profile(top: int):
+    rows = parse_importtime(run_python(["-X", "importtime", "-c", "import main"]).stderr)
+
+    print(f"\nSlowest imports (cumulative, of {len(rows)} modules)")
+    print(f"{'module':<60} {'self ms':>9} {'cum ms':>9}")
+    for module, self_us, cumulative_us in sorted(rows, key=lambda row: row[2], reverse=True)[:top]:
+        print(f"{module:<60} {self_us / 1000:>9.1f} {cumulative_us / 1000:>9.1f}")
+
+    # Self time summed per top-level package (sums to the whole import)
+    packages: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+    for module, self_us, _cumulative_us in rows:
+        package = packages[module.strip().split(".")[0]]
+        package[0] += self_us
+        package[1] += 1
+    total_us = sum(self_us for _module, self_us, _cumulative_us in rows)
+
+    print(f"\nImport time by top-level package (total {total_us / 1000:.1f} ms)")
+    print(f"{'package':<30} {'ms':>9} {'share':>7} {'modules':>8}")
+    for name, (self_us, count) in sorted(packages.items(), key=lambda item: item[1][0], reverse=True)[:top]:
+        print(f"{name:<30} {self_us / 1000:>9.1f} {self_us / total_us:>7.1%} {count:>8}")
+
+
+def report_startup(runs: int):
+    run_python(["-c", STARTUP_SCRIPT])  # warm-up: bytecode and page cache
+    samples = [parse_timings(run_python(["-c", STARTUP_SCRIPT]).stdout)["import"] for _ in range(runs)]
+    print(f"\nimport main over {runs} runs: median {statistics.median(samples) * 1000:.0f} ms, "
+          f"min {min(samples) * 1000:.0f} ms, max {max(samples) * 1000:.0f} ms")
+
+
+def report_first_use():
+    timings = parse_timings(run_python(["-c", FIRST_USE_SCRIPT]).stdout)
+    print("\nFirst use after startup (built by the startup warm-up)")
+    for name, seconds in timings.items():
+        print(f"  {name:<28} {seconds * 1000:>9.1f} ms")
+    print(f"  {'total':<28} {sum(timings.values()) * 1000:>9.1f} ms")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--runs", type=int, default=5, help="Interpreters timed for the startup median")
+    arg_parser.add_argument("--top", type=int, default=25, help="Rows in the import profile tables")
+    args = arg_parser.parse_args()
+
+    report_import_profile(args.top)
+    report_startup(args.runs)
+    report_first_use()
+
+
+if __name__ == "__main__":
+    main()
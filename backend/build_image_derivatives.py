@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+data/products/size2000 altındaki orijinal ürün görsellerinden türev boyutları üreten script
+
+- size400: web küçük görselleri (/static/products/size400/...)
+- size1024: AI modeli girdisi (LocalImageService bu dosyaları yeniden boyutlandırmadan kullanır)
+
+Görseller process pool ile paralel işlenir (varsayılan: tüm çekirdekler). Değişmeyen kaynaklar
+mtime/boyut, gerekirse sha256 ile tespit edilip atlanır. Her kaynağın türevleri (yol, genişlik,
+yükseklik, byte) data/products/manifest.json dosyasına yazılır.
+
+Kullanım (backend/ dizininde):
+    python build_image_derivatives.py [--workers 8] [--force]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+PRODUCTS_DIR = Path("data/products")
+SOURCE_DIR = PRODUCTS_DIR / "size2000"
+MANIFEST_PATH = PRODUCTS_DIR / "manifest.json"
+SOURCE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
+
+# Türev adı -> ayarlar (büyükten küçüğe; küçük türevler bir öncekinden üretilir)
+DERIVATIVES = {
+    "size1024": {"max_side": 1024, "format": "JPEG", "quality": 85},  # ImageUtils.prepare_for_ai_model limitleri
+    "size400": {"max_side": 400, "format": "JPEG", "quality": 90},
+}
+
+
+def derivative_spec_key(name: str) -> str:
+    """Ayar değişince türevlerin yeniden üretilmesi için manifest'e yazılan anahtar."""
+    spec = DERIVATIVES[name]
+    return f"{spec['format']}:{spec['max_side']}:q{spec['quality']}"
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _save_atomic(image: Image.Image, path: Path, spec: Dict[str, Any]) -> int:
+    """Görseli geçici dosyaya kaydedip yerine taşır. Returns: dosya boyutu (byte)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".part", delete=False) as f:
+        temp_path = f.name
+        image.save(f, format=spec["format"], quality=spec["quality"], optimize=True)
+    os.replace(temp_path, path)
+    return os.path.getsize(path)
+
+
+def build_derivatives(source: str, targets: Dict[str, str], sha256: Optional[str]) -> Dict[str, Any]:
+    """
+    Tek bir kaynak görselin türevlerini üretir (process pool worker'ında çalışır).
+
+    Args:
+        source: Kaynak görsel yolu
+        targets: Türev adı -> hedef dosya yolu
+        sha256: Kaynağın bilinen hash'i (None ise hesaplanır)
+
+    Returns:
+        Manifest kaydı: kaynak bilgileri ve türevler
+    """
+    source_path = Path(source)
+    stat = source_path.stat()
+    entry = {
+        "mtime_ns": stat.st_mtime_ns,
+        "bytes": stat.st_size,
+        "sha256": sha256 or file_sha256(source_path),
+        "derivatives": {},
+    }
+
+    with Image.open(source_path) as image:
+        entry["width"], entry["height"] = image.size
+        largest = max(DERIVATIVES[name]["max_side"] for name in targets)
+        # JPEG'i doğrudan küçültülmüş ölçekte çöz (2000px -> 1024px için 1/2 DCT ölçeği)
+        image.draft("RGB", (largest, largest))
+        current = image.convert("RGB")
+
+        for name in sorted(targets, key=lambda name: -DERIVATIVES[name]["max_side"]):
+            spec = DERIVATIVES[name]
+            if max(current.size) > spec["max_side"]:
+                current = current.copy()
+                current.thumbnail((spec["max_side"], spec["max_side"]), Image.Resampling.LANCZOS)
+            size = _save_atomic(current, Path(targets[name]), spec)
+            entry["derivatives"][name] = {
+                "path": Path(targets[name]).relative_to(PRODUCTS_DIR).as_posix(),
+                "width": current.width,
+                "height": current.height,
+                "bytes": size,
+                "format": spec["format"],
+                "spec": derivative_spec_key(name),
+            }
+
+    return entry
+
+
+def load_manifest() -> Dict[str, Any]:
+    if MANIFEST_PATH.exists():
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {"images": {}}
+
+
+def save_manifest(manifest: Dict[str, Any]):
+    manifest["generated_at"] = datetime.now().isoformat(timespec="seconds")
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=PRODUCTS_DIR, suffix=".tmp", delete=False) as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+        temp_path = f.name
+    os.replace(temp_path, MANIFEST_PATH)
+
+
+def plan_work(manifest: Dict[str, Any], force: bool) -> Tuple[List[Tuple[str, Dict[str, str], Optional[str]]], int]:
+    """
+    Hangi kaynakların işleneceğini belirler.
+
+    Kaynak mtime ve boyutu aynıysa hash hesaplanmaz; farklıysa sha256 karşılaştırılır
+    (dosya sadece touch edildiyse türevler yeniden üretilmez). Eksik türev veya değişmiş
+    ayar da yeniden üretim sebebidir.
+
+    Returns:
+        (işler, değişmeyen kaynak sayısı)
+    """
+    images = manifest.setdefault("images", {})
+    work, unchanged = [], 0
+
+    for source in sorted(SOURCE_DIR.rglob("*")):
+        if source.suffix.lower() not in SOURCE_EXTENSIONS or not source.is_file():
+            continue
+        key = source.relative_to(SOURCE_DIR).as_posix()
+        entry = images.get(key)
+        targets = {name: str(PRODUCTS_DIR / name / Path(key).with_suffix(".jpg")) for name in DERIVATIVES}
+
+        sha256 = None
+        if entry and not force:
+            derivatives_ok = all(
+                entry["derivatives"].get(name, {}).get("spec") == derivative_spec_key(name)
+                and (PRODUCTS_DIR / entry["derivatives"][name]["path"]).exists()
+                for name in DERIVATIVES
+            )
+            stat = source.stat()
+            if derivatives_ok:
+                if stat.st_mtime_ns == entry["mtime_ns"] and stat.st_size == entry["bytes"]:
+                    unchanged += 1
+                    continue
+                sha256 = file_sha256(source)
+                if sha256 == entry["sha256"]:
+                    entry["mtime_ns"] = stat.st_mtime_ns
+                    unchanged += 1
+                    continue
+
+        work.append((str(source), targets, sha256))
+
+    return work, unchanged
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Process sayısı (varsayılan: tüm çekirdekler)")
+    arg_parser.add_argument("--force", action="store_true", help="Tüm türevleri yeniden üret")
+    args = arg_parser.parse_args()
+
+    if not SOURCE_DIR.exists():
+        print(f"❌ {SOURCE_DIR} dizini bulunamadı! Scripti backend/ dizininde çalıştırın.")
+        return
+
+    manifest = load_manifest()
+    work, unchanged = plan_work(manifest, args.force)
+    print(f"🖼️  {len(work)} görsel işlenecek, {unchanged} görsel değişmemiş ({args.workers} process)")
+
+    started = time.perf_counter()
+    failed = 0
+    if work:
+        sources, targets, hashes = zip(*work)
+        chunksize = max(1, len(work) // (args.workers * 4))
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            results = executor.map(_build_safe, sources, targets, hashes, chunksize=chunksize)
+            for source, entry in zip(sources, results):
+                key = Path(source).relative_to(SOURCE_DIR).as_posix()
+                if isinstance(entry, str):
+                    print(f"  ❌ {key}: {entry}")
+                    failed += 1
+                else:
+                    manifest["images"][key] = entry
+
+    # Silinmiş kaynakları manifest'ten çıkar
+    existing = {source.relative_to(SOURCE_DIR).as_posix() for source in SOURCE_DIR.rglob("*") if source.is_file()}
+    for key in [key for key in manifest["images"] if key not in existing]:
+        del manifest["images"][key]
+
+    save_manifest(manifest)
+    elapsed = time.perf_counter() - started
+    print(f"✅ {len(work) - failed} görsel üretildi, {failed} hata, {elapsed:.1f} sn")
+    if work:
+        print(f"   {len(work) / max(elapsed, 1e-9):.1f} görsel/sn")
+    print(f"📋 Manifest: {MANIFEST_PATH} ({len(manifest['images'])} görsel)")
+
+
+def _build_safe(source: str, targets: Dict[str, str], sha256: Optional[str]):
+    """Worker hatası tüm işlemi durdurmasın: hata mesajını döndür."""
+    try:
+        return build_derivatives(source, targets, sha256)
+    except Exception as e:
+        return str(e)
+
+
+if __name__ == "__main__":
+    main()
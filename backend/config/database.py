@@ -1,35 +1,101 @@
 """
 Database configuration and connection management.
 """
-import os
+import threading
+import time
+from typing import Any, Dict
+from sqlalchemy import exc as sa_exc
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from config.settings import settings
 
-# Database URL
-DATABASE_URL = f"postgresql+asyncpg://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
-
-# Create async engine with simple, proven settings for VDS
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=False,  # No SQL logging
-    
-    # Basic pool settings
-    pool_size=5,  # Start with smaller pool
-    max_overflow=10,  # Reasonable overflow
-    pool_pre_ping=False,  # No pre-ping for VDS
-    pool_recycle=3600,  # 1 hour recycle
-    pool_timeout=30,  # Standard timeout
-    
-    # Minimal connection args for stability
-    connect_args={
-        "command_timeout": 30,
-        "server_settings": {
-            "application_name": "deko_assistant"
-        }
-    }
+# Database URL (an explicit DATABASE_URL in .env wins over the individual DB_* parts)
+DATABASE_URL = settings.DATABASE_URL or (
+    f"postgresql+asyncpg://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
 )
 
+
+class PoolTelemetry:
+    """Counters for connection checkout behaviour, shared by the engine's pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record_checkout(self, wait_seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def record_timeout(self, wait_seconds: float):
+        with self._lock:
+            self.timeouts += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait_seconds / attempts * 1000, 3) if attempts else 0.0,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            }
+
+
+pool_telemetry = PoolTelemetry()
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that measures how long callers wait for a connection."""
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except sa_exc.TimeoutError:
+            pool_telemetry.record_timeout(time.perf_counter() - started_at)
+            raise
+        pool_telemetry.record_checkout(time.perf_counter() - started_at)
+        return connection
+
+
+def _build_engine_options() -> Dict[str, Any]:
+    """Build engine keyword arguments from settings."""
+    options: Dict[str, Any] = {
+        "echo": False,  # No SQL logging
+        "poolclass": InstrumentedAsyncQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+    if DATABASE_URL.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {
+            "command_timeout": 30,
+            # asyncpg's own per-connection prepared statement cache
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            # SQLAlchemy's asyncpg dialect cache of prepared statement handles
+            "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+            "server_settings": {
+                "application_name": "deko_assistant"
+            }
+        }
+
+    return options
+
+
+# Create async engine from settings
+engine = create_async_engine(DATABASE_URL, **_build_engine_options())
+
 # Create async session factory
 async_session_maker = async_sessionmaker(
     engine,
@@ -48,3 +114,24 @@ async def get_async_session():
 
 # Alias for compatibility
 get_db = get_async_session
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Get current connection pool usage and checkout telemetry."""
+    pool = engine.sync_engine.pool
+    stats = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout_seconds": settings.DB_POOL_TIMEOUT,
+    }
+
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update({
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "current_size": pool.size(),
+        })
+
+    stats.update(pool_telemetry.snapshot())
+    return stats
@@ -167,6 +167,24 @@ Mutlaka aşağıdaki JSON formatında cevap ver:
 - Ev yaşamı ve aile konforu odaklı tasarım yap
 """
 
+    @staticmethod
+    def get_design_json_repair_prompt(raw_response: str) -> str:
+        """
+        Ask Gemini to convert a design answer that broke the JSON contract.
+        Used with the response schema, so only the content has to be preserved.
+        """
+        return f"""Aşağıdaki iç mimari tasarım cevabı geçerli JSON değil veya beklenen alanları içermiyor.
+İçeriği DEĞİŞTİRMEDEN şemaya uygun JSON'a dönüştür:
+- "title": tasarım başlığı
+- "description": tasarım açıklaması
+- "hashtags": Türkçe hashtag listesi (# ile başlayan, snake_case)
+- "products": ürün listesi (category, name, description; varsa price, style, color)
+
+Cevapta olmayan bilgiyi uydurma, eksik alanları boş bırak.
+
+CEVAP:
+{raw_response}"""
+
     @staticmethod
     def get_imagen_prompt_enhancement_request(
         room_type: str, 
@@ -34,6 +34,8 @@ class Settings(BaseSettings):
     GEMINI_API_KEY: str
     GOOGLE_CLOUD_PROJECT_ID: str
     GENERATIVE_MODEL_NAME: str
+    GEMINI_STRUCTURED_OUTPUT: bool = True  # JSON response schema for design output + one repair call on invalid output
+    AI_WARMUP_ON_STARTUP: bool = False  # Opt-in: build the Gemini models in the background after startup instead of on the first request
     
     # Imagen 4 settings
     IMAGEN_MODEL_NAME: str
@@ -54,6 +56,12 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 1 day (24 hours * 60 minutes)
     
+    # Password hashing settings (bcrypt runs on a bounded worker pool)
+    BCRYPT_ROUNDS: int = 12                  # Changing this rehashes passwords on next login
+    PASSWORD_HASH_WORKERS: int = 2           # Concurrent bcrypt operations
+    PASSWORD_HASH_MAX_QUEUE: int = 64        # Waiting operations before rejecting with 503
+    PASSWORD_HASH_QUEUE_TIMEOUT: float = 5.0 # Seconds to wait for a queue slot
+    
     @property
     def debug(self) -> bool:
         return self.ENVIRONMENT == "development"
@@ -86,6 +94,59 @@ class Settings(BaseSettings):
     DB_POOL_SIZE: int = 20
     DB_MAX_OVERFLOW: int = 0
     DB_POOL_PRE_PING: bool = True
+    DB_POOL_TIMEOUT: int = 30  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 3600  # Seconds before a connection is replaced
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statements per connection
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100  # SQLAlchemy asyncpg statement handle cache
+    
+    # Product catalog (load_dataset.py sends NOTIFY on this channel after changing products)
+    CATALOG_NOTIFY_CHANNEL: str = "catalog_changed"
+    PRODUCT_SEARCH_CACHE_SIZE: int = 512  # Cached product searches per worker, cleared on catalog changes
+    
+    # Design indexes (hashtag discovery, related designs): workers replay each other's changes from this channel
+    DESIGN_INDEX_NOTIFY_CHANNEL: str = "design_index_changed"
+    
+    # WebSocket fan-out across workers ("memory" for a single worker, "redis" for RESP servers)
+    WS_BROKER_BACKEND: str = "memory"
+    WS_BROKER_URL: str = "redis://localhost:6379"  # or unix:///path/to/redis.sock
+    WS_BROKER_CHANNEL: str = "deko:websocket"
+    WS_SEND_QUEUE_SIZE: int = 64  # Outbound frames buffered per connection
+    WS_SEND_TIMEOUT: float = 10.0  # Seconds before a stalled send drops the connection
+    WS_PROGRESS_MIN_INTERVAL: float = 0.5  # Minimum seconds between progress frames of one job
+    WS_HEARTBEAT_INTERVAL: float = 20.0  # Seconds between application-level pings
+    WS_IDLE_TIMEOUT: float = 60.0  # Seconds without client messages before a connection is reaped
+    WS_PING_INTERVAL: float = 20.0  # Protocol-level ping interval (uvicorn)
+    WS_PING_TIMEOUT: float = 20.0  # Protocol-level pong timeout (uvicorn)
+    WS_REPLAY_BUFFER_SIZE: int = 32  # Events kept per mood board job for reconnects
+    WS_REPLAY_MAX_JOBS: int = 256  # Jobs kept in the replay buffer
+    WS_REPLAY_MAX_CHARS: int = 64 * 1024 * 1024  # Total size of buffered frames (completed frames carry images)
+    
+    # Mood board ETA (moving average of MoodBoard.generation_time_seconds)
+    MOOD_BOARD_DEFAULT_GENERATION_SECONDS: float = 30.0
+    MOOD_BOARD_ETA_SMOOTHING: float = 0.2
+    
+    # Model call limits (token bucket at the quota + AIMD concurrency; calls queue until the timeout)
+    GEMINI_REQUESTS_PER_MINUTE: float = 300.0  # Keep a little under the project's Gemini quota
+    GEMINI_MAX_CONCURRENCY: int = 16
+    IMAGEN_REQUESTS_PER_MINUTE: float = 18.0  # Vertex Imagen quota is 20/min by default
+    IMAGEN_MAX_CONCURRENCY: int = 4
+    MODEL_CALL_QUEUE_TIMEOUT: float = 30.0  # Seconds a model call may wait for a slot before failing
+    
+    # Model call resilience (circuit breaker per call type, hedging after the observed p95, budgeted retries)
+    DESIGN_CALL_TIMEOUT: float = 120.0  # Seconds per function calling session attempt
+    DESIGN_CALL_HEDGING: bool = True
+    PROMPT_CALL_TIMEOUT: float = 30.0  # Imagen prompt enhancement
+    PROMPT_CALL_HEDGING: bool = True
+    IMAGE_CALL_TIMEOUT: float = 120.0  # Imagen generation
+    IMAGE_CALL_HEDGING: bool = False  # Each hedge is a paid image
+    
+    # Imagen result cache (same prompt + reference images + params -> stored image, LRU by size)
+    IMAGEN_CACHE_ENABLED: bool = True
+    IMAGEN_CACHE_DIR: str = os.path.join("data", "imagen_cache")  # Outside the static mood_boards mount
+    IMAGEN_CACHE_MAX_MB: int = 1024
+    
+    # Stage timing (Server-Timing header + timing log record) for a sample of requests and mood boards
+    TIMING_SAMPLE_RATE: float = 0.05  # 0 disables timing, 1 times every request
     
     class Config:
         env_file = ".env"
@@ -2,108 +2,209 @@
 """
 IKEA Ürün Görseli Toplu İndirici
 
-Bu script, jsonlaryeni dizinindeki tüm JSON dosyalarını işleyerek
+Bu script, jsonlaryeni dizinindeki JSON dosyalarını işleyerek
 IKEA ürün linklerinden görselleri indirip productsyeni/products/{kategori-adi}
 klasörlerine kaydeder.
 
-Kullanım:
-    python batch_image_downloader.py
+- İndirmeler asyncio + httpx ile eşzamanlı yapılır (toplam bağlantı havuzu ve host başına limit)
+- Her dosyanın durumu productsyeni/manifest.json içinde tutulur (sayfa/görsel URL, ETag, sha256, durum);
+  script yarıda kesilirse kaldığı yerden devam eder
+- --refresh ile indirilmiş görseller koşullu istekle (If-None-Match / If-Modified-Since) yeniden kontrol edilir
+- Görseller geçici dosyaya stream edilir ve tamamlanınca atomik olarak yerine taşınır
+
+Kullanım (backend/data dizininde):
+    python batch_image_downloader.py [--files tezgah.json,ayna.json] [--max-connections 8] [--per-host 2] [--refresh]
 """
 
+import argparse
+import asyncio
+import hashlib
 import json
 import os
-import sys
-import requests
-from urllib.parse import urljoin
-from bs4 import BeautifulSoup
-import time
 import re
-from pathlib import Path
-import glob
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+from bs4 import BeautifulSoup
+
+
+class DownloadManifest:
+    """
+    Hedef dosya yolu -> indirme kaydı (page_url, image_url, etag, last_modified, sha256, size, status).
+    JSON olarak saklanır, her kayıt geçici dosya + rename ile atomik yazılır.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f).get("files", {})
+
+    def get(self, key: str) -> Dict[str, Any]:
+        return self.entries.get(key, {})
+
+    def update(self, key: str, **fields):
+        entry = self.entries.setdefault(key, {})
+        entry.update(fields)
+        entry["updated_at"] = datetime.now().isoformat(timespec="seconds")
+
+    def save(self):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory, suffix=".tmp", delete=False) as f:
+            json.dump({"files": self.entries}, f, ensure_ascii=False, indent=1)
+            temp_path = f.name
+        os.replace(temp_path, self.path)
+
 
 class BatchIkeaImageDownloader:
-    def __init__(self, json_dir="jsonlaryeni", output_base_dir="productsyeni"):
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    MAX_ATTEMPTS = 3
+    MANIFEST_SAVE_EVERY = 10  # Kaç tamamlanan üründe bir manifest kaydedilsin
+
+    def __init__(
+        self,
+        json_dir="jsonlaryeni",
+        output_base_dir="productsyeni",
+        max_connections: int = 8,
+        per_host: int = 2,
+        host_delay: float = 0.5,
+        image_host: str = "image-ikea.mncdn.com",
+        refresh: bool = False
+    ):
         self.json_dir = json_dir
         self.output_base_dir = output_base_dir
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
-        
+        self.max_connections = max_connections
+        self.per_host = per_host
+        self.host_delay = host_delay  # Aynı hosta art arda istekler arası minimum süre (saniye)
+        self.image_host = image_host
+        self.refresh = refresh
+        self.manifest = DownloadManifest(os.path.join(output_base_dir, "manifest.json"))
+
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._host_next_request: Dict[str, float] = {}
+        self._completed_since_save = 0
+
         # Toplam istatistikler
-        self.total_success = 0
-        self.total_fail = 0
-        self.total_skipped = 0
-    
-    def extract_main_image_from_page(self, url):
-        """IKEA ürün sayfasından ana görselin URL'sini çıkarır"""
-        try:
-            print(f"Sayfa indiriliyor: {url}")
-            response = self.session.get(url, timeout=15)
+        self.stats = {"downloaded": 0, "not_modified": 0, "skipped": 0, "failed": 0}
+
+    async def _request(self, client: httpx.AsyncClient, url: str, handle, headers: Optional[Dict[str, str]] = None):
+        """
+        Host başına eşzamanlılık limiti ve tekrar denemeyle streaming GET.
+        ``handle(response)`` yanıtı stream açıkken işler ve sonucunu döndürür.
+        """
+        host = urlparse(url).netloc
+        semaphore = self._host_semaphores.setdefault(host, asyncio.Semaphore(self.per_host))
+
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            async with semaphore:
+                # Aynı hosta istekleri aralıklandır (sitede yoğunluk yaratmamak için)
+                now = time.monotonic()
+                slot = max(now, self._host_next_request.get(host, 0.0))
+                self._host_next_request[host] = slot + self.host_delay
+                if slot > now:
+                    await asyncio.sleep(slot - now)
+
+                try:
+                    async with client.stream("GET", url, headers=headers) as response:
+                        if response.status_code not in self.RETRY_STATUSES or attempt == self.MAX_ATTEMPTS:
+                            return await handle(response)
+                except httpx.TransportError as e:
+                    if attempt == self.MAX_ATTEMPTS:
+                        raise
+                    print(f"Bağlantı hatası ({e.__class__.__name__}), tekrar deneniyor: {url}")
+
+            await asyncio.sleep(2 ** attempt)
+
+    async def extract_main_image_from_page(self, client: httpx.AsyncClient, url: str) -> Optional[str]:
+        """Ürün sayfasından ana görselin URL'sini çıkarır"""
+
+        async def handle(response: httpx.Response):
             response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Ana ürün görselini bul - birkaç farklı selector dene
-            image_selectors = [
-                'img[src*="image-ikea.mncdn.com/urunler/500_500"]',
-                'img[data-zoom*="image-ikea.mncdn.com"]',
-                'img[src*="PE"]',
-                '.product-image img',
-                '.gallery img',
-                'img[alt*="IKEA"]'
-            ]
-            
-            for selector in image_selectors:
-                img_tag = soup.select_one(selector)
-                if img_tag:
-                    # src veya data-zoom attribute'unu kontrol et
-                    img_url = img_tag.get('src') or img_tag.get('data-zoom')
-                    if img_url and 'image-ikea.mncdn.com' in img_url:
-                        # Eğer küçük görsel ise büyük haline çevir
-                        if '500_500' in img_url:
-                            img_url = img_url.replace('500_500', '2000_2000')
-                        print(f"Görsel URL bulundu: {img_url}")
-                        return img_url
-            
-            # Hiçbir görsel bulunamadıysa tüm img taglerini kontrol et
-            all_imgs = soup.find_all('img')
-            for img in all_imgs:
-                src = img.get('src', '')
-                if 'image-ikea.mncdn.com' in src and 'PE' in src:
-                    if '500_500' in src:
-                        src = src.replace('500_500', '2000_2000')
-                    print(f"Alternatif görsel URL bulundu: {src}")
-                    return src
-            
-            print("Hiçbir uygun görsel bulunamadı")
-            return None
-            
-        except Exception as e:
-            print(f"Sayfa işlenirken hata: {e}")
-            return None
-    
-    def download_image(self, image_url, file_path):
-        """Görseli indirir ve belirtilen yola kaydeder"""
-        try:
-            # Dizini oluştur
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            
-            print(f"Görsel indiriliyor: {image_url}")
-            response = self.session.get(image_url, timeout=30)
+            return await response.aread()
+
+        content = await self._request(client, url, handle)
+        soup = BeautifulSoup(content, 'html.parser')
+
+        # Ana ürün görselini bul - birkaç farklı selector dene
+        image_selectors = [
+            f'img[src*="{self.image_host}/urunler/500_500"]',
+            f'img[data-zoom*="{self.image_host}"]',
+            'img[src*="PE"]',
+            '.product-image img',
+            '.gallery img',
+            'img[alt*="IKEA"]'
+        ]
+
+        for selector in image_selectors:
+            img_tag = soup.select_one(selector)
+            if img_tag:
+                # src veya data-zoom attribute'unu kontrol et
+                img_url = img_tag.get('src') or img_tag.get('data-zoom')
+                if img_url and self.image_host in img_url:
+                    # Eğer küçük görsel ise büyük haline çevir
+                    return img_url.replace('500_500', '2000_2000')
+
+        # Hiçbir görsel bulunamadıysa tüm img taglerini kontrol et
+        for img in soup.find_all('img'):
+            src = img.get('src', '')
+            if self.image_host in src and 'PE' in src:
+                return src.replace('500_500', '2000_2000')
+
+        return None
+
+    async def download_image(self, client: httpx.AsyncClient, image_url: str, file_path: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Görseli geçici dosyaya stream eder, sha256 hesaplar ve atomik olarak yerine taşır.
+        entry'de ETag/Last-Modified varsa koşullu istek yapılır (304 -> dosya aynı kalır).
+
+        Returns:
+            Manifest alanları (status: downloaded | not_modified)
+        """
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        async def handle(response: httpx.Response):
+            if response.status_code == 304:
+                return {"status": "not_modified"}
             response.raise_for_status()
-            
-            # Dosyayı kaydet
-            with open(file_path, 'wb') as f:
-                f.write(response.content)
-            
-            print(f"Görsel kaydedildi: {file_path}")
-            return True
-            
-        except Exception as e:
-            print(f"Görsel indirilirken hata: {e}")
-            return False
-    
+
+            directory = os.path.dirname(file_path)
+            os.makedirs(directory, exist_ok=True)
+            digest = hashlib.sha256()
+            size = 0
+            with tempfile.NamedTemporaryFile('wb', dir=directory, suffix=".part", delete=False) as f:
+                temp_path = f.name
+                try:
+                    async for chunk in response.aiter_bytes():
+                        f.write(chunk)
+                        digest.update(chunk)
+                        size += len(chunk)
+                except BaseException:
+                    f.close()
+                    os.remove(temp_path)
+                    raise
+            os.replace(temp_path, file_path)
+
+            return {
+                "status": "downloaded",
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+                "sha256": digest.hexdigest(),
+                "size": size
+            }
+
+        return await self._request(client, image_url, handle, headers)
+
     def get_category_folder_name(self, category_name):
         """Kategori adını dosya sistemi için uygun klasör adına çevirir"""
         # Türkçe karakterleri değiştir ve küçük harfe çevir
@@ -111,17 +212,17 @@ class BatchIkeaImageDownloader:
             'ç': 'c', 'ğ': 'g', 'ı': 'i', 'ö': 'o', 'ş': 's', 'ü': 'u',
             'Ç': 'c', 'Ğ': 'g', 'I': 'i', 'İ': 'i', 'Ö': 'o', 'Ş': 's', 'Ü': 'u'
         }
-        
+
         folder_name = category_name.lower()
         for tr_char, en_char in replacements.items():
             folder_name = folder_name.replace(tr_char, en_char)
-        
+
         # Boşlukları tire ile değiştir ve özel karakterleri kaldır
         folder_name = re.sub(r'[^\w\s-]', '', folder_name)
         folder_name = re.sub(r'[-\s]+', '-', folder_name).strip('-')
-        
+
         return folder_name
-    
+
     def generate_image_filename(self, product_name):
         """Ürün adından dosya adı oluşturur"""
         # Türkçe karakterleri değiştir
@@ -129,177 +230,157 @@ class BatchIkeaImageDownloader:
             'ç': 'c', 'ğ': 'g', 'ı': 'i', 'ö': 'o', 'ş': 's', 'ü': 'u',
             'Ç': 'c', 'Ğ': 'g', 'I': 'i', 'İ': 'i', 'Ö': 'o', 'Ş': 's', 'Ü': 'u'
         }
-        
+
         filename = product_name.lower()
         for tr_char, en_char in replacements.items():
             filename = filename.replace(tr_char, en_char)
-        
+
         # Özel karakterleri kaldır, boşlukları tire ile değiştir
         filename = re.sub(r'[^\w\s-]', '', filename)
         filename = re.sub(r'[-\s]+', '-', filename).strip('-')
-        
+
         # Dosya adını kısalt (maksimum 100 karakter)
         if len(filename) > 100:
             filename = filename[:100]
-        
+
         return f"{filename}.jpg"
-    
-    def process_single_json_file(self, json_file_path):
-        """Tek bir JSON dosyasını işler"""
+
+    async def process_product(self, client: httpx.AsyncClient, product: Dict[str, Any], category_from_filename: str):
+        """Tek bir ürünün görselini indirir (manifest'e göre atlar / koşullu yeniden indirir)"""
+        product_name = product.get('product_name', 'Bilinmeyen')
+        product_link = product.get('product_link')
+        category = product.get('category', category_from_filename)
+
+        if not product_link:
+            print(f"Ürün linki bulunamadı, atlanıyor: {product_name}")
+            self.stats["failed"] += 1
+            return
+
+        relative_path = os.path.join("products", self.get_category_folder_name(category), self.generate_image_filename(product_name))
+        image_path = os.path.join(self.output_base_dir, relative_path)
+        entry = self.manifest.get(relative_path)
+        file_ok = entry.get("status") == "done" and os.path.exists(image_path) and os.path.getsize(image_path) == entry.get("size")
+
+        if file_ok and not self.refresh:
+            self.stats["skipped"] += 1
+            return
+
         try:
-            # JSON dosyasını oku
-            with open(json_file_path, 'r', encoding='utf-8') as f:
-                products = json.load(f)
-            
-            json_filename = os.path.basename(json_file_path)
-            category_from_filename = os.path.splitext(json_filename)[0]
-            
-            print(f"\n{'='*60}")
-            print(f"İşleniyor: {json_filename}")
-            print(f"Kategori: {category_from_filename}")
-            print(f"Ürün sayısı: {len(products)}")
-            print(f"{'='*60}")
-            
-            success_count = 0
-            fail_count = 0
-            skipped_count = 0
-            
-            for i, product in enumerate(products, 1):
-                print(f"\n--- İşleniyor {i}/{len(products)} ---")
-                product_name = product.get('product_name', 'Bilinmeyen')
-                print(f"Ürün: {product_name}")
-                
-                product_link = product.get('product_link')
-                category = product.get('category', category_from_filename)
-                
-                if not product_link:
-                    print("Ürün linki bulunamadı, atlanıyor...")
-                    fail_count += 1
-                    continue
-                
-                # Kategori klasör adını oluştur
-                category_folder = self.get_category_folder_name(category)
-                
-                # Görsel dosya adını oluştur
-                image_filename = self.generate_image_filename(product_name)
-                
-                # Tam dosya yolunu oluştur
-                image_dir = os.path.join(self.output_base_dir, "products", category_folder)
-                image_path = os.path.join(image_dir, image_filename)
-                
-                print(f"Hedef yol: {image_path}")
-                
-                # Eğer dosya zaten varsa atla
-                if os.path.exists(image_path):
-                    print(f"Dosya zaten mevcut, atlanıyor: {image_path}")
-                    skipped_count += 1
-                    continue
-                
-                # Web sayfasından görsel URL'sini çıkar
-                image_url = self.extract_main_image_from_page(product_link)
-                
+            # Görsel URL'si daha önce bulunduysa sayfayı tekrar indirme
+            image_url = entry.get("image_url") if entry.get("page_url") == product_link else None
+            if not image_url:
+                image_url = await self.extract_main_image_from_page(client, product_link)
                 if not image_url:
-                    print("Görsel URL'si bulunamadı, atlanıyor...")
-                    fail_count += 1
-                    continue
-                
-                # Görseli indir
-                if self.download_image(image_url, image_path):
-                    success_count += 1
-                else:
-                    fail_count += 1
-                
-                # Rate limiting - sitede yoğunluk yaratmamak için
-                time.sleep(3)  # Biraz daha yavaş olalım
-            
-            print(f"\n--- {json_filename} ÖZET ---")
-            print(f"Başarılı: {success_count}")
-            print(f"Başarısız: {fail_count}")
-            print(f"Atlandı: {skipped_count}")
-            print(f"Toplam: {len(products)}")
-            
-            # Global istatistiklere ekle
-            self.total_success += success_count
-            self.total_fail += fail_count
-            self.total_skipped += skipped_count
-            
-            return success_count, fail_count, skipped_count
-            
+                    print(f"Görsel URL'si bulunamadı: {product_name}")
+                    self.manifest.update(relative_path, page_url=product_link, status="no_image")
+                    self.stats["failed"] += 1
+                    return
+
+            # Dosya eksik/bozuksa koşulsuz indir
+            result = await self.download_image(client, image_url, image_path, entry if file_ok else {})
+            if result.pop("status") == "not_modified":
+                self.stats["not_modified"] += 1
+            else:
+                print(f"Görsel kaydedildi: {image_path}")
+                self.stats["downloaded"] += 1
+            self.manifest.update(relative_path, page_url=product_link, image_url=image_url, status="done", error=None, **result)
+
         except Exception as e:
-            print(f"JSON dosyası işlenirken hata ({json_file_path}): {e}")
-            return 0, 0, 0
-    
-    def process_all_json_files(self):
-        """jsonlaryeni dizinindeki seçili JSON dosyalarını işler"""
-        try:
-            # Seçili JSON dosyaları listesi
-            selected_files = [
-                
-                "tezgah.json"
-            ]
-            
-            # Seçili dosyaların tam yollarını oluştur
-            json_files = []
-            for filename in selected_files:
-                file_path = os.path.join(self.json_dir, filename)
-                if os.path.exists(file_path):
-                    json_files.append(file_path)
-                else:
-                    print(f"Uyarı: {filename} dosyası bulunamadı, atlanıyor...")
-            
-            if not json_files:
-                print(f"Hata: Seçili JSON dosyalarından hiçbiri {self.json_dir} dizininde bulunamadı!")
-                return
-            
-            print(f"İşlenecek seçili JSON dosyaları: {len(json_files)}")
-            for json_file in json_files:
-                print(f"  - {os.path.basename(json_file)}")
-            
-            print(f"\n{'#'*80}")
-            print("SEÇİLİ DOSYALAR İÇİN GÖRSEL İNDİRME İŞLEMİ BAŞLATILUYOR")
-            print(f"{'#'*80}")
-            
-            # Her JSON dosyasını işle
+            print(f"Hata ({product_name}): {e}")
+            self.manifest.update(relative_path, page_url=product_link, status="failed", error=str(e))
+            self.stats["failed"] += 1
+        finally:
+            self._completed_since_save += 1
+            if self._completed_since_save >= self.MANIFEST_SAVE_EVERY:
+                self.manifest.save()
+                self._completed_since_save = 0
+
+    async def process_json_files(self, json_files: List[str]):
+        """Seçili JSON dosyalarındaki tüm ürünleri eşzamanlı işler"""
+        limits = httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+        timeout = httpx.Timeout(30.0, connect=15.0)
+        started = time.perf_counter()
+
+        async with httpx.AsyncClient(limits=limits, timeout=timeout, follow_redirects=True,
+                                     headers={'User-Agent': self.USER_AGENT}) as client:
+            tasks = []
             for json_file in json_files:
-                self.process_single_json_file(json_file)
-                print(f"\n{'-'*40}")
-                print("Sonraki dosyaya geçiliyor...")
-                time.sleep(1)  # Dosyalar arası kısa bekleme
-            
-            # Genel özet
-            print(f"\n{'#'*80}")
-            print("SEÇİLİ DOSYALAR İÇİN GENEL ÖZET")
-            print(f"{'#'*80}")
-            print(f"İşlenen seçili JSON dosyası: {len(json_files)}")
-            print(f"Toplam başarılı indirme: {self.total_success}")
-            print(f"Toplam başarısız indirme: {self.total_fail}")
-            print(f"Toplam atlanan dosya: {self.total_skipped}")
-            print(f"Genel toplam: {self.total_success + self.total_fail + self.total_skipped}")
-            print(f"{'#'*80}")
-            
-        except Exception as e:
-            print(f"Toplu işlem sırasında hata: {e}")
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    products = json.load(f)
+                category_from_filename = os.path.splitext(os.path.basename(json_file))[0]
+                print(f"  - {os.path.basename(json_file)}: {len(products)} ürün")
+                tasks.extend(self.process_product(client, product, category_from_filename) for product in products)
+
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                # Yarıda kesilse bile ilerlemeyi kaydet
+                self.manifest.save()
+
+        print(f"\n{'#'*80}")
+        print("GENEL ÖZET")
+        print(f"{'#'*80}")
+        print(f"İşlenen JSON dosyası: {len(json_files)}")
+        print(f"İndirilen: {self.stats['downloaded']}")
+        print(f"Değişmemiş (304): {self.stats['not_modified']}")
+        print(f"Zaten mevcut, atlanan: {self.stats['skipped']}")
+        print(f"Başarısız: {self.stats['failed']}")
+        print(f"Süre: {time.perf_counter() - started:.1f} sn")
+        print(f"{'#'*80}")
+
 
 def main():
-    print("IKEA Seçili Dosyalar İçin Görsel İndirici Başlatılıyor...")
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--json-dir", default="jsonlaryeni")
+    arg_parser.add_argument("--output-dir", default="productsyeni")
+    arg_parser.add_argument("--files", default="", help="Virgülle ayrılmış JSON dosyaları (varsayılan: hepsi)")
+    arg_parser.add_argument("--max-connections", type=int, default=8, help="Toplam eşzamanlı bağlantı")
+    arg_parser.add_argument("--per-host", type=int, default=2, help="Host başına eşzamanlı istek")
+    arg_parser.add_argument("--host-delay", type=float, default=0.5, help="Aynı hosta istekler arası saniye")
+    arg_parser.add_argument("--image-host", default="image-ikea.mncdn.com", help="Görsel CDN host adı")
+    arg_parser.add_argument("--refresh", action="store_true", help="İndirilmiş görselleri koşullu istekle yeniden kontrol et")
+    args = arg_parser.parse_args()
+
+    print("IKEA Görsel İndirici Başlatılıyor...")
     print("-" * 50)
-    
-    # Çalışma dizinini kontrol et
-    json_dir = "jsonlaryeni"
-    output_dir = "productsyeni"
-    
-    if not os.path.exists(json_dir):
-        print(f"Hata: {json_dir} dizini bulunamadı!")
+
+    if not os.path.exists(args.json_dir):
+        print(f"Hata: {args.json_dir} dizini bulunamadı!")
         print("Bu scripti 'backend/data' dizininde çalıştırdığınızdan emin olun.")
         return
-    
-    # Çıktı dizinini oluştur
-    os.makedirs(output_dir, exist_ok=True)
-    
-    downloader = BatchIkeaImageDownloader(json_dir, output_dir)
-    downloader.process_all_json_files()
-    
-    print("\nSeçili dosyalar için işlemler tamamlandı!")
+
+    if args.files:
+        json_files = []
+        for filename in args.files.split(","):
+            file_path = os.path.join(args.json_dir, filename.strip())
+            if os.path.exists(file_path):
+                json_files.append(file_path)
+            else:
+                print(f"Uyarı: {filename} dosyası bulunamadı, atlanıyor...")
+    else:
+        json_files = sorted(os.path.join(args.json_dir, name) for name in os.listdir(args.json_dir) if name.endswith(".json"))
+
+    if not json_files:
+        print(f"Hata: {args.json_dir} dizininde işlenecek JSON dosyası bulunamadı!")
+        return
+
+    downloader = BatchIkeaImageDownloader(
+        args.json_dir,
+        args.output_dir,
+        max_connections=args.max_connections,
+        per_host=args.per_host,
+        host_delay=args.host_delay,
+        image_host=args.image_host,
+        refresh=args.refresh
+    )
+    try:
+        asyncio.run(downloader.process_json_files(json_files))
+    except KeyboardInterrupt:
+        print("\nİşlem durduruldu; manifest kaydedildi, tekrar çalıştırınca kaldığı yerden devam eder.")
+        return
+
+    print("\nİşlemler tamamlandı!")
+
 
 if __name__ == "__main__":
     main()
@@ -1,12 +1,23 @@
 #!/usr/bin/env python3
 """
 backend/data/jsonlaryeni dizinindeki JSON dosyalarını PostgreSQL products tablosuna yükleyen script
+
+Tekrar çalıştırılabilir (idempotent):
+- Kategori dosyaları paralel olarak okunur
+- Her ürünün id'si sabittir: kategori + product_link (link yoksa kategori + isim + renk) üzerinden uuid5
+- Satırlar COPY ile geçici bir staging tablosuna yüklenir, tek INSERT ... ON CONFLICT DO UPDATE ile birleştirilir
+- Sadece eklenen/değişen ürünler raporlanır; değişiklik varsa çalışan uygulamaya NOTIFY gönderilir
 """
 
+import csv
+import io
 import json
+import math
 import uuid
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import create_engine, MetaData, Table, Column, String, Integer, Text, DateTime, Float, text
 from sqlalchemy.sql import func
@@ -40,8 +51,151 @@ products_table = Table(
     Column('updated_at', DateTime(timezone=True), nullable=True),
 )
 
+# Sabit ürün id'leri için namespace (değiştirilirse tüm katalog yeniden eklenir)
+PRODUCT_ID_NAMESPACE = uuid.UUID("4fb240ab-5e2e-4590-8e46-566b8ca62acc")
+
+# COPY / upsert sırasındaki kolonlar (created_at/updated_at veritabanında yönetilir)
+CATALOG_COLUMNS = [
+    'id', 'product_name', 'category', 'style', 'color', 'width_cm', 'depth_cm', 'height_cm',
+    'description', 'price', 'image_path', 'product_link'
+]
+NULLABLE_COLUMNS = ['width_cm', 'depth_cm', 'height_cm', 'image_path', 'product_link']
+REQUIRED_FIELDS = ['product_name', 'category', 'style', 'color', 'description', 'price']
+
+
+def product_id_for(product_data: Dict[str, Any]) -> str:
+    """
+    Ürün için sabit id üretir.
+    
+    Aynı link farklı kategori dosyalarında farklı ürün olarak bulunabildiği için
+    kategori de anahtara dahildir.
+    """
+    category = product_data['category'].strip()
+    link = (product_data.get('product_link') or '').strip()
+    if link:
+        key = f"link\n{category}\n{link}"
+    else:
+        key = f"content\n{category}\n{product_data['product_name'].strip()}\n{product_data['color'].strip()}"
+    return str(uuid.uuid5(PRODUCT_ID_NAMESPACE, key))
+
+
+def _to_int(value: Any) -> Optional[int]:
+    """Sayısal değeri integer kolona uygun hale getirir (PostgreSQL gibi .5 yukarı yuvarlanır)."""
+    if value is None or value == '':
+        return None
+    return int(math.floor(float(value) + 0.5))
+
+
+def parse_catalog_file(json_file: Path) -> Tuple[str, List[Tuple], List[str]]:
+    """
+    Bir kategori dosyasını CATALOG_COLUMNS sırasında satırlara çevirir.
+    
+    Returns:
+        (dosya adı, satırlar, hata mesajları)
+    """
+    rows, errors = [], []
+    try:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            products_data = json.load(f)
+    except Exception as e:
+        return json_file.name, rows, [f"Dosya okuma hatası: {e}"]
+    
+    for product_data in products_data:
+        try:
+            missing = [field for field in REQUIRED_FIELDS if product_data.get(field) in (None, '')]
+            if missing:
+                raise ValueError(f"eksik alanlar: {', '.join(missing)}")
+            
+            # Boyutları çıkar (dimensions dict'inden, None olabilir)
+            dimensions = product_data.get('dimensions')
+            if not isinstance(dimensions, dict):
+                dimensions = {}
+            
+            rows.append((
+                product_id_for(product_data),
+                product_data['product_name'],
+                product_data['category'],
+                product_data['style'],
+                product_data['color'],
+                _to_int(dimensions.get('width_cm')),
+                _to_int(dimensions.get('depth_cm')),
+                _to_int(dimensions.get('height_cm')),
+                product_data['description'],
+                _to_int(product_data['price']),
+                product_data.get('image_path'),
+                product_data.get('product_link')
+            ))
+        except Exception as e:
+            errors.append(f"{product_data.get('product_name', 'Unknown')}: {e}")
+    
+    return json_file.name, rows, errors
+
+
+def _rows_to_csv(rows: List[Tuple]) -> io.StringIO:
+    """COPY için CSV: metinler tırnaklı; None boş yazılır ve FORCE_NULL ile NULL olur."""
+    buffer = io.StringIO()
+    csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC).writerows(rows)
+    buffer.seek(0)
+    return buffer
+
+
+# Staging tablosundaki satırları products'a birleştirir; sadece gerçekten değişen satırlar yazılır ve döner
+_MERGE_SQL = """
+    INSERT INTO products ({columns})
+    SELECT {columns} FROM products_staging
+    ON CONFLICT (id) DO UPDATE SET {updates}, updated_at = now()
+    WHERE ({current}) IS DISTINCT FROM ({incoming})
+    RETURNING id, product_name, category, (xmax = 0) AS inserted
+""".format(
+    columns=", ".join(CATALOG_COLUMNS),
+    updates=", ".join(f"{column} = EXCLUDED.{column}" for column in CATALOG_COLUMNS[1:]),
+    current=", ".join(f"products.{column}" for column in CATALOG_COLUMNS[1:]),
+    incoming=", ".join(f"EXCLUDED.{column}" for column in CATALOG_COLUMNS[1:])
+)
+
+# Eski yüklemelerden kalan (rastgele uuid4 id'li) kopyalar: aynı ürünün sabit id'li satırı gelince silinir
+_REMOVE_LEGACY_DUPLICATES_SQL = """
+    DELETE FROM products p
+    USING products_staging s
+    WHERE p.id <> s.id
+      AND p.category = s.category
+      AND (
+          p.product_link = s.product_link
+          OR (s.product_link IS NULL AND p.product_link IS NULL
+              AND p.product_name = s.product_name AND p.color = s.color)
+      )
+"""
+
+
 def load_jsonlaryeni_to_products():
-    """backend/data/jsonlaryeni dizinindeki JSON dosyalarını veritabanına yükler"""
+    """backend/data/jsonlaryeni dizinindeki JSON dosyalarını veritabanına yükler (idempotent)"""
+    
+    # JSON dosyalarını listele
+    json_files = sorted(JSONLAR_DIR.glob("*.json"))
+    if not json_files:
+        print(f"❌ {JSONLAR_DIR} dizininde JSON dosyası bulunamadı!")
+        return
+    
+    print("📦 backend/data/jsonlaryeni verilerini Products tablosuna yükleniyor...")
+    print("=" * 70)
+    
+    # Dosyaları paralel oku
+    with ProcessPoolExecutor(max_workers=min(len(json_files), os.cpu_count() or 1)) as executor:
+        parsed_files = list(executor.map(parse_catalog_file, json_files))
+    
+    rows_by_id: Dict[str, Tuple] = {}
+    total_skipped = 0
+    for filename, rows, errors in parsed_files:
+        print(f"  📄 {filename}: {len(rows)} ürün okundu, {len(errors)} atlandı")
+        for error in errors:
+            print(f"      ❌ Hata: {error}")
+        total_skipped += len(errors)
+        for row in rows:
+            rows_by_id[row[0]] = row  # Aynı ürün birden fazla kez gelirse sonuncusu geçerli
+    
+    total_rows = sum(len(rows) for _, rows, _ in parsed_files)
+    if total_rows != len(rows_by_id):
+        print(f"  ⚠️  {total_rows - len(rows_by_id)} tekrar eden ürün birleştirildi")
     
     # Veritabanı bağlantısı
     engine = create_engine(DATABASE_URL)
@@ -49,120 +203,71 @@ def load_jsonlaryeni_to_products():
     # Products tablosunu oluştur (eğer yoksa)
     metadata.create_all(bind=engine, checkfirst=True)
     
-    # Session oluştur
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    session = SessionLocal()
-    
+    connection = engine.raw_connection()
     try:
-        # JSON dosyalarını listele
-        json_files = list(JSONLAR_DIR.glob("*.json"))
+        cursor = connection.cursor()
         
-        if not json_files:
-            print(f"❌ {JSONLAR_DIR} dizininde JSON dosyası bulunamadı!")
-            return
+        # Staging tablosu transaction sonunda otomatik silinir
+        cursor.execute("CREATE TEMP TABLE products_staging (LIKE products INCLUDING DEFAULTS) ON COMMIT DROP")
+        cursor.copy_expert(
+            f"COPY products_staging ({', '.join(CATALOG_COLUMNS)}) FROM STDIN "
+            f"WITH (FORMAT csv, FORCE_NULL ({', '.join(NULLABLE_COLUMNS)}))",
+            _rows_to_csv(list(rows_by_id.values()))
+        )
         
-        print("📦 backend/data/jsonlaryeni verilerini Products tablosuna yükleniyor...")
-        print("=" * 70)
+        cursor.execute(_REMOVE_LEGACY_DUPLICATES_SQL)
+        removed_count = cursor.rowcount
         
-        total_loaded = 0
-        total_skipped = 0
-        file_summary = {}
+        cursor.execute(_MERGE_SQL)
+        changed = cursor.fetchall()
+        inserted = [row for row in changed if row[3]]
+        updated = [row for row in changed if not row[3]]
         
-        for json_file in json_files:
-            print(f"\n📄 {json_file.name} işleniyor...")
-            
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    products_data = json.load(f)
-                
-                loaded_count = 0
-                skipped_count = 0
-                
-                for product_data in products_data:
-                    try:
-                        # UUID oluştur
-                        product_id = str(uuid.uuid4())
-                        
-                        # Boyutları çıkar (dimensions dict'inden)
-                        dimensions = product_data.get('dimensions', {})
-                        if dimensions is None:
-                            dimensions = {}  # None ise boş dict kullan
-                        
-                        width_cm = dimensions.get('width_cm') if isinstance(dimensions, dict) else None
-                        depth_cm = dimensions.get('depth_cm') if isinstance(dimensions, dict) else None
-                        height_cm = dimensions.get('height_cm') if isinstance(dimensions, dict) else None
-                        
-                        # Raw SQL insert kullan
-                        insert_query = products_table.insert().values(
-                            id=product_id,
-                            product_name=product_data['product_name'],
-                            category=product_data['category'], 
-                            style=product_data['style'],
-                            color=product_data['color'],
-                            width_cm=width_cm,
-                            depth_cm=depth_cm,
-                            height_cm=height_cm,
-                            description=product_data['description'],
-                            price=product_data['price'],
-                            image_path=product_data.get('image_path'),
-                            product_link=product_data.get('product_link')
-                        )
-                        
-                        session.execute(insert_query)
-                        loaded_count += 1
-                        
-                    except Exception as e:
-                        print(f"      ❌ Hata: {product_data.get('product_name', 'Unknown')}: {e}")
-                        skipped_count += 1
-                        continue
-                
-                print(f"    ✅ {loaded_count} ürün eklendi, {skipped_count} atlandı")
-                file_summary[json_file.name] = {
-                    'loaded': loaded_count,
-                    'skipped': skipped_count
-                }
-                total_loaded += loaded_count
-                total_skipped += skipped_count
-                
-            except Exception as e:
-                print(f"    ❌ Dosya okuma hatası: {e}")
-                continue
+        # Çalışan uygulama önbelleklerini yenilesin (NOTIFY commit ile birlikte teslim edilir)
+        if changed or removed_count:
+            cursor.execute(
+                "SELECT pg_notify(%s, %s)",
+                (settings.CATALOG_NOTIFY_CHANNEL, json.dumps({
+                    "inserted": len(inserted),
+                    "updated": len(updated),
+                    "removed": removed_count,
+                    "categories": sorted({row[2] for row in changed})
+                }))
+            )
         
-        # Değişiklikleri kaydet
-        session.commit()
+        connection.commit()
         
         print(f"\n🎉 Başarıyla tamamlandı!")
-        print(f"📊 Toplam {total_loaded} ürün veritabanına yüklendi")
+        print(f"📊 {len(rows_by_id)} ürün işlendi: {len(inserted)} yeni, {len(updated)} güncellendi, "
+              f"{len(rows_by_id) - len(changed)} değişmedi")
+        if removed_count:
+            print(f"🧹 Eski yüklemelerden kalan {removed_count} kopya ürün silindi")
         print(f"⚠️  Toplam {total_skipped} ürün atlandı (hata nedeniyle)")
         
-        # Dosya bazında özet
-        print(f"\n📋 Dosya bazında özet:")
-        for filename, stats in file_summary.items():
-            print(f"  • {filename}: {stats['loaded']} yüklendi, {stats['skipped']} atlandı")
-        
-        # Kontrol: Veritabanındaki toplam ürün sayısı
-        result = session.execute(text("SELECT COUNT(*) FROM products")).fetchone()
-        total_in_db = result[0] if result else 0
-        print(f"\n📋 Veritabanındaki toplam ürün sayısı: {total_in_db}")
+        # Sadece değişen ürünler
+        for label, rows in (("➕ Yeni", inserted), ("✏️  Güncellenen", updated)):
+            if rows:
+                print(f"\n{label} ürünler:")
+                for _, product_name, category, _ in rows:
+                    print(f"  • [{category}] {product_name}")
         
         # Kategori dağılımı
         print(f"\n📊 Kategori dağılımı:")
-        category_result = session.execute(text("""
+        cursor.execute("""
             SELECT category, COUNT(*) as count 
             FROM products 
             GROUP BY category 
             ORDER BY count DESC
-        """)).fetchall()
-        
-        for category, count in category_result:
+        """)
+        for category, count in cursor.fetchall():
             print(f"  • {category}: {count} ürün")
             
     except Exception as e:
         print(f"❌ Genel hata: {e}")
-        session.rollback()
+        connection.rollback()
         raise
     finally:
-        session.close()
+        connection.close()
 
 def verify_loaded_data():
     """Yüklenen verileri doğrular"""
@@ -278,6 +383,7 @@ if __name__ == "__main__":
         
         print(f"\n✅ Başarıyla tamamlandı!")
         print(f"\n💡 Notlar:")
+        print(f"   • Script tekrar çalıştırılabilir: sadece yeni/değişen ürünler yazılır")
         print(f"   • Fiyat alanları JSON dosyalarından alındı")
         print(f"   • Resim yolları JSON dosyalarından alındı") 
         print(f"   • Resimler data/products/kategori/ dizinlerinde bulunuyor")
@@ -6,7 +6,15 @@ import os
 from config import settings, setup_logging, logger
 from models import DesignRequestModel, DesignResponseModel
 from exceptions import setup_exception_handlers
-from routers import design_router, health_router, websocket_router, auth_router, favorites_router, blog_router
+from middleware import ServerTimingMiddleware
+from routers import design_router, health_router, websocket_router, auth_router, favorites_router, blog_router, discovery_router, metrics_router
+from services.auth.password_hasher import password_hasher
+from services.communication.websocket_manager import websocket_manager
+from services.design.mood_board_service import mood_board_service
+from services.design.design_index_sync import design_index_sync
+from services.ai.catalog_listener import catalog_listener
+from services.ai.warmup import ai_warmup, import_image_sdks
+from services.ai.provider import ai_services
 
 # Initialize logging
 setup_logging()
@@ -16,9 +24,21 @@ async def lifespan(app: FastAPI):
     """Application lifespan event handler."""
     # Startup
     logger.info("Starting Deko Assistant AI API...")
+    await websocket_manager.start()
+    await mood_board_service.load_generation_time_history()
+    await design_index_sync.rebuild()
+    await design_index_sync.start()
+    await catalog_listener.start()
+    if settings.AI_WARMUP_ON_STARTUP:
+        ai_warmup.start(ai_services.warmup_steps() + [import_image_sdks])
     yield
     # Shutdown
     logger.info("Shutting down Deko Assistant AI API...")
+    await websocket_manager.stop()
+    await catalog_listener.stop()
+    await design_index_sync.stop()
+    await ai_warmup.stop()
+    password_hasher.shutdown()
 
 app = FastAPI(
     title=settings.APP_TITLE,
@@ -36,6 +56,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Stage timing of sampled requests (Server-Timing header)
+app.add_middleware(ServerTimingMiddleware)
+
 # Setup exception handlers
 setup_exception_handlers(app)
 
@@ -56,9 +79,11 @@ logger.debug(f"Static files mounted: /static/products -> {products_static_path}"
 
 # Include routers
 app.include_router(health_router, tags=["Health"])
+app.include_router(metrics_router, tags=["Metrics"])
 app.include_router(auth_router, prefix="/api", tags=["Authentication"])
 app.include_router(favorites_router, prefix="/api", tags=["Favorites"])
 app.include_router(blog_router, prefix="/api", tags=["Blog"])
+app.include_router(discovery_router, prefix="/api", tags=["Discovery"])
 app.include_router(design_router, prefix="/api", tags=["Design"])
 app.include_router(websocket_router, prefix="/api", tags=["WebSocket"])
 
@@ -68,5 +93,7 @@ if __name__ == "__main__":
         "main:app",  # Import string format
         host=settings.host,      # Automatic based on environment
         port=settings.port,      # Automatic based on environment  
-        reload=settings.reload   # Automatic based on environment
+        reload=settings.reload,  # Automatic based on environment
+        ws_ping_interval=settings.WS_PING_INTERVAL,
+        ws_ping_timeout=settings.WS_PING_TIMEOUT
     )
\ No newline at end of file
@@ -2,5 +2,6 @@
 Middleware package initialization.
 """
 from .auth_middleware import optional_auth, get_current_user_optional, require_auth
+from .timing_middleware import ServerTimingMiddleware
 
-__all__ = ["optional_auth", "get_current_user_optional", "require_auth"]
+__all__ = ["optional_auth", "get_current_user_optional", "require_auth", "ServerTimingMiddleware"]
@@ -0,0 +1,39 @@
+"""
+Server-Timing middleware for sampled HTTP requests.
+Stages are recorded with utils.timing.span() by the code handling the request.
+"""
+from utils.timing import Timing, is_sampled, log_timing, reset_current_timing, set_current_timing
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware: times sampled HTTP requests, adds the Server-Timing
+    header to their response and logs one timing record per request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not is_sampled():
+            await self.app(scope, receive, send)
+            return
+
+        timing = Timing(f"{scope['method']} {scope['path']}")
+        token = set_current_timing(timing)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                timing.attributes["status"] = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timing.server_timing_header().encode("latin-1")))
+                message = {**message, "headers": headers}
+                log_timing(timing)
+                # Background tasks run after the response: keep them out of this record
+                set_current_timing(None)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            reset_current_timing(token)
@@ -157,7 +157,7 @@ class Hashtag(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(50), unique=True, nullable=False, index=True)  # e.g., "#modern", "#living_room"
     
-    # Usage statistics (optional, for future analytics)
+    # Usage statistics: number of designs tagged with this hashtag (maintained by HashtagService)
     usage_count = Column(Integer, default=0, nullable=False)
     
     # Timestamps
@@ -185,9 +185,9 @@ class DesignHashtag(Base):
     # Relationships
     design = relationship("Design", back_populates="hashtags")
     
-    # Composite index for performance
+    # Composite index for performance (unique: target of the bulk INSERT ... ON CONFLICT)
     __table_args__ = (
-        Index('idx_design_hashtag', 'design_id', 'hashtag'),
+        Index('idx_design_hashtag', 'design_id', 'hashtag', unique=True),
         Index('idx_design_order', 'design_id', 'order_index'),
     )
     
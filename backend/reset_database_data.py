@@ -4,6 +4,7 @@ Bu script veritabanındaki tüm tabloların verilerini siler ama tablo yapılar
 alembic_version tablosu korunur.
 """
 import asyncio
+import json
 import sys
 from sqlalchemy import text
 from config.database import engine
@@ -96,6 +97,13 @@ async def reset_database_data():
                 except Exception as e:
                     print(f"  ❌ {table}: Hata - {str(e)}")
             
+            # Çalışan uygulamaların tasarım indeksleri yeniden yüklensin (commit ile birlikte teslim edilir)
+            if deleted_counts.get('designs'):
+                await conn.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {"channel": settings.DESIGN_INDEX_NOTIFY_CHANNEL, "payload": json.dumps({"event": "rebuild"})}
+                )
+            
             # Sequence'leri sıfırla (AUTO_INCREMENT ID'ler için)
             print("\n🔢 ID sequence'leri sıfırlanıyor...")
             for table in all_tables_ordered:
@@ -4,5 +4,7 @@ from .websocket_router import router as websocket_router
 from .auth_router import router as auth_router
 from .favorites_router import router as favorites_router
 from .blog_router import router as blog_router
+from .discovery_router import router as discovery_router
+from .metrics_router import router as metrics_router
 
-__all__ = ["health_router", "design_router", "websocket_router", "auth_router", "favorites_router", "blog_router"]
+__all__ = ["health_router", "design_router", "websocket_router", "auth_router", "favorites_router", "blog_router", "discovery_router", "metrics_router"]
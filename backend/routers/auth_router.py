@@ -113,7 +113,7 @@ async def register_user(
                 counter += 1
         
         # Hash password
-        hashed_password = AuthService.get_password_hash(user_data.password)
+        hashed_password = await AuthService.get_password_hash_async(user_data.password)
         
         # Create user
         new_user = User(
@@ -155,7 +155,13 @@ async def login_user(
     result = await db.execute(select(User).where(User.email == form_data.username))
     user = result.scalar_one_or_none()
     
-    if not user or not AuthService.verify_password(form_data.password, user.hashed_password):
+    password_valid, new_hash = False, None
+    if user:
+        password_valid, new_hash = await AuthService.verify_password_async(
+            form_data.password, user.hashed_password
+        )
+    
+    if not password_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -167,6 +173,11 @@ async def login_user(
             detail="User account is deactivated"
         )
     
+    # Transparently upgrade the stored hash when bcrypt cost settings changed
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+    
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = AuthService.create_access_token(
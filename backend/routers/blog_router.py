@@ -17,6 +17,8 @@ from models.design_models_db import (
     DesignHashtag, MoodBoard
 )
 from routers.auth_router import get_current_user, get_current_user_optional
+from services.design.hashtag_index import hashtag_index
+from services.design.design_index_sync import design_index_sync
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/blog", tags=["Blog"])
@@ -233,8 +235,10 @@ async def publish_design_to_blog(
     )
     
     db.add(blog_post)
+    await design_index_sync.notify(db, "published", design_id)
     await db.commit()
     await db.refresh(blog_post)
+    hashtag_index.mark_published(design_id)
     
     return {
         "success": True,
@@ -1,9 +1,12 @@
 from fastapi import APIRouter, Form, HTTPException, BackgroundTasks, Depends, Query, status, Body
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from config import logger
-from config.database import get_db, get_async_session
+from config.database import get_db, get_async_session, async_session_maker
 from config.constants import DESIGN_NOT_FOUND, DESIGN_CREATED_SUCCESS
 from utils.error_handler import ErrorHandler
+from utils.timing import span
+from utils.metrics import metrics
+from utils.singleflight import SingleFlight, fingerprint
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
@@ -11,11 +14,15 @@ from models import DesignResponseModel
 from models.design_request_models import DesignRequest
 from models.user_models import User
 from models.design_models_db import Design, MoodBoard, DesignHashtag
-from services import GeminiService, DesignHistoryService, mood_board_service, mood_board_log_service
+from services import GeminiService, MoodBoardService, DesignHistoryService, mood_board_log_service, hashtag_index, related_design_index
+from services.ai.provider import get_gemini_service, get_mood_board_service
+from services.design.design_index_sync import design_index_sync
 from middleware.auth_middleware import OptionalAuth, optional_auth
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator
 import os
 import time
+import copy
+import functools
 from datetime import datetime
 import uuid
 import json
@@ -77,25 +84,209 @@ def save_gemini_prompt_to_file(prompt_data):
 
 # Service Container Pattern
 class DesignServices:
-    """Service container for design operations"""
+    """Service container for design operations (AI services come from the provider via Depends)"""
     _instance = None
     
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
-            cls._instance.gemini_service = GeminiService()
-            cls._instance.history_service = DesignHistoryService()
-            cls._instance.mood_board_service = mood_board_service
         return cls._instance
+    
+    @functools.cached_property
+    def history_service(self) -> DesignHistoryService:
+        return DesignHistoryService()
 
 services = DesignServices()
 
+
+# In-flight design generations keyed by request fingerprint
+design_flight = SingleFlight("design")
+metrics.gauge_callback(
+    "design_requests_coalesced_total", "Design requests answered by an identical in-flight generation",
+    lambda: design_flight.get_stats()["coalesced"], type_name="counter"
+)
+
+
+def design_request_fingerprint(
+    design_request: DesignRequest,
+    color_info: str,
+    product_categories: Optional[Dict[str, Any]]
+) -> str:
+    """Fingerprint of the generation inputs (whitespace-normalized; connection and user excluded)."""
+    def normalize(text: Optional[str]) -> str:
+        return " ".join((text or "").split())
+    
+    return fingerprint({
+        "room_type": normalize(design_request.room_type),
+        "design_style": normalize(design_request.design_style),
+        "notes": normalize(design_request.notes),
+        "price": design_request.price,
+        "width": design_request.width,
+        "length": design_request.length,
+        "height": design_request.height,
+        "color_info": normalize(color_info),
+        "product_categories": product_categories
+    })
+
+
+def schedule_room_visualization(
+    mood_board_service: MoodBoardService,
+    background_tasks: BackgroundTasks,
+    design_request: DesignRequest,
+    design_result: Dict[str, Any],
+    design_id: str,
+    user_id: Optional[int],
+    color_info: str,
+    product_categories: Optional[Dict[str, Any]]
+):
+    """Queue HYBRID room visualization generation for the request's WebSocket connection."""
+    connection_id = design_request.connection_id
+    logger.info(f"Starting HYBRID background room visualization generation for connection: {connection_id}")
+    
+    # Prepare hybrid mood board data (real images + fake descriptions)
+    real_product_images = []
+    for product in design_result.get("products", []):
+        if product.get("is_real") and product.get("image_path"):
+            real_product_images.append(product.get("image_path"))
+    
+    logger.info(f"Mood board will use {len(real_product_images)} real product images for visual reference")
+    
+    # Start hybrid mood board generation in background
+    background_tasks.add_task(
+        mood_board_service.generate_hybrid_mood_board,
+        connection_id=connection_id,
+        room_type=design_request.room_type,
+        design_style=design_request.design_style,
+        notes=design_request.notes,
+        design_title=design_result["title"],
+        design_description=design_result["description"],
+        products=design_result.get("products", []),
+        design_id=design_id,
+        user_id=user_id,
+        color_info=color_info,
+        width=design_request.width,
+        length=design_request.length,
+        height=design_request.height,
+        product_categories=product_categories
+    )
+
+
+async def save_design_record(
+    gemini_service: GeminiService,
+    db: AsyncSession,
+    design_id: str,
+    user_id: Optional[int],
+    user_email: str,
+    design_request: DesignRequest,
+    color_info: str,
+    design_result: Dict[str, Any]
+):
+    """Persist a generated design and its hashtags. Failures are logged, not raised."""
+    try:
+        # Use structured product_categories data directly
+        parsed_product_categories = design_request.get_product_categories_as_dict()
+        
+        db_design = Design(
+            id=design_id,
+            user_id=user_id,  # Will be None for guests
+            title=design_result["title"],
+            description=design_result["description"],
+            room_type=design_request.room_type,
+            design_style=design_request.design_style,
+            notes=design_request.notes,
+            width=design_request.width,  # Doğrudan frontend'den gelen değer
+            length=design_request.length,  # Doğrudan frontend'den gelen değer
+            height=design_request.height,  # Doğrudan frontend'den gelen değer
+            color_info=color_info,  # Renk paleti bilgisi
+            product_categories=parsed_product_categories,  # Seçilen ürün kategorileri
+            price=design_request.price,  # Fiyat limiti (TL)
+            product_suggestion=design_result["product_suggestion"],
+            products=design_result.get("products", []),
+            gemini_response=design_result,
+            is_favorite=False
+        )
+        
+        db.add(db_design)
+        
+        # Save hashtags if they exist
+        hashtags = design_result.get("hashtags", {})
+        logger.info(f"Hashtags from Gemini for design {design_id}: {hashtags}")
+        
+        # Check if any hashtags exist (en, tr, or display)
+        has_hashtags = (
+            (hashtags.get("en") and len(hashtags.get("en", [])) > 0) or
+            (hashtags.get("tr") and len(hashtags.get("tr", [])) > 0) or
+            (hashtags.get("display") and len(hashtags.get("display", [])) > 0)
+        )
+        
+        saved_hashtags = []
+        if hashtags and has_hashtags:
+            # Design row and hashtags go in one transaction: flush the design (FK target),
+            # then a single statement writes the hashtags and their usage counters
+            with span("db_save"):
+                await db.flush()
+            with span("hashtags"):
+                hashtags_saved = await gemini_service.save_design_hashtags(db, design_id, hashtags)
+            if hashtags_saved:
+                saved_hashtags = (hashtags.get("en") or []) + (hashtags.get("tr") or hashtags.get("display") or [])
+            else:
+                # Continue even if hashtag saving fails: save the design without them
+                await db.rollback()
+                db.add(db_design)
+        else:
+            logger.warning(f"No valid hashtags found for design {design_id}. Hashtags data: {hashtags}")
+        
+        with span("db_save"):
+            await design_index_sync.notify(db, "saved", design_id)  # Other workers index it after the commit
+            await db.commit()
+        with span("index"):
+            hashtag_index.add_design(design_id, saved_hashtags, user_id)
+            related_design_index.add_design(design_id, saved_hashtags, db_design.products, db_design.design_style)
+        logger.info(f"Design saved to database for {user_email} with ID: {design_id}")
+        
+    except Exception as db_error:
+        logger.error(f"Error saving design to database: {str(db_error)}")
+        await db.rollback()
+        # Continue with response even if database save fails
+
+
+def build_design_response(
+    design_id: str,
+    design_request: DesignRequest,
+    design_result: Dict[str, Any],
+    user_id: Optional[int]
+) -> DesignResponseModel:
+    """Build the design endpoint response from a design result."""
+    connection_id = design_request.connection_id
+    return DesignResponseModel(
+        design_id=design_id,  # Always provide design_id for favorites UI
+        room_type=design_request.room_type,
+        design_style=design_request.design_style,
+        notes=design_request.notes,
+        design_title=design_result["title"],
+        design_description=design_result["description"],
+        hashtags=design_result.get("hashtags", {"en": [], "tr": [], "display": []}),
+        product_suggestion=design_result["product_suggestion"],
+        products=design_result.get("products", []),
+        success=True,
+        message=DESIGN_CREATED_SUCCESS + 
+               (f" - Room visualization generating for connection: {connection_id}" if connection_id else "") +
+               (" - Saved to your account" if user_id else " - Sign in to save designs to your account")
+    )
+
+
+def format_sse_event(event: str, data: Any) -> str:
+    """Format a Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
 @router.post("/test", response_model=DesignResponseModel)
 async def design_request_endpoint(
     design_request: DesignRequest,
     background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
-    auth_data: dict = Depends(OptionalAuth())
+    auth_data: dict = Depends(OptionalAuth()),
+    gemini_service: GeminiService = Depends(get_gemini_service),
+    mood_board_service: MoodBoardService = Depends(get_mood_board_service)
 ):
     """
     Main design request endpoint - Enhanced room visualization generation.
@@ -157,21 +348,32 @@ async def design_request_endpoint(
             "product_categories": parsed_product_categories_for_ai,
             "user_email": user_email
         }
-        save_gemini_prompt_to_file(prompt_data_for_logging)
+        with span("prompt_log"):
+            save_gemini_prompt_to_file(prompt_data_for_logging)
 
         # Generate HYBRID design suggestion using Function Calling
-        design_result = await services.gemini_service.generate_hybrid_design_suggestion(
-            room_type=room_type,
-            design_style=design_style,
-            notes=notes,
-            price=price,
-            db_session=db,
-            width=width,
-            length=length,
-            height=height,
-            color_info=color_info,
-            product_categories=parsed_product_categories_for_ai  # ✅ Gemini AI'ya gönderiliyor
+        async def generate_design():
+            return await gemini_service.generate_hybrid_design_suggestion(
+                room_type=room_type,
+                design_style=design_style,
+                notes=notes,
+                price=price,
+                db_session=db,
+                width=width,
+                length=length,
+                height=height,
+                color_info=color_info,
+                product_categories=parsed_product_categories_for_ai  # ✅ Gemini AI'ya gönderiliyor
+            )
+        
+        # Identical requests in flight share one Gemini session; each still gets its own design row
+        design_result, shared = await design_flight.do(
+            design_request_fingerprint(design_request, color_info, parsed_product_categories_for_ai),
+            generate_design
         )
+        if shared:
+            design_result = copy.deepcopy(design_result)
+            logger.info(f"Design request from {user_email} coalesced with an identical in-flight request")
         
         logger.info(f"HYBRID design suggestion created successfully for {user_email}: {design_result['title']}")
         
@@ -185,107 +387,15 @@ async def design_request_endpoint(
         
         # Start HYBRID room visualization generation in background if connection_id is provided
         if connection_id:
-            logger.info(f"Starting HYBRID background room visualization generation for connection: {connection_id}")
-            
-            # Prepare hybrid mood board data (real images + fake descriptions)
-            real_product_images = []
-            for product in design_result.get("products", []):
-                if product.get("is_real") and product.get("image_path"):
-                    real_product_images.append(product.get("image_path"))
-            
-            logger.info(f"Mood board will use {len(real_product_images)} real product images for visual reference")
-            
-            # Start hybrid mood board generation in background
-            background_tasks.add_task(
-                services.mood_board_service.generate_hybrid_mood_board,
-                connection_id=connection_id,
-                room_type=room_type,
-                design_style=design_style,
-                notes=notes,
-                design_title=design_result["title"],
-                design_description=design_result["description"],
-                products=design_result.get("products", []),
-                design_id=design_id,
-                user_id=user_id,
-                color_info=color_info,
-                width=width,
-                length=length,
-                height=height,
-                product_categories=parsed_product_categories_for_ai
+            schedule_room_visualization(
+                mood_board_service, background_tasks, design_request, design_result, design_id, user_id,
+                color_info, parsed_product_categories_for_ai
             )
         
         # Save design to database for all users (guest and authenticated)
-        try:
-            # Use structured product_categories data directly
-            parsed_product_categories = design_request.get_product_categories_as_dict()
-            
-            db_design = Design(
-                id=design_id,
-                user_id=user_id,  # Will be None for guests
-                title=design_result["title"],
-                description=design_result["description"],
-                room_type=room_type,
-                design_style=design_style,
-                notes=notes,
-                width=width,  # Doğrudan frontend'den gelen değer
-                length=length,  # Doğrudan frontend'den gelen değer
-                height=height,  # Doğrudan frontend'den gelen değer
-                color_info=color_info,  # Renk paleti bilgisi
-                product_categories=parsed_product_categories,  # Seçilen ürün kategorileri
-                price=price,  # Fiyat limiti (TL)
-                product_suggestion=design_result["product_suggestion"],
-                products=design_result.get("products", []),
-                gemini_response=design_result,
-                is_favorite=False
-            )
-            
-            db.add(db_design)
-            await db.commit()
-            await db.refresh(db_design)
-            
-            logger.info(f"Design saved to database for {user_email} with ID: {design_id}")
-            
-            # Save hashtags if they exist
-            hashtags = design_result.get("hashtags", {})
-            logger.info(f"Hashtags from Gemini for design {design_id}: {hashtags}")
-            
-            # Check if any hashtags exist (en, tr, or display)
-            has_hashtags = (
-                (hashtags.get("en") and len(hashtags.get("en", [])) > 0) or
-                (hashtags.get("tr") and len(hashtags.get("tr", [])) > 0) or
-                (hashtags.get("display") and len(hashtags.get("display", [])) > 0)
-            )
-            
-            if hashtags and has_hashtags:
-                try:
-                    await services.gemini_service.save_design_hashtags(db, design_id, hashtags)
-                    logger.info(f"Hashtags saved for design {design_id}: EN={hashtags.get('en', [])} TR={hashtags.get('tr', [])} DISPLAY={hashtags.get('display', [])}")
-                except Exception as hashtag_error:
-                    logger.error(f"Error saving hashtags for design {design_id}: {str(hashtag_error)}")
-                    # Continue even if hashtag saving fails
-            else:
-                logger.warning(f"No valid hashtags found for design {design_id}. Hashtags data: {hashtags}")
-            
-        except Exception as db_error:
-            logger.error(f"Error saving design to database: {str(db_error)}")
-            await db.rollback()
-            # Continue with response even if database save fails
+        await save_design_record(gemini_service, db, design_id, user_id, user_email, design_request, color_info, design_result)
         
-        return DesignResponseModel(
-            design_id=design_id,  # Always provide design_id for favorites UI
-            room_type=room_type,
-            design_style=design_style,
-            notes=notes,
-            design_title=design_result["title"],
-            design_description=design_result["description"],
-            hashtags=design_result.get("hashtags", {"en": [], "tr": [], "display": []}),
-            product_suggestion=design_result["product_suggestion"],
-            products=design_result.get("products", []),
-            success=True,
-            message=DESIGN_CREATED_SUCCESS + 
-                   (f" - Room visualization generating for connection: {connection_id}" if connection_id else "") +
-                   (" - Saved to your account" if user_id else " - Sign in to save designs to your account")
-        )
+        return build_design_response(design_id, design_request, design_result, user_id)
         
     except Exception as e:
         logger.error(f"Error while creating design suggestion for {user_email}: {str(e)}")
@@ -306,6 +416,111 @@ async def design_request_endpoint(
         )
 
 
+@router.post("/test/stream")
+async def design_stream_endpoint(
+    design_request: DesignRequest,
+    background_tasks: BackgroundTasks,
+    auth_data: dict = Depends(OptionalAuth()),
+    gemini_service: GeminiService = Depends(get_gemini_service),
+    mood_board_service: MoodBoardService = Depends(get_mood_board_service)
+):
+    """
+    Streaming variant of /design/test using Server-Sent Events.
+    
+    Sends title, description and each product as soon as they are parsed
+    from the Gemini stream, then a final "done" event with the same payload
+    as /design/test plus timing (time to first content and total latency).
+    
+    Events: title, description, hashtags, product, done, error
+    """
+    user = auth_data.get("user")
+    user_id = user.id if user else None
+    user_email = user.email if user else "guest"
+    
+    # Validate user_id type - it should be integer
+    if user_id is not None and not isinstance(user_id, int):
+        logger.warning(f"user_id is not integer (value: {user_id}, type: {type(user_id)}). Setting to None for guest mode.")
+        user_id = None
+        user_email = "guest"
+    
+    logger.info(f"STREAMING HYBRID design request from {user_email}: {design_request.room_type} - {design_request.design_style}")
+    
+    return StreamingResponse(
+        _design_event_stream(gemini_service, mood_board_service, design_request, background_tasks, user_id, user_email),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _design_event_stream(
+    gemini_service: GeminiService,
+    mood_board_service: MoodBoardService,
+    design_request: DesignRequest,
+    background_tasks: BackgroundTasks,
+    user_id: Optional[int],
+    user_email: str
+) -> AsyncIterator[str]:
+    """Generate SSE frames for a streaming design request."""
+    started_at = time.perf_counter()
+    first_content_at = None
+    color_info = design_request.get_color_info_as_string()
+    parsed_product_categories_for_ai = design_request.get_product_categories_as_dict()
+    
+    # The request-scoped session is closed once the endpoint returns, so the stream owns its own
+    async with async_session_maker() as db:
+        try:
+            design_result = None
+            async for event in gemini_service.stream_hybrid_design_suggestion(
+                room_type=design_request.room_type,
+                design_style=design_request.design_style,
+                notes=design_request.notes,
+                price=design_request.price,
+                db_session=db,
+                width=design_request.width,
+                length=design_request.length,
+                height=design_request.height,
+                color_info=color_info,
+                product_categories=parsed_product_categories_for_ai
+            ):
+                if event["type"] == "result":
+                    design_result = event["data"]
+                    continue
+                if event["type"] == "error":
+                    # Content was already sent: no fallback result, nothing saved
+                    logger.error(f"Streaming design failed mid-stream for {user_email}: {event['data']}")
+                    yield format_sse_event("error", {"message": f"A temporary error occurred: {event['data']}"})
+                    return
+                
+                if first_content_at is None:
+                    first_content_at = time.perf_counter()
+                payload = {"data": event["data"]}
+                if "index" in event:
+                    payload["index"] = event["index"]
+                yield format_sse_event(event["type"], payload)
+            
+            design_id = str(uuid.uuid4())
+            if design_request.connection_id:
+                schedule_room_visualization(
+                    mood_board_service, background_tasks, design_request, design_result, design_id, user_id,
+                    color_info, parsed_product_categories_for_ai
+                )
+            await save_design_record(gemini_service, db, design_id, user_id, user_email, design_request, color_info, design_result)
+            
+            finished_at = time.perf_counter()
+            timing = {
+                "time_to_first_content_ms": round((first_content_at - started_at) * 1000) if first_content_at else None,
+                "total_ms": round((finished_at - started_at) * 1000)
+            }
+            logger.info(f"Streaming design completed for {user_email}: ttfc={timing['time_to_first_content_ms']}ms total={timing['total_ms']}ms")
+            
+            response = build_design_response(design_id, design_request, design_result, user_id)
+            yield format_sse_event("done", {"data": response.model_dump(), "timing": timing})
+            
+        except Exception as e:
+            logger.error(f"Error while streaming design suggestion for {user_email}: {str(e)}")
+            yield format_sse_event("error", {"message": f"A temporary error occurred: {str(e)}"})
+
+
 @router.get("/history")
 async def get_design_history(
     limit: int = Query(20, description="Number of designs to return"),
@@ -367,7 +582,10 @@ async def get_design_history(
 
 
 @router.post("/test-image-generation")
-async def test_image_generation(prompt: str = Form(...)):
+async def test_image_generation(
+    prompt: str = Form(...),
+    mood_board_service: MoodBoardService = Depends(get_mood_board_service)
+):
     """
     Test endpoint for Imagen API - generates image from prompt and measures execution time.
     For testing purposes only.
@@ -681,6 +899,20 @@ async def get_design_stats():
             "data": {},
             "message": f"Error retrieving statistics: {str(e)}"
         }
+
+
+@router.get("/coalescing/stats")
+async def get_design_coalescing_stats():
+    """
+    Identical in-flight design requests answered by a single generation.
+    """
+    return {
+        "success": True,
+        "data": design_flight.get_stats(),
+        "message": "Design request coalescing statistics retrieved"
+    }
+
+
 @router.get("/mood-board/history")
 async def get_mood_board_history(limit: int = 20):
     """
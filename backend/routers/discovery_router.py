@@ -0,0 +1,143 @@
+"""
+Discovery router for finding designs by hashtag combinations and similar designs.
+Served from in-memory indexes; only the returned page is read from the database.
+"""
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, or_
+from typing import Any, Dict, List, Optional
+
+from config.database import get_async_session
+from models.user_models import User
+from models.design_models_db import Design, MoodBoard, BlogPost
+from routers.auth_router import get_current_user_optional
+from services.design.hashtag_index import hashtag_index
+from services.design.related_design_index import related_design_index
+
+router = APIRouter(prefix="/designs", tags=["Discovery"])
+
+
+def _visible_to(current_user: Optional[User]):
+    """Designs a user may see: published ones and their own."""
+    if current_user:
+        return or_(BlogPost.is_published == True, Design.user_id == current_user.id)
+    return BlogPost.is_published == True
+
+
+async def _design_summaries(db: AsyncSession, design_ids: List[str], visible_to=None) -> List[Dict[str, Any]]:
+    """Load design cards for the given ids, keeping their order (optionally only visible ones)."""
+    if not design_ids:
+        return []
+
+    query = (
+        select(Design, MoodBoard.image_path)
+        .outerjoin(MoodBoard, MoodBoard.design_id == Design.id)
+        .where(Design.id.in_(design_ids))
+    )
+    if visible_to is not None:
+        query = query.outerjoin(BlogPost, BlogPost.design_id == Design.id).where(visible_to)
+    rows = (await db.execute(query)).all()
+    by_id = {design.id: (design, image_path) for design, image_path in rows}
+
+    summaries = []
+    for design_id in design_ids:
+        if design_id not in by_id:
+            continue
+        design, image_path = by_id[design_id]
+        image_data = None
+        if image_path:
+            image_filename = image_path.split('/')[-1].split('\\')[-1]
+            image_data = {
+                "has_image": True,
+                "image_url": f"/static/mood_boards/{image_filename}"
+            }
+        summaries.append({
+            "design_id": design.id,
+            "title": design.title,
+            "room_type": design.room_type,
+            "design_style": design.design_style,
+            "created_at": design.created_at.isoformat() if design.created_at else None,
+            "image": image_data
+        })
+    return summaries
+
+
+@router.get("/discover")
+async def discover_designs(
+    tags: str = Query("", description="Comma separated hashtags, e.g. #modern,#cozy"),
+    scope: str = Query("public", description="public: published designs, mine: your own designs"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=50),
+    facet_limit: int = Query(20, ge=0, le=100),
+    current_user: Optional[User] = Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_async_session)
+):
+    """
+    Find designs carrying all of the given hashtags, newest first.
+    Facets count the other hashtags of the matching designs to narrow the search further.
+    """
+    if scope not in ("public", "mine"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="scope must be 'public' or 'mine'")
+    if scope == "mine" and not current_user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication required")
+
+    result = hashtag_index.search(
+        tags.split(","),
+        user_id=current_user.id if scope == "mine" else None,
+        offset=offset,
+        limit=limit,
+        facet_limit=facet_limit
+    )
+
+    designs = await _design_summaries(db, result["design_ids"])
+
+    return {
+        "success": True,
+        "data": {
+            "tags": result["tags"],
+            "total": result["total"],
+            "offset": offset,
+            "limit": limit,
+            "designs": designs,
+            "facets": result["facets"]
+        },
+        "message": f"{result['total']} designs found"
+    }
+
+
+@router.get("/{design_id}/related")
+async def get_related_designs(
+    design_id: str,
+    limit: int = Query(6, ge=1, le=24),
+    current_user: Optional[User] = Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_async_session)
+):
+    """
+    Designs similar to the given one (shared hashtags, product categories and style).
+    Only published designs and the user's own designs are returned.
+    """
+    visible_to = _visible_to(current_user)
+    source = (await db.execute(
+        select(Design.id)
+        .outerjoin(BlogPost, BlogPost.design_id == Design.id)
+        .where(Design.id == design_id, visible_to)
+    )).scalar_one_or_none()
+    if not source:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Design not found")
+
+    # Over-fetch: some of the most similar designs may be private
+    matches = related_design_index.related(design_id, limit=limit * 4)
+    similarity = {match["design_id"]: match["similarity"] for match in matches}
+    designs = await _design_summaries(db, list(similarity), visible_to)
+    designs = designs[:limit]
+    for design in designs:
+        design["similarity"] = similarity[design["design_id"]]
+
+    return {
+        "success": True,
+        "data": {
+            "design_id": design_id,
+            "designs": designs
+        },
+        "message": f"{len(designs)} related designs found"
+    }
@@ -13,7 +13,8 @@ from models.user_models import User
 from models.design_models_db import Design, UserFavoriteDesign, UserFavoriteProduct, DesignHashtag, MoodBoard
 from models.auth_schemas import UserResponse
 from routers.auth_router import get_current_user
-from services.ai.gemini_service import GeminiService
+from services.ai.provider import get_hashtag_translation_service
+from services.design.hashtag_translation_service import HashtagTranslationService
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/favorites", tags=["Favorites"])
@@ -147,7 +148,8 @@ async def remove_design_from_favorites(
 @router.get("/my-favorites")
 async def get_my_favorites(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_async_session)
+    db: AsyncSession = Depends(get_async_session),
+    translator: HashtagTranslationService = Depends(get_hashtag_translation_service)
 ):
     """
     Get current user's favorites (designs and products) in a single optimized query.
@@ -191,9 +193,6 @@ async def get_my_favorites(
                 detail="Security violation: Access denied"
             )
     
-    # Initialize Gemini service for hashtag translation
-    gemini_service = GeminiService()
-    
     return {
         "success": True,
         "user_id": current_user.id,
@@ -209,7 +208,7 @@ async def get_my_favorites(
                 "product_suggestion": fav.Design.product_suggestion,
                 "products": fav.Design.products,
                 "hashtags": (
-                    gemini_service.hashtag_service.translate_hashtags([
+                    translator.translate_hashtags([
                         dh.hashtag for dh in sorted(fav.Design.hashtags, key=lambda x: x.order_index)
                     ]) if fav.Design.hashtags else {"en": [], "tr": [], "display": []}
                 ),
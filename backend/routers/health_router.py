@@ -1,5 +1,12 @@
 from fastapi import APIRouter
 from config import logger
+from config.database import get_pool_stats
+from services.auth.password_hasher import password_hasher
+from services.ai.response_processor import response_parse_stats
+from services.ai.rate_limits import get_limiter_stats
+from services.ai.resilience import get_resilience_stats
+from services.design.imagen_cache import imagen_cache
+from services.design.design_index_sync import design_index_sync
 
 router = APIRouter()
 
@@ -10,3 +17,87 @@ async def root():
     """
     logger.info("Request received at root endpoint")
     return {"message": "API is running"}
+
+
+@router.get("/health/db-pool")
+async def db_pool_stats():
+    """
+    Database connection pool usage and checkout wait telemetry.
+    """
+    return {
+        "success": True,
+        "data": get_pool_stats(),
+        "message": "Database pool statistics retrieved"
+    }
+
+
+@router.get("/health/password-hasher")
+async def password_hasher_stats():
+    """
+    bcrypt worker pool: queue depth, running jobs, rejections and wait/run times.
+    """
+    return {
+        "success": True,
+        "data": password_hasher.get_stats(),
+        "message": "Password hasher statistics retrieved"
+    }
+
+
+@router.get("/health/ai-parsing")
+async def ai_parsing_stats():
+    """
+    Gemini design response parse outcomes and failure rates.
+    """
+    return {
+        "success": True,
+        "data": response_parse_stats.get_stats(),
+        "message": "AI response parsing statistics retrieved"
+    }
+
+
+@router.get("/health/design-index")
+async def design_index_stats():
+    """
+    Hashtag / related design index sizes and cross-worker sync state.
+    """
+    return {
+        "success": True,
+        "data": design_index_sync.get_stats(),
+        "message": "Design index statistics retrieved"
+    }
+
+
+@router.get("/health/model-limits")
+async def model_limit_stats():
+    """
+    Gemini / Imagen rate limiter state: tokens, AIMD concurrency limit, queue and throttling counts.
+    """
+    return {
+        "success": True,
+        "data": get_limiter_stats(),
+        "message": "Model call limiter statistics retrieved"
+    }
+
+
+@router.get("/health/resilience")
+async def resilience_stats():
+    """
+    Circuit breaker state, hedging and retry counts per model call type.
+    """
+    return {
+        "success": True,
+        "data": get_resilience_stats(),
+        "message": "Model call resilience statistics retrieved"
+    }
+
+
+@router.get("/health/imagen-cache")
+async def imagen_cache_stats():
+    """
+    Imagen result cache: stored images, size against the limit, hit rate and evictions.
+    """
+    return {
+        "success": True,
+        "data": imagen_cache.get_stats(),
+        "message": "Imagen cache statistics retrieved"
+    }
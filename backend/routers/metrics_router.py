@@ -0,0 +1,51 @@
+"""
+Prometheus metrics endpoint.
+Histograms and counters are updated where the work happens; pool, password hasher and WebSocket state is read at scrape time.
+"""
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from config.database import get_pool_stats
+from services.auth.password_hasher import password_hasher
+from services.communication.websocket_manager import websocket_manager
+from utils.metrics import metrics, PROMETHEUS_CONTENT_TYPE
+
+router = APIRouter()
+
+
+def _pool_stat(key: str):
+    return lambda: get_pool_stats().get(key, 0)
+
+
+def _send_queue_stat(key: str):
+    return lambda: websocket_manager.get_send_queue_stats()[key]
+
+
+def _password_hasher_stat(key: str):
+    return lambda: password_hasher.get_stats()[key]
+
+
+metrics.gauge_callback("db_pool_checked_out", "Database connections in use", _pool_stat("checked_out"))
+metrics.gauge_callback("db_pool_size", "Database connections held by the pool", _pool_stat("current_size"))
+metrics.gauge_callback("db_pool_overflow", "Database connections opened above pool_size", _pool_stat("overflow"))
+metrics.gauge_callback("db_pool_checkouts_total", "Database connection checkouts", _pool_stat("checkouts"), type_name="counter")
+metrics.gauge_callback("db_pool_timeouts_total", "Database connection checkouts that timed out", _pool_stat("timeouts"), type_name="counter")
+
+metrics.gauge_callback("password_hash_queue_depth", "bcrypt jobs admitted and waiting for a worker", _password_hasher_stat("queued"))
+metrics.gauge_callback("password_hash_waiting", "Hashing requests waiting for admission (queue full)", _password_hasher_stat("waiting_for_admission"))
+metrics.gauge_callback("password_hash_in_flight", "bcrypt jobs running on the hashing pool", _password_hasher_stat("running"))
+metrics.gauge_callback("password_hash_completed_total", "bcrypt jobs completed", _password_hasher_stat("completed"), type_name="counter")
+
+metrics.gauge_callback("websocket_connections", "WebSocket connections of this worker", websocket_manager.get_connection_count)
+metrics.gauge_callback("websocket_send_queue_frames", "Frames waiting in WebSocket send queues", _send_queue_stat("queued_frames"))
+metrics.gauge_callback("websocket_send_queue_max_depth", "Deepest WebSocket send queue", _send_queue_stat("max_queue_depth"))
+metrics.gauge_callback("websocket_slow_consumer_disconnects_total", "Connections dropped because their send queue was full", _send_queue_stat("slow_consumer_disconnects"), type_name="counter")
+metrics.gauge_callback("websocket_idle_disconnects_total", "Connections reaped after missing heartbeats", _send_queue_stat("idle_disconnects"), type_name="counter")
+
+
+@router.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """
+    Metrics of this worker in Prometheus text format.
+    """
+    return Response(content=metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from services.communication.websocket_manager import websocket_manager
+from utils.json_codec import loads
 from config import logger
 
 router = APIRouter()
@@ -8,6 +9,12 @@ router = APIRouter()
 async def websocket_endpoint(websocket: WebSocket):
     """
     WebSocket endpoint for real-time mood board progress tracking.
+    
+    Client messages:
+        {"type": "ping"} - answered with {"type": "pong"}
+        {"type": "pong"} - reply to a server heartbeat
+        {"type": "resubscribe", "mood_board_id": "...", "last_seq": 12}
+            - follow a job after reconnecting and replay missed events
     """
     connection_id = None
     
@@ -17,18 +24,28 @@ async def websocket_endpoint(websocket: WebSocket):
         
         # Keep connection alive and handle incoming messages
         while True:
-            # Wait for client messages (ping/pong, connection status, etc.)
             data = await websocket.receive_text()
+            websocket_manager.touch(connection_id)
             
-            # Handle client messages if needed
-            logger.debug(f"Received message from {connection_id}: {data}")
+            try:
+                message = loads(data)
+            except ValueError:
+                logger.debug(f"Ignoring non-JSON message from {connection_id}")
+                continue
+            if not isinstance(message, dict):
+                continue
             
-            # For now, we just acknowledge the message
-            await websocket_manager.send_personal_message({
-                "type": "message_acknowledged",
-                "original_message": data,
-                "connection_id": connection_id
-            }, connection_id)
+            message_type = message.get("type")
+            if message_type == "ping":
+                await websocket_manager.send_personal_message({"type": "pong"}, connection_id)
+            elif message_type == "resubscribe" and message.get("mood_board_id"):
+                try:
+                    last_seq = int(message.get("last_seq") or 0)
+                except (TypeError, ValueError):
+                    last_seq = 0
+                websocket_manager.resubscribe(connection_id, str(message["mood_board_id"]), last_seq)
+            elif message_type != "pong":
+                logger.debug(f"Received message from {connection_id}: {message_type}")
             
     except WebSocketDisconnect:
         logger.debug(f"WebSocket connection disconnected: {connection_id}")
@@ -50,7 +67,7 @@ async def websocket_stats():
         "success": True,
         "data": {
             "active_connections": websocket_manager.get_connection_count(),
-            "connection_ids": websocket_manager.get_active_connections()
+            "send_queues": websocket_manager.get_send_queue_stats()
         },
         "message": "WebSocket statistics retrieved successfully"
     }
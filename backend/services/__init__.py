@@ -1,50 +1,55 @@
 """
 Services Package - Organized service layer following KISS principle.
 Services are grouped by domain responsibility for better maintainability.
-"""
-from .base_service import BaseService
-
-# AI Services
-from .ai import GeminiService, GeminiClient, NotesParser, ResponseProcessor
-
-# Authentication Services  
-from .auth import AuthService
 
-# Design Services
-from .design import (
-    DesignHistoryService, 
-    HashtagService,
-    MoodBoardService, 
-    mood_board_service,
-    MoodBoardLogService,
-    mood_board_log_service
-)
-
-# Communication Services
-from .communication import WebSocketManager, websocket_manager
+Exports are resolved on first access (PEP 562), so importing one service
+module does not import every domain and its SDKs.
+"""
+import importlib
 
-__all__ = [
+_EXPORTS = {
     # Base
-    "BaseService",
+    "BaseService": ".base_service",
     
     # AI Services
-    "GeminiService",
-    "GeminiClient", 
-    "NotesParser",
-    "ResponseProcessor",
+    "GeminiService": ".ai",
+    "GeminiClient": ".ai",
+    "NotesParser": ".ai",
+    "ResponseProcessor": ".ai",
     
     # Auth Services
-    "AuthService",
+    "AuthService": ".auth",
     
     # Design Services
-    "DesignHistoryService",
-    "HashtagService",
-    "MoodBoardService", 
-    "mood_board_service",
-    "MoodBoardLogService",
-    "mood_board_log_service",
+    "DesignHistoryService": ".design",
+    "HashtagService": ".design",
+    "MoodBoardService": ".design",
+    "mood_board_service": ".design",
+    "MoodBoardLogService": ".design",
+    "mood_board_log_service": ".design",
+    "HashtagIndex": ".design",
+    "hashtag_index": ".design",
+    "RelatedDesignIndex": ".design",
+    "related_design_index": ".design",
+    "DesignIndexSync": ".design",
+    "design_index_sync": ".design",
     
     # Communication Services
-    "WebSocketManager",
-    "websocket_manager"
-]
+    "WebSocketManager": ".communication",
+    "websocket_manager": ".communication"
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
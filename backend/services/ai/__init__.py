@@ -1,15 +1,32 @@
 """
 AI Services - Google Gemini AI integration components.
 Contains specialized AI services following KISS principle.
+
+Exports are resolved on first access (PEP 562); the Gemini SDK itself is
+only imported when a model is first used.
 """
-from .gemini_service import GeminiService
-from .gemini_client import GeminiClient
-from .notes_parser import NotesParser
-from .response_processor import ResponseProcessor
-
-__all__ = [
-    "GeminiService",
-    "GeminiClient", 
-    "NotesParser",
-    "ResponseProcessor"
-]
+import importlib
+
+_EXPORTS = {
+    "GeminiService": ".gemini_service",
+    "GeminiClient": ".gemini_client",
+    "NotesParser": ".notes_parser",
+    "ResponseProcessor": ".response_processor",
+    "AIServiceProvider": ".provider",
+    "ai_services": ".provider"
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
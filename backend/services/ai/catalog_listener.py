@@ -0,0 +1,38 @@
+"""
+CatalogListener - Clears product caches when the catalog changes.
+KISS principle: LISTEN on one PostgreSQL channel, invalidate on every notification.
+"""
+import json
+from config import logger, settings
+from utils.pg_listener import PgNotifyListener
+from .product_service import ProductService
+
+
+class CatalogListener(PgNotifyListener):
+    """
+    Keeps a dedicated asyncpg connection LISTENing on CATALOG_NOTIFY_CHANNEL.
+
+    load_dataset.py sends a NOTIFY in the same transaction that changes the
+    products table, so every worker drops its cached product searches right
+    after the new catalog is committed.
+    """
+
+    def __init__(self, channel: str):
+        super().__init__(channel, "Catalog listener")
+
+    def on_notification(self, payload: str):
+        """Drop cached product searches after a catalog load."""
+        try:
+            changes = json.loads(payload) if payload else {}
+        except ValueError:
+            changes = {}
+        dropped = ProductService.invalidate_cache()
+        logger.info(f"Product catalog changed {changes}, dropped {dropped} cached product searches")
+
+    async def on_reconnect(self):
+        # A catalog load may have happened while disconnected
+        ProductService.invalidate_cache()
+
+
+# Global catalog listener instance
+catalog_listener = CatalogListener(settings.CATALOG_NOTIFY_CHANNEL)
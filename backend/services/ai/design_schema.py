@@ -0,0 +1,86 @@
+"""
+Design output contract - Typed models and Gemini response schema.
+KISS principle: One definition of the title/description/hashtags/products JSON.
+"""
+from typing import Any, Dict, List, Optional, Union
+from pydantic import BaseModel, ConfigDict, ValidationError
+
+
+class DesignProduct(BaseModel):
+    """A product suggested by Gemini."""
+    model_config = ConfigDict(extra="allow")
+
+    category: str
+    name: str
+    description: str = ""
+    price: Optional[Union[int, float, str]] = None
+    style: Optional[str] = None
+    color: Optional[str] = None
+
+
+class DesignOutput(BaseModel):
+    """Design suggestion returned by Gemini."""
+    model_config = ConfigDict(extra="allow")
+
+    title: str
+    description: str = ""
+    hashtags: List[str] = []
+    products: List[DesignProduct] = []
+
+
+def decode_design_output(response_text: str) -> Optional[DesignOutput]:
+    """Decode a raw JSON response straight into DesignOutput (None if it does not conform)."""
+    try:
+        return DesignOutput.model_validate_json(response_text)
+    except ValidationError:
+        return None
+
+
+def validate_design_document(document: Dict[str, Any]) -> Optional[DesignOutput]:
+    """
+    Validate an already parsed (possibly recovered) document.
+    Products that do not match the contract are dropped instead of failing the whole design.
+    """
+    products = []
+    for product in document.get("products") or []:
+        try:
+            products.append(DesignProduct.model_validate(product))
+        except ValidationError:
+            continue
+
+    try:
+        return DesignOutput.model_validate({**document, "products": products})
+    except ValidationError:
+        return None
+
+
+def build_gemini_response_schema():
+    """Gemini response schema for the design contract (used with response_mime_type=application/json)."""
+    import google.generativeai as genai
+    
+    Schema, Type = genai.protos.Schema, genai.protos.Type
+    string = Schema(type=Type.STRING)
+
+    product = Schema(
+        type=Type.OBJECT,
+        properties={
+            "category": string,
+            "name": string,
+            "description": string,
+            "price": Schema(type=Type.NUMBER),
+            "style": string,
+            "color": string
+        },
+        required=["category", "name", "description"]
+    )
+
+    return Schema(
+        type=Type.OBJECT,
+        properties={
+            "title": string,
+            "description": string,
+            "hashtags": Schema(type=Type.ARRAY, items=string),
+            "products": Schema(type=Type.ARRAY, items=product)
+        },
+        required=["title", "description", "hashtags", "products"]
+    )
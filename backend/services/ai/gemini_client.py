@@ -3,15 +3,48 @@ GeminiClient - Simple client for Google Gemini AI API.
 KISS principle: Single responsibility for API communication.
 Supports both regular content generation and Function Calling.
 """
-from typing import Dict, Any, Optional
-import google.generativeai as genai
+from typing import Dict, Any, Optional, AsyncIterator, Iterable
 from config import logger
+from config.prompts import GeminiPrompts
 from ..base_service import BaseService
-from .tools import product_search_tool, FunctionCallHandler
+from .tools import get_product_search_tool, FunctionCallHandler
+from .design_schema import build_gemini_response_schema
+from .rate_limits import gemini_limiter
+from .resilience import design_resilience
+from config.database import async_session_maker
+from utils.metrics import metrics
 import os
 import json
+import time
+import asyncio
+import functools
 from datetime import datetime
 
+GEMINI_LATENCY = metrics.histogram(
+    "gemini_request_duration_seconds", "Gemini API call latency (function calling: whole session)", ["method", "outcome"]
+)
+FUNCTION_CALL_ITERATIONS = metrics.histogram(
+    "gemini_function_call_iterations", "Model turns per function calling session", buckets=(1, 2, 3, 4, 5, 6, 8, 10)
+)
+
+GENERATION_CONFIG = {
+    "temperature": 0.8,
+    "top_p": 0.95,
+    "top_k": 64,
+    "max_output_tokens": 8192,
+}
+
+
+def _observe_latency(method: str, outcome: str, started_at: float):
+    GEMINI_LATENCY.labels(method, outcome).observe(time.perf_counter() - started_at)
+
+
+class _StreamEnd:
+    """Marks the end of a stream iterated in a worker thread."""
+    
+    def __init__(self, error: Optional[BaseException] = None):
+        self.error = error
+
 
 class GeminiClient(BaseService):
     """
@@ -22,33 +55,44 @@ class GeminiClient(BaseService):
     def __init__(self):
         super().__init__()
         
-        # Configure Gemini API
+        # Structured output: constrain design answers to the JSON contract.
+        # Gemini does not accept a JSON response schema together with tools,
+        # so only the tool-less model is constrained.
+        self.structured_output = self.settings.GEMINI_STRUCTURED_OUTPUT
+        
+        # Models are built on first use (or by the startup warm-up), so importing
+        # the app does not pay for the Gemini SDK
+        self.log_operation("Gemini client initialized with Function Calling support")
+    
+    @functools.cached_property
+    def model(self):
+        """Model without tools for regular use."""
+        import google.generativeai as genai
         genai.configure(api_key=self.settings.GEMINI_API_KEY)
         
-        # Initialize model with configuration (without tools for regular use)
-        self.model = genai.GenerativeModel(
+        generation_config = dict(GENERATION_CONFIG)
+        if self.structured_output:
+            generation_config.update({
+                "response_mime_type": "application/json",
+                "response_schema": build_gemini_response_schema(),
+            })
+        
+        return genai.GenerativeModel(
             model_name=self.settings.GENERATIVE_MODEL_NAME,
-            generation_config={
-                "temperature": 0.8,
-                "top_p": 0.95,
-                "top_k": 64,
-                "max_output_tokens": 8192,
-            }
+            generation_config=generation_config
         )
+    
+    @functools.cached_property
+    def model_with_tools(self):
+        """Model with tools for Function Calling."""
+        import google.generativeai as genai
+        genai.configure(api_key=self.settings.GEMINI_API_KEY)
         
-        # Initialize model with tools for Function Calling
-        self.model_with_tools = genai.GenerativeModel(
+        return genai.GenerativeModel(
             model_name=self.settings.GENERATIVE_MODEL_NAME,
-            tools=[product_search_tool],
-            generation_config={
-                "temperature": 0.8,
-                "top_p": 0.95,
-                "top_k": 64,
-                "max_output_tokens": 8192,
-            }
+            tools=[get_product_search_tool()],
+            generation_config=dict(GENERATION_CONFIG)
         )
-        
-        self.log_operation("Gemini client initialized with Function Calling support")
     
     def save_gemini_api_call_to_file(self, prompt_text, api_type="function_calling", response_preview=None):
         """Gemini API'ye gönderilen prompt'ları ve aldığı cevapları kaydet."""
@@ -84,6 +128,7 @@ class GeminiClient(BaseService):
     def generate_content(self, prompt: str) -> Optional[str]:
         """
         Generate content using Gemini API (regular mode without Function Calling).
+        Blocks while waiting for the rate limiter: call it from a worker thread.
         
         Args:
             prompt: Input prompt for generation
@@ -91,21 +136,56 @@ class GeminiClient(BaseService):
         Returns:
             Generated content or None if failed
         """
+        started_at = time.perf_counter()
         try:
             logger.info("Sending request to Gemini API")
             logger.debug(f"Prompt length: {len(prompt)} characters")
             
-            response = self.model.generate_content(prompt)
+            with gemini_limiter.limit_sync():
+                response = self.model.generate_content(prompt)
             
             if response.text:
                 logger.info("Successfully received response from Gemini")
+                _observe_latency("generate", "success", started_at)
                 return response.text
             else:
                 logger.error("Empty response received from Gemini")
+                _observe_latency("generate", "empty", started_at)
                 return None
                 
         except Exception as e:
             logger.error(f"Gemini API error: {str(e)}")
+            _observe_latency("generate", "error", started_at)
+            return None
+    
+    def repair_design_response(self, response_text: str) -> Optional[str]:
+        """
+        Convert a design answer that broke the JSON contract with one schema-constrained call.
+        
+        Returns:
+            Schema-conforming JSON text, or None if structured output is disabled or the call failed
+        """
+        if not self.structured_output:
+            return None
+        
+        started_at = time.perf_counter()
+        try:
+            logger.info("Repairing Gemini design response with structured output")
+            prompt = GeminiPrompts.get_design_json_repair_prompt(response_text)
+            with gemini_limiter.limit_sync():  # Runs in a worker thread (see GeminiService._process_response)
+                response = self.model.generate_content(prompt)
+            _observe_latency("repair", "success" if response.text else "empty", started_at)
+            
+            self.save_gemini_api_call_to_file(
+                prompt_text=prompt,
+                api_type="design_json_repair",
+                response_preview=response.text
+            )
+            return response.text or None
+            
+        except Exception as e:
+            logger.error(f"Gemini repair call error: {str(e)}")
+            _observe_latency("repair", "error", started_at)
             return None
     
     async def generate_content_with_function_calling(self, prompt: str, db_session, product_service, price: float = None) -> Optional[str]:
@@ -113,15 +193,20 @@ class GeminiClient(BaseService):
         Generate content using Gemini API with Function Calling support.
         Handles product search through find_product function calls.
         
+        The session runs under the design resilience policy (circuit breaker,
+        hedging after the observed p95, budgeted retry). Attempts may overlap,
+        so each one searches products in its own database session.
+        
         Args:
             prompt: Input prompt for generation
-            db_session: Database session for product search
+            db_session: Database session of the request (not shared with the attempts)
             product_service: ProductService instance
             price: Price limit for product filtering (optional)
             
         Returns:
             Generated content or None if failed
         """
+        started_at = time.perf_counter()
         try:
             logger.info("Starting Function Calling session with Gemini")
             logger.debug(f"Prompt length: {len(prompt)} characters")
@@ -132,72 +217,197 @@ class GeminiClient(BaseService):
                 api_type="function_calling_with_tools"
             )
             
-            # Initialize function call handler with price constraint
-            function_handler = FunctionCallHandler(product_service, price)
+            async def attempt(number: int) -> Optional[str]:
+                async with async_session_maker() as attempt_session:
+                    return await self._run_function_calling_session(prompt, attempt_session, product_service, price)
             
-            # Start chat session with tools
-            chat = self.model_with_tools.start_chat()
-            response = chat.send_message(prompt)
+            response_text = await design_resilience.call(attempt)
             
-            # Function calling loop
-            max_iterations = 10  # Prevent infinite loops
-            iteration = 0
-            
-            while iteration < max_iterations:
-                iteration += 1
-                
-                # Check if response contains function calls
-                has_function_calls = False
-                
-                if (hasattr(response, 'candidates') and 
-                    response.candidates and 
-                    hasattr(response.candidates[0], 'content') and
-                    hasattr(response.candidates[0].content, 'parts')):
-                    
-                    for part in response.candidates[0].content.parts:
-                        if hasattr(part, 'function_call'):
-                            has_function_calls = True
-                            break
-                
-                if not has_function_calls:
-                    # No more function calls, we have the final response
-                    break
-                
-                # Process function calls
-                function_responses = await function_handler.process_function_calls(db_session, response)
-                
-                if function_responses:
-                    logger.info(f"Sending {len(function_responses)} function responses back to Gemini")
-                    
-                    # Send function responses back to Gemini
-                    for func_response in function_responses:
-                        response = chat.send_message(
-                            genai.protos.Content(parts=[genai.protos.Part(function_response=func_response)])
-                        )
-                else:
-                    # No function responses to send, break the loop
-                    break
-            
-            # Extract final response text
-            if hasattr(response, 'text') and response.text:
-                logger.info(f"Successfully completed Function Calling session in {iteration} iterations")
+            if response_text:
+                _observe_latency("function_calling", "success", started_at)
                 
                 # Final response'u da kaydet
                 self.save_gemini_api_call_to_file(
                     prompt_text=prompt,
                     api_type="function_calling_response",
-                    response_preview=response.text
+                    response_preview=response_text
                 )
                 
-                return response.text
+                return response_text
             else:
                 logger.error("No text response received from Function Calling session")
+                _observe_latency("function_calling", "empty", started_at)
                 return None
                 
         except Exception as e:
             logger.error(f"Function Calling error: {str(e)}")
+            _observe_latency("function_calling", "error", started_at)
             return None
     
+    async def _run_function_calling_session(self, prompt: str, db_session, product_service, price: float = None) -> Optional[str]:
+        """One Function Calling session; raises on API errors, returns None for an empty answer."""
+        # Initialize function call handler with price constraint
+        function_handler = FunctionCallHandler(product_service, price)
+        
+        # Start chat session with tools (blocking SDK calls run in a worker thread,
+        # so a hedged attempt can start while this one waits)
+        chat = self.model_with_tools.start_chat()
+        response = await gemini_limiter.run(chat.send_message, prompt)
+        
+        # Function calling loop
+        max_iterations = 10  # Prevent infinite loops
+        iteration = 0
+        
+        while iteration < max_iterations:
+            iteration += 1
+            
+            # Check if response contains function calls
+            has_function_calls = False
+            
+            if (hasattr(response, 'candidates') and 
+                response.candidates and 
+                hasattr(response.candidates[0], 'content') and
+                hasattr(response.candidates[0].content, 'parts')):
+                
+                for part in response.candidates[0].content.parts:
+                    if hasattr(part, 'function_call'):
+                        has_function_calls = True
+                        break
+            
+            if not has_function_calls:
+                # No more function calls, we have the final response
+                break
+            
+            # Process function calls
+            function_responses = await function_handler.process_function_calls(db_session, response)
+            
+            if function_responses:
+                logger.info(f"Sending {len(function_responses)} function responses back to Gemini")
+                
+                # Send function responses back to Gemini
+                from google.generativeai import protos
+                for func_response in function_responses:
+                    response = await gemini_limiter.run(
+                        chat.send_message,
+                        protos.Content(parts=[protos.Part(function_response=func_response)])
+                    )
+            else:
+                # No function responses to send, break the loop
+                break
+        
+        FUNCTION_CALL_ITERATIONS.observe(iteration)
+        
+        # Extract final response text
+        if hasattr(response, 'text') and response.text:
+            logger.info(f"Successfully completed Function Calling session in {iteration} iterations")
+            return response.text
+        return None
+    
+    async def stream_content_with_function_calling(self, prompt: str, db_session, product_service, price: float = None) -> AsyncIterator[str]:
+        """
+        Stream the final answer of a Function Calling session.
+        
+        Function call turns are resolved exactly like the blocking variant;
+        text parts are yielded as soon as Gemini streams them, so callers can
+        parse and forward content before the response is complete.
+        
+        Args:
+            prompt: Input prompt for generation
+            db_session: Database session for product search
+            product_service: ProductService instance
+            price: Price limit for product filtering (optional)
+            
+        Yields:
+            Text chunks of the model response
+        """
+        logger.info("Starting streaming Function Calling session with Gemini")
+        self.save_gemini_api_call_to_file(
+            prompt_text=prompt,
+            api_type="function_calling_stream"
+        )
+        
+        started_at = time.perf_counter()
+        # Breaker only: a stream that already yielded text cannot be hedged or retried
+        async with design_resilience.guarded():
+            try:
+                function_handler = FunctionCallHandler(product_service, price)
+                chat = self.model_with_tools.start_chat()
+                message = prompt
+                collected_text = []
+        
+                max_iterations = 10  # Prevent infinite loops
+                for iteration in range(1, max_iterations + 1):
+                    has_function_calls = False
+                    # The slot is held until the turn's stream is consumed
+                    async with gemini_limiter.limit():
+                        response = await asyncio.to_thread(chat.send_message, message, stream=True)
+                
+                        async for chunk in self._iterate_in_thread(response):
+                            for part in self._get_parts(chunk):
+                                function_call = getattr(part, "function_call", None)
+                                if function_call and function_call.name:
+                                    has_function_calls = True
+                                elif getattr(part, "text", ""):
+                                    collected_text.append(part.text)
+                                    yield part.text
+            
+                    if not has_function_calls:
+                        break
+            
+                    function_responses = await function_handler.process_function_calls(db_session, response)
+                    if not function_responses:
+                        break
+            
+                    logger.info(f"Sending {len(function_responses)} function responses back to Gemini")
+                    from google.generativeai import protos
+                    message = protos.Content(parts=[
+                        protos.Part(function_response=func_response)
+                        for func_response in function_responses
+                    ])
+            except Exception:
+                _observe_latency("stream", "error", started_at)
+                raise
+        
+        FUNCTION_CALL_ITERATIONS.observe(iteration)
+        _observe_latency("stream", "success", started_at)
+        logger.info(f"Streaming Function Calling session finished in {iteration} iterations")
+        self.save_gemini_api_call_to_file(
+            prompt_text=prompt,
+            api_type="function_calling_stream_response",
+            response_preview="".join(collected_text)
+        )
+    
+    @staticmethod
+    def _get_parts(response) -> list:
+        """Get content parts of the first candidate, if any."""
+        try:
+            return list(response.candidates[0].content.parts)
+        except (AttributeError, IndexError):
+            return []
+    
+    @staticmethod
+    async def _iterate_in_thread(stream: Iterable) -> AsyncIterator[Any]:
+        """Iterate a blocking stream in a worker thread without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        def worker():
+            try:
+                for item in stream:
+                    loop.call_soon_threadsafe(queue.put_nowait, item)
+                loop.call_soon_threadsafe(queue.put_nowait, _StreamEnd())
+            except BaseException as e:
+                loop.call_soon_threadsafe(queue.put_nowait, _StreamEnd(e))
+        
+        loop.run_in_executor(None, worker)
+        while True:
+            item = await queue.get()
+            if isinstance(item, _StreamEnd):
+                if item.error is not None:
+                    raise item.error
+                return
+            yield item
+    
     def get_model_info(self) -> Dict[str, Any]:
         """Get current model configuration info."""
         return {
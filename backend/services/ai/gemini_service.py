@@ -2,17 +2,20 @@
 GeminiService - Main service for design generation using Gemini AI.
 KISS principle: Orchestrates other simple services, keeps main logic simple.
 """
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, List
 from sqlalchemy.ext.asyncio import AsyncSession
 from config import logger
 from config.prompts import GeminiPrompts, PromptUtils
 from ..base_service import BaseService
 from .notes_parser import NotesParser
-from .response_processor import ResponseProcessor
+from .response_processor import ResponseProcessor, response_parse_stats
 from .gemini_client import GeminiClient
+from .stream_parser import DesignStreamParser
 from ..design.hashtag_service import HashtagService
+from utils.timing import span
 import os
 import json
+import asyncio
 from datetime import datetime
 
 
@@ -98,9 +101,7 @@ class GeminiService(BaseService):
                 return self._create_fallback_response(room_type, design_style)
             
             # Step 4: Process response
-            design_result = self.response_processor.process_design_response(
-                response_text, room_type, design_style
-            )
+            design_result = self._process_response(response_text, room_type, design_style)
             
             logger.info("Design suggestion generated successfully")
             return design_result
@@ -126,48 +127,30 @@ class GeminiService(BaseService):
         try:
             logger.info(f"Generating HYBRID design suggestion: {room_type} - {design_style}")
             
-            # Step 1: Parse notes for additional info
-            parsed_info = self.notes_parser.parse_notes(notes) if notes.strip() else {}
-            logger.debug(f"Parsed notes: {parsed_info}")
-            
-            # Step 1.5: Add room dimensions directly from parameters if provided
-            if width and length and height:
-                parsed_info['room_dimensions'] = {
-                    'width': width,
-                    'length': length, 
-                    'height': height
-                }
-                logger.info(f"Added room dimensions to context: {width}x{length}x{height} cm")
-            
-            # Step 1.6: Add color info if provided
-            if color_info:
-                parsed_info['color_info'] = color_info
-                logger.info(f"Added color info to context: {color_info}")
-            
-            # Step 1.7: Add product categories if provided
-            if product_categories:
-                parsed_info['product_categories'] = product_categories
-                logger.info(f"Added product categories to context: {product_categories}")
-            
-            # Step 2: Create hybrid prompt with price constraint and dimensions
-            prompt = self._create_hybrid_design_prompt(room_type, design_style, notes, parsed_info, price)
+            # Steps 1-2: Parse notes, add frontend context and create hybrid prompt
+            prompt = self._prepare_hybrid_prompt(
+                room_type, design_style, notes, price, width, length, height, color_info, product_categories
+            )
             
             # Step 3: Get response from Gemini with Function Calling (pass price constraint)
-            response_text = await self.gemini_client.generate_content_with_function_calling(
-                prompt, db_session, self.product_service, price
-            )
+            with span("gemini"):
+                response_text = await self.gemini_client.generate_content_with_function_calling(
+                    prompt, db_session, self.product_service, price
+                )
             
             if not response_text:
                 logger.error("No response from Gemini Function Calling")
                 return self._create_fallback_response(room_type, design_style)
             
             # Step 4: Process hybrid response
-            design_result = self.response_processor.process_design_response(
-                response_text, room_type, design_style
-            )
+            with span("parse"):
+                design_result = await asyncio.to_thread(
+                    self._process_response, response_text, room_type, design_style
+                )
             
             # Step 5: Enhance with real product information
-            design_result = await self._enhance_with_real_product_info(design_result, db_session)
+            with span("products"):
+                design_result = await self._enhance_with_real_product_info(design_result, db_session)
             
             logger.info("Hybrid design suggestion generated successfully")
             return design_result
@@ -176,6 +159,120 @@ class GeminiService(BaseService):
             logger.error(f"Error generating hybrid design suggestion: {str(e)}")
             return self._create_fallback_response(room_type, design_style)
     
+    async def stream_hybrid_design_suggestion(self, room_type: str, design_style: str, notes: str, price: float, db_session, width: int = None, length: int = None, height: int = None, color_info: str = "", product_categories = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of generate_hybrid_design_suggestion.
+        
+        Yields events as soon as they are parsed from the Gemini stream:
+            {"type": "title" | "description", "data": str}
+            {"type": "hashtags", "data": list}
+            {"type": "product", "data": dict, "index": int}  (already enhanced with real product info)
+            {"type": "result", "data": dict}  (final design result, same shape as the blocking call)
+            {"type": "error", "data": str}  (the stream failed after content was sent; no result follows)
+        
+        A failure before any content was sent yields the fallback result, like
+        the blocking call. After that the client has rendered the real title
+        and products, so replacing them with a fallback would contradict it.
+        """
+        streamed = False
+        try:
+            logger.info(f"Streaming HYBRID design suggestion: {room_type} - {design_style}")
+            
+            prompt = self._prepare_hybrid_prompt(
+                room_type, design_style, notes, price, width, length, height, color_info, product_categories
+            )
+            
+            parser = DesignStreamParser()
+            streamed_products: List[Dict[str, Any]] = []
+            
+            async for text in self.gemini_client.stream_content_with_function_calling(
+                prompt, db_session, self.product_service, price
+            ):
+                for event in parser.feed(text):
+                    if event["type"] == "product":
+                        product = event["data"]
+                        product.setdefault("type", "product")
+                        event["data"] = await self._enhance_product(product, db_session)
+                        streamed_products.append(event["data"])
+                    streamed = True
+                    yield event
+            
+            if not parser.text.strip():
+                logger.error("No response from Gemini Function Calling stream")
+                yield {"type": "result", "data": self._create_fallback_response(room_type, design_style)}
+                return
+            
+            design_result = await asyncio.to_thread(
+                self._process_response, parser.text, room_type, design_style, parser
+            )
+            
+            # Reuse the products enhanced while streaming when they match the final parse
+            if len(streamed_products) == len(design_result.get("products", [])):
+                design_result["products"] = streamed_products
+                design_result["product_stats"] = self._calculate_product_stats(streamed_products)
+            else:
+                design_result = await self._enhance_with_real_product_info(design_result, db_session)
+            
+            logger.info("Streaming hybrid design suggestion generated successfully")
+            yield {"type": "result", "data": design_result}
+            
+        except Exception as e:
+            logger.error(f"Error streaming hybrid design suggestion: {str(e)}")
+            if streamed:
+                yield {"type": "error", "data": str(e)}
+            else:
+                yield {"type": "result", "data": self._create_fallback_response(room_type, design_style)}
+    
+    def _process_response(self, response_text: str, room_type: str, design_style: str, parser: DesignStreamParser = None) -> Dict[str, Any]:
+        """
+        Process a design response; if it does not match the schema, try one repair call
+        before falling back (a fallback makes the user retry the whole generation).
+        """
+        design_result = self.response_processor.process_design_response(
+            response_text, room_type, design_style, parser=parser
+        )
+        if not design_result.get("error"):
+            return design_result
+        
+        repaired_text = self.gemini_client.repair_design_response(response_text)
+        if not repaired_text:
+            response_parse_stats.record("failed")
+            return design_result
+        
+        return self.response_processor.process_design_response(
+            repaired_text, room_type, design_style, is_repair=True
+        )
+    
+    def _prepare_hybrid_prompt(self, room_type: str, design_style: str, notes: str, price: float, width: int = None, length: int = None, height: int = None, color_info: str = "", product_categories = None) -> str:
+        """Parse notes, add frontend context and build the hybrid prompt."""
+        # Step 1: Parse notes for additional info
+        with span("notes"):
+            parsed_info = self.notes_parser.parse_notes(notes) if notes.strip() else {}
+        logger.debug(f"Parsed notes: {parsed_info}")
+        
+        # Step 1.5: Add room dimensions directly from parameters if provided
+        if width and length and height:
+            parsed_info['room_dimensions'] = {
+                'width': width,
+                'length': length, 
+                'height': height
+            }
+            logger.info(f"Added room dimensions to context: {width}x{length}x{height} cm")
+        
+        # Step 1.6: Add color info if provided
+        if color_info:
+            parsed_info['color_info'] = color_info
+            logger.info(f"Added color info to context: {color_info}")
+        
+        # Step 1.7: Add product categories if provided
+        if product_categories:
+            parsed_info['product_categories'] = product_categories
+            logger.info(f"Added product categories to context: {product_categories}")
+        
+        # Step 2: Create hybrid prompt with price constraint and dimensions
+        with span("prompt"):
+            return self._create_hybrid_design_prompt(room_type, design_style, notes, parsed_info, price)
+    
     def _create_design_prompt(self, room_type: str, design_style: str, notes: str, parsed_info: Dict[str, Any]) -> str:
         """Create design prompt using centralized prompt management."""
         # Build additional context from parsed info
@@ -231,70 +328,80 @@ class GeminiService(BaseService):
             enhanced_products = []
             
             for product in design_result.get("products", []):
-                enhanced_product = product.copy()
-                
-                # Try to find matching real product in database
-                real_products = await self.product_service.find_products_by_criteria(
-                    db=db_session,
-                    category=product.get("category", ""),
-                    style=product.get("style"),
-                    color=product.get("color"),
-                    limit=1
-                )
-                
-                if real_products:
-                    # Product found in database - mark as real and use real product name
-                    real_product = real_products[0]
-                    enhanced_product.update({
-                        "is_real": True,
-                        "name": real_product.get("product_name"),  # Use real product name
-                        "category": real_product.get("category"),  # Use real product category
-                        "original_description": real_product.get("description"),  # IKEA orijinal açıklaması
-                        "image_available": bool(real_product.get("image_path")),
-                        "image_path": real_product.get("image_path"),
-                        "product_link": real_product.get("product_link"),
-                        "real_product_id": real_product.get("id"),
-                        "dimensions": {
-                            "width_cm": real_product.get("width_cm"),
-                            "depth_cm": real_product.get("depth_cm"),
-                            "height_cm": real_product.get("height_cm")
-                        }
-                    })
-                    logger.info(f"Enhanced product with real data: {real_product.get('product_name')} (category: {real_product.get('category')})")
-                else:
-                    # Product not found - mark as fake
-                    enhanced_product.update({
-                        "is_real": False,
-                        "image_available": False,
-                        "image_path": None,
-                        "product_link": None,
-                        "real_product_id": None
-                    })
-                    logger.info(f"Product marked as fake: {product.get('name')}")
-                
-                enhanced_products.append(enhanced_product)
+                enhanced_products.append(await self._enhance_product(product, db_session))
             
             # Update design result
             design_result["products"] = enhanced_products
             
             # Add summary statistics
-            real_count = sum(1 for p in enhanced_products if p.get("is_real", False))
-            fake_count = len(enhanced_products) - real_count
-            
-            design_result["product_stats"] = {
-                "total": len(enhanced_products),
-                "real": real_count,
-                "fake": fake_count,
-                "real_percentage": round((real_count / len(enhanced_products)) * 100) if enhanced_products else 0
-            }
+            design_result["product_stats"] = self._calculate_product_stats(enhanced_products)
             
-            logger.info(f"Product enhancement complete: {real_count} real, {fake_count} fake products")
+            stats = design_result["product_stats"]
+            logger.info(f"Product enhancement complete: {stats['real']} real, {stats['fake']} fake products")
             return design_result
             
         except Exception as e:
             logger.error(f"Error enhancing products with real data: {str(e)}")
             return design_result
     
+    async def _enhance_product(self, product: Dict[str, Any], db_session) -> Dict[str, Any]:
+        """Mark a single product as real/fake using the product database."""
+        enhanced_product = product.copy()
+        
+        # Try to find matching real product in database
+        real_products = await self.product_service.find_products_by_criteria(
+            db=db_session,
+            category=product.get("category", ""),
+            style=product.get("style"),
+            color=product.get("color"),
+            limit=1
+        )
+        
+        if real_products:
+            # Product found in database - mark as real and use real product name
+            real_product = real_products[0]
+            enhanced_product.update({
+                "is_real": True,
+                "name": real_product.get("product_name"),  # Use real product name
+                "category": real_product.get("category"),  # Use real product category
+                "original_description": real_product.get("description"),  # IKEA orijinal açıklaması
+                "image_available": bool(real_product.get("image_path")),
+                "image_path": real_product.get("image_path"),
+                "product_link": real_product.get("product_link"),
+                "real_product_id": real_product.get("id"),
+                "dimensions": {
+                    "width_cm": real_product.get("width_cm"),
+                    "depth_cm": real_product.get("depth_cm"),
+                    "height_cm": real_product.get("height_cm")
+                }
+            })
+            logger.info(f"Enhanced product with real data: {real_product.get('product_name')} (category: {real_product.get('category')})")
+        else:
+            # Product not found - mark as fake
+            enhanced_product.update({
+                "is_real": False,
+                "image_available": False,
+                "image_path": None,
+                "product_link": None,
+                "real_product_id": None
+            })
+            logger.info(f"Product marked as fake: {product.get('name')}")
+        
+        return enhanced_product
+    
+    @staticmethod
+    def _calculate_product_stats(products: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Real/fake product counts for a design result."""
+        real_count = sum(1 for p in products if p.get("is_real", False))
+        fake_count = len(products) - real_count
+        
+        return {
+            "total": len(products),
+            "real": real_count,
+            "fake": fake_count,
+            "real_percentage": round((real_count / len(products)) * 100) if products else 0
+        }
+    
     def _create_fallback_response(self, room_type: str, design_style: str) -> Dict[str, Any]:
         """Create fallback response when API fails."""
         fallback_products = self._get_fallback_products(room_type, design_style)
@@ -330,10 +437,14 @@ class GeminiService(BaseService):
         
         return base_products.get(room_type, base_products["Living Room"])
     
-    async def save_design_hashtags(self, db: AsyncSession, design_id: str, hashtags: Dict[str, Any]) -> None:
+    async def save_design_hashtags(self, db: AsyncSession, design_id: str, hashtags: Dict[str, Any]) -> bool:
         """
-        Save design hashtags to database.
+        Save design hashtags to database in the caller's transaction.
         Delegates to hashtag service for database operations.
+        
+        Returns:
+            False if the write failed; the transaction must then be rolled back
+            (hashtag saving is not critical, so this does not raise)
         """
         try:
             logger.info(f"Saving hashtags for design {design_id}: {hashtags}")
@@ -361,7 +472,8 @@ class GeminiService(BaseService):
                 logger.info(f"Hashtags saved for design {design_id}: EN={english_hashtags}, TR={turkish_hashtags}")
             else:
                 logger.warning(f"No valid hashtags to save for design {design_id}")
+            return True
                 
         except Exception as e:
             logger.error(f"Error saving hashtags for design {design_id}: {str(e)}")
-            # Don't raise exception, hashtag saving is not critical
+            return False
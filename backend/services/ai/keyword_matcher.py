@@ -0,0 +1,94 @@
+"""
+KeywordMatcher - Multi-keyword matching in a single pass over the text.
+KISS principle: Compile the keyword list once, scan each note once.
+"""
+import re
+from typing import Dict, List, Sequence, Tuple
+
+
+def turkish_fold(text: str) -> str:
+    """
+    Case-fold text for Turkish/English keyword matching.
+    
+    Dotted/dotless i are folded to plain "i" so "IŞIKLI", "Işıklı" and "ışıklı"
+    match the same keyword, and English words keep working ("WHEELCHAIR").
+    (str.replace is used instead of str.translate, which is much slower on non-ASCII text.)
+    """
+    return text.replace("İ", "i").replace("I", "i").lower().replace("ı", "i")
+
+
+class KeywordMatcher:
+    """
+    Finds which categories of a keyword mapping occur in a text.
+
+    The keywords are compiled into one regex shaped like a trie (common
+    prefixes shared), so the text is scanned once regardless of how many
+    keywords there are. Keywords only match at the start of a word, which
+    drops mid-word hits ("pet" in "carpet") but keeps Turkish suffixes
+    ("kediler" still matches "kedi").
+
+    For every category the reported keyword is the first one in the
+    category's list that occurs in the text, like a per-keyword search
+    in list order would report.
+    """
+
+    def __init__(self, mapping: Dict[str, Sequence[str]]):
+        self.categories = list(mapping)
+        self._keywords: Dict[str, List[str]] = {category: list(keywords) for category, keywords in mapping.items()}
+
+        # Folded keyword -> (category index, keyword index) entries it stands for
+        entries: Dict[str, List[Tuple[int, int]]] = {}
+        for category_index, category in enumerate(self.categories):
+            for keyword_index, keyword in enumerate(self._keywords[category]):
+                entries.setdefault(turkish_fold(keyword), []).append((category_index, keyword_index))
+
+        # The regex reports the longest keyword starting at a position; every
+        # shorter keyword that is its prefix matched at the same position too.
+        self._hits: Dict[str, List[Tuple[int, int]]] = {
+            folded: [entry for other, other_entries in entries.items() if folded.startswith(other) for entry in other_entries]
+            for folded in entries
+        }
+        self._pattern = re.compile(r"(?<!\w)(?:" + (self._trie_pattern(entries) or "(?!)") + ")")
+
+    def find(self, text: str) -> List[Tuple[str, str]]:
+        """
+        Return (category, keyword) for every category found in the text,
+        in mapping order.
+        """
+        folded = turkish_fold(text)
+        best: Dict[int, int] = {}
+        match = self._pattern.search(folded)
+        while match:
+            for category_index, keyword_index in self._hits[match.group()]:
+                if keyword_index < best.get(category_index, len(self._keywords[self.categories[category_index]])):
+                    best[category_index] = keyword_index
+            # Resume right after the match start so keywords starting inside it are found too
+            match = self._pattern.search(folded, match.start() + 1)
+
+        return [
+            (self.categories[category_index], self._keywords[self.categories[category_index]][best[category_index]])
+            for category_index in sorted(best)
+        ]
+
+    @staticmethod
+    def _trie_pattern(keywords) -> str:
+        """Build a regex alternation that shares common prefixes."""
+        trie: Dict[str, dict] = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = {}
+
+        def build(node: Dict[str, dict]) -> str:
+            terminal = "" in node
+            branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ""
+            body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+            if terminal:
+                # Greedy optional: prefer the longest keyword, fall back to this one
+                return "(?:" + body + ")?"
+            return body
+
+        return build(trie)
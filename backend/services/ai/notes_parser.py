@@ -24,6 +24,36 @@ from typing import Dict, Any
 import json
 import re
 from config import logger
+from .keyword_matcher import KeywordMatcher
+
+# Comprehensive keyword mapping for better recognition
+# (first matching keyword of a category is reported)
+KEYWORD_MAPPING = {
+    # Accessibility & Special Needs
+    'pet': ['pet-friendly', 'evcil hayvan', 'kedi', 'köpek', 'pet friendly'],
+    'child': ['çocuk dostu', 'child friendly', 'kid friendly', 'bebek', 'çocuk güvenliği'],
+    'elderly': ['yaşlı dostu', 'elderly friendly', 'yaşlı', 'engel'],
+    'accessibility': ['engelli erişimi', 'wheelchair', 'tekerlekli sandalye', 'accessibility'],
+    
+    # Style Preferences  
+    'minimalist': ['minimal', 'minimalist', 'sade', 'basit'],
+    'luxury': ['lüks', 'luxury', 'premium', 'pahalı'],
+    'budget': ['budget', 'bütçe', 'ekonomik', 'ucuz'],
+    'vintage': ['vintage', 'retro', 'antika', 'eski'],
+    'natural': ['doğal', 'natural', 'organic', 'ahşap'],
+    'smart': ['smart home', 'akıllı ev', 'teknolojik', 'otomatik'],
+    
+    # Lighting & Atmosphere
+    'bright': ['aydınlık', 'parlak', 'bright', 'ışıklı'],
+    'cozy': ['sıcak', 'cozy', 'samimi', 'rahatlık'],
+    'spacious': ['ferah', 'geniş', 'spacious', 'açık'],
+    
+    # Environmental
+    'quiet': ['sessiz', 'quiet', 'sakin', 'huzurlu'],
+    'functional': ['fonksiyonel', 'practical', 'kullanışlı']
+}
+
+_keyword_matcher = KeywordMatcher(KEYWORD_MAPPING)
 
 
 class NotesParser:
@@ -97,48 +127,17 @@ class NotesParser:
         Parse special keywords and preferences from free-form text.
         Focuses on style preferences, accessibility needs, and special requirements.
         """
-        notes_lower = notes.lower()
-        
-        # Comprehensive keyword mapping for better recognition
-        keyword_mapping = {
-            # Accessibility & Special Needs
-            'pet': ['pet-friendly', 'evcil hayvan', 'kedi', 'köpek', 'pet friendly'],
-            'child': ['çocuk dostu', 'child friendly', 'kid friendly', 'bebek', 'çocuk güvenliği'],
-            'elderly': ['yaşlı dostu', 'elderly friendly', 'yaşlı', 'engel'],
-            'accessibility': ['engelli erişimi', 'wheelchair', 'tekerlekli sandalye', 'accessibility'],
-            
-            # Style Preferences  
-            'minimalist': ['minimal', 'minimalist', 'sade', 'basit'],
-            'luxury': ['lüks', 'luxury', 'premium', 'pahalı'],
-            'budget': ['budget', 'bütçe', 'ekonomik', 'ucuz'],
-            'vintage': ['vintage', 'retro', 'antika', 'eski'],
-            'natural': ['doğal', 'natural', 'organic', 'ahşap'],
-            'smart': ['smart home', 'akıllı ev', 'teknolojik', 'otomatik'],
-            
-            # Lighting & Atmosphere
-            'bright': ['aydınlık', 'parlak', 'bright', 'ışıklı'],
-            'cozy': ['sıcak', 'cozy', 'samimi', 'rahatlık'],
-            'spacious': ['ferah', 'geniş', 'spacious', 'açık'],
-            
-            # Environmental
-            'quiet': ['sessiz', 'quiet', 'sakin', 'huzurlu'],
-            'functional': ['fonksiyonel', 'practical', 'kullanışlı']
-        }
-        
         found_keywords = []
         found_requests = []
         
-        # Search for keywords in the text
-        for category, keywords in keyword_mapping.items():
-            for keyword in keywords:
-                if keyword in notes_lower:
-                    found_keywords.append(category)
-                    found_requests.append({
-                        'category': category,
-                        'keyword': keyword,
-                        'context': notes[:200]  # First 200 chars for context
-                    })
-                    break  # Only count each category once
+        # Single pass over the notes (keyword mapping is compiled once, see KEYWORD_MAPPING)
+        for category, keyword in _keyword_matcher.find(notes):
+            found_keywords.append(category)
+            found_requests.append({
+                'category': category,
+                'keyword': keyword,
+                'context': notes[:200]  # First 200 chars for context
+            })
         
         # Remove duplicates while preserving order
         parsed_info['keywords'] = list(dict.fromkeys(found_keywords))
@@ -2,10 +2,11 @@
 ProductService - Database-based product search for Gemini Function Calling.
 KISS principle: Simple product search with PostgreSQL integration.
 """
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_
-from config import logger
+from config import logger, settings
 from ..base_service import BaseService
 from models.design_models_db import Product
 
@@ -90,10 +91,21 @@ class ProductService(BaseService):
         "Mobilyalar": ["Koltuk"]
     }
     
+    # Search results shared by all instances; the catalog only changes through load_dataset.py,
+    # which notifies the app (see catalog_listener) to clear this cache
+    _search_cache: "OrderedDict[tuple, List[Dict[str, Any]]]" = OrderedDict()
+    
     def __init__(self):
         super().__init__()
         self.log_operation("ProductService initialized for Function Calling")
     
+    @classmethod
+    def invalidate_cache(cls) -> int:
+        """Drop cached product searches. Returns the number of dropped entries."""
+        dropped = len(cls._search_cache)
+        cls._search_cache.clear()
+        return dropped
+    
     def _map_category_to_db_categories(self, category: str) -> List[str]:
         """
         Gemini'den gelen kategori adını PostgreSQL'deki kategori adlarına çevirir.
@@ -140,6 +152,13 @@ class ProductService(BaseService):
         Returns:
             List of product dictionaries matching criteria
         """
+        cache_key = (category, style, color, limit, max_price)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            self._search_cache.move_to_end(cache_key)
+            logger.debug(f"Product search cache hit: category={category}, style={style}, color={color}")
+            return [dict(product) for product in cached]
+        
         try:
             logger.info(f"Searching products: category={category}, style={style}, color={color}")
             
@@ -220,6 +239,10 @@ class ProductService(BaseService):
                 product_list.append(product_dict)
             
             logger.info(f"Found {len(product_list)} products for category={category} (DB categories: {db_categories})")
+            
+            self._search_cache[cache_key] = [dict(product) for product in product_list]
+            if len(self._search_cache) > settings.PRODUCT_SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
             return product_list
             
         except Exception as e:
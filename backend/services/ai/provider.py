@@ -0,0 +1,66 @@
+"""
+AIServiceProvider - Process-wide AI services shared by all routers.
+KISS principle: Each service is created once, on first use; routers get it through a FastAPI dependency.
+
+    @router.get("/favorites/my")
+    async def get_my_favorites(translator: HashtagTranslationService = Depends(get_hashtag_translation_service)):
+
+The Gemini models (and their gRPC channels) live inside GeminiService's
+client, so sharing the service shares them. Constructing a service per
+request would configure the SDK and build new models every time.
+"""
+import threading
+from .gemini_service import GeminiService
+from ..design.hashtag_translation_service import HashtagTranslationService, hashtag_translation_service
+from ..design.mood_board_service import MoodBoardService, mood_board_service
+
+
+class AIServiceProvider:
+    """Owns the shared AI service instances of this process."""
+
+    def __init__(self):
+        self._gemini_service = None
+        self._lock = threading.Lock()  # The startup warm-up runs in a worker thread
+
+    @property
+    def gemini_service(self) -> GeminiService:
+        if self._gemini_service is None:
+            with self._lock:
+                if self._gemini_service is None:
+                    self._gemini_service = GeminiService()
+        return self._gemini_service
+
+    @property
+    def mood_board_service(self) -> MoodBoardService:
+        return mood_board_service
+
+    @property
+    def hashtag_translation_service(self) -> HashtagTranslationService:
+        return hashtag_translation_service
+
+    def warmup_steps(self) -> list:
+        """Model builds for the startup warm-up (see AIWarmup)."""
+        return [
+            lambda: self.gemini_service.gemini_client.model,
+            lambda: self.gemini_service.gemini_client.model_with_tools,
+            lambda: self.mood_board_service.gemini_model,
+        ]
+
+
+# Global AI service provider
+ai_services = AIServiceProvider()
+
+
+def get_gemini_service() -> GeminiService:
+    """FastAPI dependency: the shared GeminiService."""
+    return ai_services.gemini_service
+
+
+def get_mood_board_service() -> MoodBoardService:
+    """FastAPI dependency: the shared MoodBoardService."""
+    return ai_services.mood_board_service
+
+
+def get_hashtag_translation_service() -> HashtagTranslationService:
+    """FastAPI dependency: the shared HashtagTranslationService."""
+    return ai_services.hashtag_translation_service
@@ -0,0 +1,47 @@
+"""
+Model call limiters - one per provider quota, shared by every service in this worker.
+KISS principle: GeminiClient and MoodBoardService wrap each model request in gemini_limiter / imagen_limiter.
+
+Quotas are per project, so with several workers set the per-minute limits
+to the quota divided by the number of workers.
+"""
+from config import settings
+from utils.metrics import metrics
+from utils.rate_limit import ModelCallLimiter
+
+# Gemini text models: design sessions (each function calling turn), repairs and Imagen prompt enhancement
+gemini_limiter = ModelCallLimiter(
+    "gemini",
+    requests_per_minute=settings.GEMINI_REQUESTS_PER_MINUTE,
+    max_concurrency=settings.GEMINI_MAX_CONCURRENCY,
+    queue_timeout=settings.MODEL_CALL_QUEUE_TIMEOUT
+)
+
+# Vertex Imagen image generation
+imagen_limiter = ModelCallLimiter(
+    "imagen",
+    requests_per_minute=settings.IMAGEN_REQUESTS_PER_MINUTE,
+    max_concurrency=settings.IMAGEN_MAX_CONCURRENCY,
+    queue_timeout=settings.MODEL_CALL_QUEUE_TIMEOUT
+)
+
+MODEL_LIMITERS = (gemini_limiter, imagen_limiter)
+
+
+def get_limiter_stats() -> dict:
+    return {limiter.name: limiter.get_stats() for limiter in MODEL_LIMITERS}
+
+
+for _limiter in MODEL_LIMITERS:
+    metrics.gauge_callback(
+        f"{_limiter.name}_limiter_concurrency_limit", f"Current AIMD concurrency limit for {_limiter.name} calls",
+        lambda limiter=_limiter: limiter.get_stats()["concurrency_limit"]
+    )
+    metrics.gauge_callback(
+        f"{_limiter.name}_limiter_in_flight", f"{_limiter.name} calls holding a limiter slot",
+        lambda limiter=_limiter: limiter.get_stats()["in_flight"]
+    )
+    metrics.gauge_callback(
+        f"{_limiter.name}_limiter_waiting", f"{_limiter.name} calls queued for a limiter slot",
+        lambda limiter=_limiter: limiter.get_stats()["waiting"]
+    )
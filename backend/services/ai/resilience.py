@@ -0,0 +1,361 @@
+"""
+Resilience policies for model calls - circuit breakers, latency-aware hedging and budgeted retries.
+KISS principle: One policy per call type (design, prompt enhancement, image); callers pass a function that makes one attempt.
+
+    result = await design_resilience.call(lambda attempt: run_session(attempt))
+
+- Circuit breaker: after `failure_threshold` consecutive failures the call
+  type fails fast (CircuitOpenError) for `reset_timeout` seconds, then one
+  probe call decides whether it closes again. Callers already fall back on
+  errors, so a degraded API no longer makes every request wait the timeout.
+- Hedging: if an attempt has not finished after the observed p95 latency, a
+  second attempt starts and whichever finishes first wins (the other is
+  cancelled). Attempts must be safe to run twice.
+- Retry budget: hedges and retries spend tokens that successful traffic
+  earns (`budget_ratio` per call), so extra attempts stay a small fraction of
+  the load even when everything is failing.
+
+Quota rejections and limiter timeouts are not retried and do not trip the
+breaker: the rate limiter (utils/rate_limit.py) handles those. Time spent
+queued for a limiter slot does not count against `attempt_timeout`, so our
+own queueing never looks like a slow API.
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from config import logger, settings
+from utils.metrics import metrics
+from utils.rate_limit import RateLimitTimeout, is_quota_error, watch_queueing
+
+ATTEMPTS = metrics.counter("model_call_attempts_total", "Model call attempts by call type and kind", ["call_type", "kind"])
+HEDGE_WINS = metrics.counter("model_call_hedge_wins_total", "Calls answered by the hedged attempt", ["call_type"])
+SHORT_CIRCUITED = metrics.counter("model_call_short_circuited_total", "Calls rejected by an open circuit breaker", ["call_type"])
+
+
+class CircuitOpenError(Exception):
+    """The call type's circuit breaker is open; the call was not attempted."""
+
+
+@dataclass(frozen=True)
+class ResilienceConfig:
+    """Per call type settings."""
+    attempt_timeout: float  # Seconds before one attempt is abandoned
+    hedge: bool = False  # Start a second attempt after the observed p95
+    hedge_default_delay: float = 10.0  # Hedge delay until enough latencies are observed
+    hedge_min_delay: float = 1.0
+    max_retries: int = 1  # Sequential retries after a failed attempt
+    retry_timeouts: bool = True  # Retry after an attempt timed out (the abandoned call may still be running)
+    retry_backoff: float = 0.5  # Seconds before the first retry, doubled per retry
+    budget_ratio: float = 0.1  # Extra attempts allowed per call (long-run average)
+    budget_min: float = 5.0  # Extra attempts always available (low traffic)
+    failure_threshold: int = 5  # Consecutive failures that open the breaker
+    reset_timeout: float = 30.0  # Seconds the breaker stays open before a probe
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open -> half open (one probe) -> closed."""
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead (in half open state only one probe at a time)."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._probe_in_flight = False
+            self.state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self._opened += 1
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def release(self):
+        """Call finished without a verdict (e.g. quota error): free the probe slot."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self.state, "consecutive_failures": self._failures, "times_opened": self._opened}
+
+
+class LatencyTracker:
+    """Recent successful attempt latencies; p95 for the hedge delay."""
+
+    def __init__(self, size: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: deque = deque(maxlen=size)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class RetryBudget:
+    """Token budget for hedges and retries: each call earns `ratio`, each extra attempt costs one."""
+
+    def __init__(self, ratio: float, minimum: float):
+        self.ratio = ratio
+        self.minimum = minimum
+        self._balance = minimum
+        self._cap = max(minimum, 100 * ratio)
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._balance = min(self._cap, self._balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._balance < 1.0:
+                return False
+            self._balance -= 1.0
+            return True
+
+    @property
+    def balance(self) -> float:
+        return self._balance
+
+
+def _is_api_failure(error: BaseException) -> bool:
+    """Errors that say something about the API (counted by the breaker)."""
+    return not isinstance(error, (RateLimitTimeout, CircuitOpenError)) and not is_quota_error(error)
+
+
+class ResiliencePolicy:
+    """Breaker, hedging and retries for one call type."""
+
+    def __init__(self, call_type: str, config: ResilienceConfig):
+        self.call_type = call_type
+        self.config = config
+        self.breaker = CircuitBreaker(config.failure_threshold, config.reset_timeout)
+        self.latencies = LatencyTracker()
+        self.budget = RetryBudget(config.budget_ratio, config.budget_min)
+        self._hedges = 0
+        self._hedge_wins = 0
+        self._retries = 0
+        self._rejected = 0
+
+    def hedge_delay(self) -> float:
+        p95 = self.latencies.percentile(0.95)
+        if p95 is None:
+            return self.config.hedge_default_delay
+        return max(self.config.hedge_min_delay, p95)
+
+    async def call(self, attempt: Callable[[int], Awaitable[Any]]) -> Any:
+        """
+        Run ``attempt(n)`` under the policy (n = 0 for the first attempt).
+
+        Raises CircuitOpenError without calling when the breaker is open,
+        otherwise the last attempt's exception if every attempt failed.
+        """
+        if not self.breaker.allow():
+            self._rejected += 1
+            SHORT_CIRCUITED.labels(self.call_type).inc()
+            raise CircuitOpenError(f"{self.call_type} circuit breaker is open")
+
+        self.budget.deposit()
+        attempt_number = 0
+        retries = 0
+        try:
+            while True:
+                try:
+                    result = await self._hedged(attempt, attempt_number)
+                except Exception as e:
+                    if (not self._is_retryable(e) or retries >= self.config.max_retries
+                            or not self.budget.withdraw()):
+                        raise
+                    retries += 1
+                    self._retries += 1
+                    attempt_number += 2 if self.config.hedge else 1
+                    logger.warning(f"{self.call_type} call failed, retrying ({retries}/{self.config.max_retries}): {str(e)}")
+                    await asyncio.sleep(self.config.retry_backoff * 2 ** (retries - 1))
+                    continue
+                self.breaker.record_success()
+                return result
+        except Exception as e:
+            if _is_api_failure(e):
+                self.breaker.record_failure()
+            else:
+                self.breaker.release()
+            raise
+        except BaseException:
+            self.breaker.release()  # Cancelled: no verdict about the API
+            raise
+
+    @asynccontextmanager
+    async def guarded(self):
+        """Circuit breaker only, for calls that cannot be hedged or retried (streams)."""
+        if not self.breaker.allow():
+            self._rejected += 1
+            SHORT_CIRCUITED.labels(self.call_type).inc()
+            raise CircuitOpenError(f"{self.call_type} circuit breaker is open")
+        try:
+            yield
+        except Exception as e:
+            if _is_api_failure(e):
+                self.breaker.record_failure()
+            else:
+                self.breaker.release()
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+        else:
+            self.breaker.record_success()
+
+    def _is_retryable(self, error: BaseException) -> bool:
+        if isinstance(error, asyncio.TimeoutError) and not self.config.retry_timeouts:
+            return False
+        return _is_api_failure(error)
+
+    async def _hedged(self, attempt: Callable[[int], Awaitable[Any]], number: int):
+        """One attempt, plus a hedge (attempt number + 1) if it is still running after the p95 delay."""
+        primary = asyncio.create_task(self._timed(attempt, number, "primary" if number == 0 else "retry"))
+        tasks = {primary}
+        try:
+            if not self.config.hedge:
+                return await primary
+
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay())
+            if done or not self.budget.withdraw():
+                return await primary
+
+            self._hedges += 1
+            hedge = asyncio.create_task(self._timed(attempt, number + 1, "hedge"))
+            tasks.add(hedge)
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._hedge_wins += 1
+                            HEDGE_WINS.labels(self.call_type).inc()
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # Losers and abandoned attempts (also when the caller is cancelled)
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _timed(self, attempt: Callable[[int], Awaitable[Any]], number: int, kind: str) -> Any:
+        """One attempt with `attempt_timeout`, not counting the time it waits for limiter slots."""
+        ATTEMPTS.labels(self.call_type, kind).inc()
+        watch = watch_queueing()  # Inherited by the attempt's task
+        started_at = time.perf_counter()
+        task = asyncio.ensure_future(attempt(number))
+        try:
+            while True:
+                remaining = self.config.attempt_timeout - (time.perf_counter() - started_at - watch.seconds)
+                if remaining <= 0:
+                    raise asyncio.TimeoutError(f"{self.call_type} attempt timed out after {self.config.attempt_timeout:.0f}s")
+                done, _ = await asyncio.wait({task}, timeout=remaining)
+                if done:
+                    break
+        finally:
+            if not task.done():
+                task.cancel()
+                task.add_done_callback(lambda t: t.cancelled() or t.exception())  # Nobody awaits it any more
+        result = task.result()
+        self.latencies.record(time.perf_counter() - started_at - watch.seconds)
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        p95 = self.latencies.percentile(0.95)
+        return {
+            "call_type": self.call_type,
+            "breaker": self.breaker.get_stats(),
+            "hedging": self.config.hedge,
+            "hedge_delay_seconds": round(self.hedge_delay(), 3),
+            "observed_p95_seconds": round(p95, 3) if p95 is not None else None,
+            "hedges": self._hedges,
+            "hedge_wins": self._hedge_wins,
+            "retries": self._retries,
+            "short_circuited": self._rejected,
+            "retry_budget": round(self.budget.balance, 2)
+        }
+
+
+# Design generation (function calling session): hedged, attempts use separate DB sessions
+design_resilience = ResiliencePolicy("design", ResilienceConfig(
+    attempt_timeout=settings.DESIGN_CALL_TIMEOUT,
+    hedge=settings.DESIGN_CALL_HEDGING,
+    hedge_default_delay=15.0,
+    hedge_min_delay=3.0,
+    max_retries=1
+))
+
+# Imagen prompt enhancement (single Gemini call): cheap, hedged
+prompt_resilience = ResiliencePolicy("prompt_enhancement", ResilienceConfig(
+    attempt_timeout=settings.PROMPT_CALL_TIMEOUT,
+    hedge=settings.PROMPT_CALL_HEDGING,
+    hedge_default_delay=5.0,
+    hedge_min_delay=1.0,
+    max_retries=1
+))
+
+# Imagen generation: expensive and quota-bound, so retried but not hedged by default
+image_resilience = ResiliencePolicy("image", ResilienceConfig(
+    attempt_timeout=settings.IMAGE_CALL_TIMEOUT,
+    hedge=settings.IMAGE_CALL_HEDGING,
+    hedge_default_delay=30.0,
+    hedge_min_delay=10.0,
+    max_retries=1,
+    retry_timeouts=False,  # A timed-out generation may still finish and be billed
+    retry_backoff=2.0
+))
+
+RESILIENCE_POLICIES = (design_resilience, prompt_resilience, image_resilience)
+
+
+def get_resilience_stats() -> Dict[str, Any]:
+    return {policy.call_type: policy.get_stats() for policy in RESILIENCE_POLICIES}
+
+
+for _policy in RESILIENCE_POLICIES:
+    metrics.gauge_callback(
+        f"{_policy.call_type}_circuit_open", f"1 while the {_policy.call_type} circuit breaker is not closed",
+        lambda policy=_policy: 0 if policy.breaker.state == CircuitBreaker.CLOSED else 1
+    )
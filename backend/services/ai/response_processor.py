@@ -3,28 +3,70 @@ ResponseProcessor - Processes and parses Gemini AI responses.
 KISS principle: Single responsibility for response processing.
 """
 from typing import Dict, Any, List, Optional
-import json
-import re
+import threading
 from config import logger
 from ..design.hashtag_service import HashtagService
+from .stream_parser import DesignStreamParser
+from .design_schema import decode_design_output, validate_design_document
+
+
+class ResponseParseStats:
+    """
+    Outcome counters for design response parsing.
+    
+    Every response ends up in exactly one of:
+    - valid: conformed to the schema as returned
+    - recovered: needed fence stripping or truncation recovery
+    - repaired: invalid, fixed by a schema-constrained repair call
+    - failed: invalid, answered with the fallback response
+    """
+    
+    OUTCOMES = ("valid", "recovered", "repaired", "failed")
+    
+    def __init__(self):
+        self._counts = dict.fromkeys(self.OUTCOMES, 0)
+        self._truncated = 0
+        self._lock = threading.Lock()
+    
+    def record(self, outcome: str, truncated: bool = False):
+        with self._lock:
+            self._counts[outcome] += 1
+            if truncated:
+                self._truncated += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+            truncated = self._truncated
+        total = sum(counts.values())
+        
+        def rate(count: int) -> float:
+            return round(count / total, 4) if total else 0.0
+        
+        return {
+            "responses": total,
+            **counts,
+            "truncated": truncated,
+            "schema_conformance_rate": rate(counts["valid"]),
+            "invalid_rate": rate(counts["repaired"] + counts["failed"]),
+            "parse_failure_rate": rate(counts["failed"])
+        }
+
+
+# Global parse statistics (shared by all ResponseProcessor instances)
+response_parse_stats = ResponseParseStats()
 
 
 class ResponseProcessor:
     """
     Simple processor for Gemini AI responses.
-    Handles JSON parsing and fallback text parsing.
+    Validates the JSON contract with a typed decoder; there is no free-text fallback.
     """
     
-    # Constants to avoid duplication
-    CATEGORY_LIGHTING = "Aydınlatma"
-    CATEGORY_DECORATIVE = "Dekoratif Ürünler"
-    CATEGORY_FURNITURE = "Mobilyalar"
-    CATEGORY_ACCESSORIES = "Aksesuarlar"
-    
     def __init__(self):
         self.hashtag_service = HashtagService()
     
-    def process_design_response(self, response_text: str, room_type: str = "", design_style: str = "") -> Dict[str, Any]:
+    def process_design_response(self, response_text: str, room_type: str = "", design_style: str = "", parser: Optional[DesignStreamParser] = None, is_repair: bool = False) -> Dict[str, Any]:
         """
         Process Gemini response into structured format.
         
@@ -32,71 +74,86 @@ class ResponseProcessor:
             response_text: Raw response from Gemini
             room_type: Room type for fallback
             design_style: Design style for fallback
+            parser: Parser that already consumed response_text while streaming (optional)
+            is_repair: response_text comes from a repair call (affects parse statistics only)
             
         Returns:
-            Dict: Structured design response
+            Dict: Structured design response, or an error response with "error": True
         """
         try:
-            # Try JSON parsing first (preferred format)
-            json_result = self._try_json_parsing(response_text)
-            if json_result:
-                return json_result
-            
-            # Fallback to text parsing
-            logger.warning("JSON parsing failed, using text parsing")
-            return self._parse_text_response(response_text, room_type, design_style)
+            json_result = self._try_json_parsing(response_text, parser)
+            
+            if json_result is None:
+                logger.warning("Gemini response does not match the design schema")
+                if is_repair:
+                    response_parse_stats.record("failed")
+                return self._create_error_response(response_text, room_type, design_style)
+            
+            recovered = json_result.pop("_recovered")
+            if is_repair:
+                outcome = "repaired"
+            else:
+                outcome = "recovered" if recovered else "valid"
+            response_parse_stats.record(outcome, truncated=json_result.get("truncated", False))
+            return json_result
             
         except Exception as e:
             logger.error(f"Response processing error: {str(e)}")
             return self._create_error_response(response_text, room_type, design_style)
     
-    def _try_json_parsing(self, response_text: str) -> Optional[Dict[str, Any]]:
-        """Try to parse response as JSON."""
-        try:
-            # Clean markdown formatting
-            cleaned_text = self._clean_json_response(response_text)
-            
-            json_response = json.loads(cleaned_text)
+    def _try_json_parsing(self, response_text: str, parser: Optional[DesignStreamParser] = None) -> Optional[Dict[str, Any]]:
+        """
+        Decode the response into the design contract.
+        
+        Fast path: typed decode of the raw text (structured output mode).
+        Otherwise the incremental parser strips fences and recovers truncated
+        output, and the document is validated against the same models.
+        """
+        truncated = False
+        design = decode_design_output(response_text.strip()) if parser is None else None
+        recovered = design is None
+        
+        if design is None:
+            if parser is None:
+                parser = DesignStreamParser()
+                parser.feed(response_text)
             
-            # Validate required fields
-            if not all(key in json_response for key in ['title', 'description', 'products']):
+            document = parser.finish()
+            if not document:
                 return None
             
-            # Process products
-            products = self._process_products(json_response['products'])
-            
-            # Process hashtags
-            hashtags = self._process_hashtags(json_response.get('hashtags', []))
-            
-            # Create product suggestion text for compatibility
-            product_suggestion = self._create_product_suggestion_text(products)
-            
-            return {
-                "title": json_response['title'],
-                "description": json_response['description'],
-                "hashtags": hashtags,
-                "product_suggestion": product_suggestion,
-                "products": products,
-                "raw_response": response_text
-            }
+            truncated = parser.truncated
+            if not truncated and not all(key in document for key in ['title', 'description', 'products']):
+                # Validate required fields
+                return None
             
-        except json.JSONDecodeError:
-            return None
-    
-    def _clean_json_response(self, response_text: str) -> str:
-        """Clean JSON response from markdown formatting."""
-        cleaned = response_text.strip()
+            design = validate_design_document(document)
+            if design is None:
+                return None
+            if truncated:
+                logger.warning(f"Gemini response was truncated, recovered {len(design.products)} products")
         
-        # Remove markdown code blocks
-        if cleaned.startswith('```json'):
-            cleaned = cleaned[7:]
-        elif cleaned.startswith('```'):
-            cleaned = cleaned[3:]
+        # Process products
+        products = self._process_products([product.model_dump(exclude_none=True) for product in design.products])
         
-        if cleaned.endswith('```'):
-            cleaned = cleaned[:-3]
+        # Process hashtags
+        hashtags = self._process_hashtags(design.hashtags)
         
-        return cleaned.strip()
+        # Create product suggestion text for compatibility
+        product_suggestion = self._create_product_suggestion_text(products)
+        
+        result = {
+            "title": design.title,
+            "description": design.description,
+            "hashtags": hashtags,
+            "product_suggestion": product_suggestion,
+            "products": products,
+            "raw_response": response_text,
+            "_recovered": recovered
+        }
+        if truncated:
+            result["truncated"] = True
+        return result
     
     def _process_products(self, products: List[Dict]) -> List[Dict[str, str]]:
         """Process and validate products."""
@@ -134,127 +191,6 @@ class ResponseProcessor:
             "unknown": []
         }
     
-    def _parse_text_response(self, response_text: str, room_type: str, design_style: str) -> Dict[str, Any]:
-        """Fallback text parsing for non-JSON responses."""
-        parsed_content = self._extract_sections_from_text(response_text)
-        products = self._parse_product_suggestions(parsed_content.get("product_suggestion", ""))
-        
-        return {
-            "title": parsed_content.get("title") or f"Custom {design_style} {room_type} Design",
-            "description": parsed_content.get("description") or response_text,
-            "hashtags": {"en": [], "tr": [], "display": []},
-            "product_suggestion": parsed_content.get("product_suggestion") or "Furniture suggestions suitable for the design",
-            "products": products,
-            "raw_response": response_text
-        }
-    
-    def _extract_sections_from_text(self, response_text: str) -> Dict[str, str]:
-        """Extract sections from unstructured text."""
-        lines = response_text.split('\n')
-        sections = {"title": "", "description": "", "product_suggestion": ""}
-        current_section = ""
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Detect section headers
-            if any(keyword in line.upper() for keyword in ["TASARIM BAŞLIĞI", "BAŞLIK"]):
-                current_section = "title"
-                sections["title"] = line.split(':')[-1].strip() if ':' in line else line
-            elif any(keyword in line.upper() for keyword in ["DETAYLI AÇIKLAMA", "AÇIKLAMA"]):
-                current_section = "description"
-            elif any(keyword in line.upper() for keyword in ["SATINALINMASI GEREKEN", "ÜRÜN"]):
-                current_section = "product_suggestion"
-            elif current_section == "title" and not sections["title"]:
-                sections["title"] = line
-            elif current_section == "description":
-                sections["description"] += line + "\n"
-            elif current_section == "product_suggestion":
-                sections["product_suggestion"] += line + "\n"
-        
-        return sections
-    
-    def _parse_product_suggestions(self, product_text: str) -> List[Dict[str, str]]:
-        """Parse product suggestions from text."""
-        if not product_text or not product_text.strip():
-            return []
-        
-        products = []
-        lines = product_text.split('\n')
-        current_category = "Genel"
-        
-        category_keywords = {
-            'mobilya': self.CATEGORY_FURNITURE,
-            'aydınlatma': self.CATEGORY_LIGHTING,
-            'dekoratif': self.CATEGORY_DECORATIVE,
-            'aksesuar': self.CATEGORY_ACCESSORIES,
-            'halı': self.CATEGORY_DECORATIVE,
-            'perde': self.CATEGORY_DECORATIVE
-        }
-        
-        for line in lines:
-            line = line.strip()
-            if not line or len(line) < 3:
-                continue
-            
-            # Skip headers
-            if line.upper().startswith('SATIN') or line.upper().startswith('**'):
-                continue
-            
-            # Check for category
-            line_lower = line.lower().strip(' -•*:')
-            is_category = False
-            
-            for keyword, category_name in category_keywords.items():
-                if keyword in line_lower and len(line) < 30:
-                    current_category = category_name
-                    is_category = True
-                    break
-            
-            if is_category:
-                continue
-            
-            # Extract product
-            if line.startswith(('•', '-', '*')) or '(' in line:
-                product = self._extract_product_from_line(line, current_category)
-                if product and len(product['name']) > 2:
-                    products.append(product)
-        
-        return products
-    
-    def _extract_product_from_line(self, line: str, category: str) -> Optional[Dict[str, str]]:
-        """Extract product information from a single line."""
-        # Clean the line
-        line = line.strip(' -•*')
-        
-        # Simple extraction logic
-        if '(' in line and ')' in line:
-            # Format: "Product Name (description)"
-            parts = line.split('(', 1)
-            name = parts[0].strip()
-            description = parts[1].rstrip(')').strip()
-        elif ':' in line:
-            # Format: "Product Name: description"
-            parts = line.split(':', 1)
-            name = parts[0].strip()
-            description = parts[1].strip()
-        else:
-            # Just product name
-            name = line.strip()
-            description = f"{category} ürünü"
-        
-        if len(name) > 2:
-            return {
-                'category': category,
-                'name': name,
-                'description': description,
-                'type': 'product'
-            }
-        
-        return None
-    
     def _create_product_suggestion_text(self, products: List[Dict[str, str]]) -> str:
         """Create product suggestion text from products list."""
         if not products:
@@ -0,0 +1,271 @@
+"""
+DesignStreamParser - Incremental parser for streamed design responses.
+KISS principle: One pass over the text, emit fields as soon as they close.
+"""
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+# Run of string characters that need no attention from the scanner
+_STRING_BODY = re.compile(r'[^"\\]*')
+
+# Unfinished \\uXXXX escape at the end of a cut-off string
+_INCOMPLETE_UNICODE_ESCAPE = re.compile(r"\\u[0-9a-fA-F]{0,3}$")
+
+
+class _Frame:
+    """An open JSON object or array."""
+
+    __slots__ = ("kind", "start", "key", "expect_key", "safe_end")
+
+    def __init__(self, kind: str, start: int):
+        self.kind = kind
+        self.start = start
+        self.key: Optional[str] = None
+        self.expect_key = kind == "{"
+        # End of the last complete member; used to cut truncated text
+        self.safe_end = start + 1
+
+
+class DesignStreamParser:
+    """
+    Incremental parser for the design JSON contract
+    ({"title", "description", "products": [...], "hashtags": [...]}).
+
+    Feed text chunks as they arrive from Gemini; each call returns the events
+    that became complete:
+        {"type": "title", "data": "..."}
+        {"type": "description", "data": "..."}
+        {"type": "hashtags", "data": ["#...", ...]}
+        {"type": "product", "data": {...}, "index": 0}
+
+    Markdown fences and any other text around the JSON object are ignored.
+    Every character is scanned at most once (string contents are skipped in
+    bulk), so the cost is linear in the response;
+    top-level values are decoded once when they close and the products array
+    is assembled from its elements instead of being decoded again.
+
+    Call finish() after the last chunk to get the whole document. If the
+    response was cut off, finish() recovers what is usable: completed fields,
+    the truncated text of an open title/description and the completed
+    members of an open product.
+    """
+
+    # Top-level fields emitted as soon as their value is complete
+    FIELD_EVENTS = {"title": "title", "description": "description", "hashtags": "hashtags"}
+    PRODUCTS_KEY = "products"
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._done = False
+
+        self._in_string = False
+        self._escape = False
+        self._string_start: Optional[int] = None
+        self._scalar_start: Optional[int] = None
+
+        self._fields: Dict[str, Any] = {}
+        self._products: List[Dict[str, Any]] = []
+        self.truncated = False
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return self._text
+
+    @property
+    def product_count(self) -> int:
+        return len(self._products)
+
+    @property
+    def is_complete(self) -> bool:
+        """True once the top-level object has been closed."""
+        return self._done
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Consume a chunk and return the events completed by it."""
+        if not chunk or self._done:
+            self._text += chunk or ""
+            return []
+        self._text += chunk
+        events: List[Dict[str, Any]] = []
+        text = self._text
+
+        pos, end = self._pos, len(text)
+        while pos < end and not self._done:
+            if self._in_string and not self._escape:
+                # Jump over plain string content in one step
+                pos = _STRING_BODY.match(text, pos).end()
+                if pos >= end:
+                    break
+            self._scan_char(text[pos], pos, events)
+            pos += 1
+        self._pos = pos
+
+        return events
+
+    def finish(self) -> Optional[Dict[str, Any]]:
+        """
+        Return the parsed document, recovering a truncated one if needed.
+
+        Returns None when no JSON object was found or nothing usable
+        could be recovered.
+        """
+        if self._done:
+            return self._document()
+        if not self._stack:
+            return None
+
+        if not self.truncated:
+            self.truncated = True
+            self._recover_open_value()
+        return self._document() if self._fields else None
+
+    # --- scanning ---
+
+    def _scan_char(self, char: str, pos: int, events: List[Dict[str, Any]]):
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+                self._end_string(pos + 1, events)
+            return
+
+        if not self._stack:
+            # Skip fences and any prose before the object
+            if char == "{":
+                self._stack.append(_Frame("{", pos))
+            return
+
+        if self._scalar_start is not None and (char in ",:]}" or char.isspace()):
+            start, self._scalar_start = self._scalar_start, None
+            self._value_complete(start, pos, events)
+
+        frame = self._stack[-1]
+        if char == '"':
+            self._in_string = True
+            self._string_start = pos
+        elif char in "{[":
+            self._stack.append(_Frame(char, pos))
+        elif char in "}]":
+            self._stack.pop()
+            if not self._stack:
+                self._done = True
+            else:
+                self._value_complete(frame.start, pos + 1, events)
+        elif char == ",":
+            if frame.kind == "{":
+                frame.expect_key = True
+                frame.key = None
+        elif char == ":":
+            pass
+        elif not char.isspace() and self._scalar_start is None:
+            self._scalar_start = pos
+
+    def _end_string(self, end: int, events: List[Dict[str, Any]]):
+        frame = self._stack[-1]
+        start, self._string_start = self._string_start, None
+        if frame.kind == "{" and frame.expect_key:
+            frame.key = self._decode(start, end)
+            frame.expect_key = False
+        else:
+            self._value_complete(start, end, events)
+
+    def _value_complete(self, start: int, end: int, events: List[Dict[str, Any]]):
+        """A value inside the innermost open container is complete."""
+        frame = self._stack[-1]
+        frame.safe_end = end
+        depth = len(self._stack)
+
+        if depth == 1:
+            self._set_field(frame.key, start, end, events)
+        elif depth == 2 and self._stack[0].key == self.PRODUCTS_KEY and frame.kind == "[":
+            product = self._decode(start, end)
+            if isinstance(product, dict):
+                self._add_product(product, events)
+
+    def _set_field(self, key: Optional[str], start: int, end: int, events: List[Dict[str, Any]]):
+        if key is None:
+            return
+        if key == self.PRODUCTS_KEY:
+            # Already assembled element by element
+            self._fields[key] = self._products
+            return
+
+        value = self._decode(start, end)
+        self._fields[key] = value
+        event_type = self.FIELD_EVENTS.get(key)
+        if event_type and isinstance(value, (str, list)):
+            events.append({"type": event_type, "data": value})
+
+    def _add_product(self, product: Dict[str, Any], events: List[Dict[str, Any]]):
+        events.append({"type": "product", "data": product, "index": len(self._products)})
+        self._products.append(product)
+
+    # --- truncation recovery ---
+
+    def _recover_open_value(self):
+        """Salvage the top-level value that was open when the text ended."""
+        root = self._stack[0]
+        key = root.key
+        if key is None or root.expect_key:
+            return
+
+        depth = len(self._stack)
+        if depth == 1:
+            # Only a string is worth keeping; a cut-off number/literal is not
+            if self._in_string and self._string_start is not None:
+                value = self._decode_partial_string(self._string_start)
+                if value:
+                    self._fields[key] = value
+            return
+
+        if key == self.PRODUCTS_KEY:
+            self._fields[key] = self._products
+            if depth >= 3:
+                product = self._decode_repaired(2)
+                if isinstance(product, dict) and product.get("name"):
+                    self._products.append(product)
+            return
+
+        value = self._decode_repaired(1)
+        if value is not None:
+            self._fields[key] = value
+
+    def _decode_partial_string(self, start: int) -> Optional[str]:
+        body = self._text[start:self._pos]
+        if self._escape:
+            body = body[:-1]
+        body = _INCOMPLETE_UNICODE_ESCAPE.sub("", body)
+        value = self._decode_text(body + '"')
+        return value if isinstance(value, str) else None
+
+    def _decode_repaired(self, level: int) -> Any:
+        """Close the containers from ``level`` up, keeping only complete members."""
+        frames = self._stack[level:]
+        body = self._text[frames[0].start:frames[-1].safe_end]
+        closers = "".join("}" if frame.kind == "{" else "]" for frame in reversed(frames))
+        return self._decode_text(body + closers)
+
+    # --- helpers ---
+
+    def _document(self) -> Dict[str, Any]:
+        document = dict(self._fields)
+        if self.PRODUCTS_KEY in document:
+            document[self.PRODUCTS_KEY] = list(self._products)
+        return document
+
+    def _decode(self, start: int, end: int) -> Any:
+        return self._decode_text(self._text[start:end])
+
+    @staticmethod
+    def _decode_text(text: str) -> Any:
+        try:
+            return json.loads(text)
+        except ValueError:
+            return None
@@ -2,14 +2,22 @@
 Gemini Function Calling tools for product search.
 Defines tools that Gemini can use to search the product database.
 """
-import google.generativeai as genai
+import functools
 from config import logger
 
 
-# Function declaration for product search
-find_product_declaration = genai.protos.FunctionDeclaration(
-    name="find_product",
-    description="""
+@functools.lru_cache(maxsize=None)
+def get_product_search_tool():
+    """
+    Product search tool for Gemini Function Calling.
+    Built on first use: the Gemini SDK import is slow and not every worker needs it.
+    """
+    import google.generativeai as genai
+    
+    # Function declaration for product search
+    find_product_declaration = genai.protos.FunctionDeclaration(
+        name="find_product",
+        description="""
     Veritabanından tasarıma uygun ürün ara. SADECE belirtilen kategorilerden birini kullan.
     Eğer istediğin ürün mevcut kategorilerde yoksa, en yakın kategoriyi seç.
     
@@ -21,12 +29,12 @@ find_product_declaration = genai.protos.FunctionDeclaration(
     
     Kendi kategori isimleri uydurmA!
     """,
-    parameters=genai.protos.Schema(
-        type=genai.protos.Type.OBJECT,
-        properties={
-            "category": genai.protos.Schema(
-                type=genai.protos.Type.STRING,
-                description="""Ürün kategorisi (zorunlu). SADECE aşağıdaki kategorilerden birini seç:
+        parameters=genai.protos.Schema(
+            type=genai.protos.Type.OBJECT,
+            properties={
+                "category": genai.protos.Schema(
+                    type=genai.protos.Type.STRING,
+                    description="""Ürün kategorisi (zorunlu). SADECE aşağıdaki kategorilerden birini seç:
 
 MEVCUT KATEGORİLER:
 • Sandalye
@@ -59,28 +67,27 @@ MEVCUT KATEGORİLER:
 - Depolama için → "Dolap" veya "Kitaplık"
 - Dekoratif objeler için → "Aksesuar" veya "Duvar Dekorasyonu"
 """,
-            ),
-            "style": genai.protos.Schema(
-                type=genai.protos.Type.STRING,
-                description="Tasarım stili (opsiyonel). Örnek: modern, klasik, minimalist, rustic",
-            ),
-            "color": genai.protos.Schema(
-                type=genai.protos.Type.STRING,
-                description="Renk tercihi (opsiyonel). Örnek: beyaz, siyah, venge, doğal",
-            ),
-            "limit": genai.protos.Schema(
-                type=genai.protos.Type.INTEGER,
-                description="Maksimum ürün sayısı (opsiyonel, varsayılan: 2)",
-            )
-        },
-        required=["category"]
+                ),
+                "style": genai.protos.Schema(
+                    type=genai.protos.Type.STRING,
+                    description="Tasarım stili (opsiyonel). Örnek: modern, klasik, minimalist, rustic",
+                ),
+                "color": genai.protos.Schema(
+                    type=genai.protos.Type.STRING,
+                    description="Renk tercihi (opsiyonel). Örnek: beyaz, siyah, venge, doğal",
+                ),
+                "limit": genai.protos.Schema(
+                    type=genai.protos.Type.INTEGER,
+                    description="Maksimum ürün sayısı (opsiyonel, varsayılan: 2)",
+                )
+            },
+            required=["category"]
+        )
     )
-)
 
-# Create the tool
-product_search_tool = genai.protos.Tool(
-    function_declarations=[find_product_declaration]
-)
+    return genai.protos.Tool(
+        function_declarations=[find_product_declaration]
+    )
 
 
 class FunctionCallHandler:
@@ -93,7 +100,7 @@ class FunctionCallHandler:
         self.price_limit = price_limit
         logger.info(f"FunctionCallHandler initialized with price limit: {price_limit}")
     
-    async def handle_find_product(self, db_session, function_call) -> genai.protos.FunctionResponse:
+    async def handle_find_product(self, db_session, function_call) -> "genai.protos.FunctionResponse":
         """
         Handle find_product function call from Gemini.
         
@@ -104,6 +111,8 @@ class FunctionCallHandler:
         Returns:
             FunctionResponse to send back to Gemini
         """
+        import google.generativeai as genai
+        
         try:
             # Extract arguments
             args = function_call.args
@@ -187,4 +196,4 @@ class FunctionCallHandler:
 
 
 # Export the tool for use in GeminiClient
-__all__ = ["product_search_tool", "FunctionCallHandler"]
+__all__ = ["get_product_search_tool", "FunctionCallHandler"]
@@ -0,0 +1,58 @@
+"""
+AIWarmup - Builds the AI clients in the background after startup.
+KISS principle: One worker thread touches the lazy models once; requests that arrive earlier build them on first use.
+"""
+import asyncio
+import time
+from typing import Callable, List, Optional
+from config import logger
+
+
+class AIWarmup:
+    """
+    Imports the Gemini, Vertex AI and Pillow SDKs and builds the lazy models.
+
+    The services create their SDK objects on first use, so importing the app
+    stays fast. Warming them up right after startup keeps that import cost
+    off the first design request without delaying the server's readiness.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, steps: List[Callable[[], object]]):
+        """Run the warm-up steps in a worker thread (returns immediately)."""
+        if self._task is None:
+            self._task = asyncio.create_task(asyncio.to_thread(self._run, steps))
+
+    async def stop(self):
+        if self._task is None:
+            return
+        # The worker thread cannot be interrupted; stop waiting for it
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    @staticmethod
+    def _run(steps: List[Callable[[], object]]):
+        started_at = time.perf_counter()
+        for step in steps:
+            try:
+                step()
+            except Exception as e:
+                # Not cached on failure: the first request retries and reports the error
+                logger.warning(f"AI warm-up step failed: {e}")
+        logger.info(f"AI clients warmed up in {time.perf_counter() - started_at:.2f}s")
+
+
+def import_image_sdks():
+    """Pillow and the Imagen SDK, imported lazily by the mood board code."""
+    import PIL.Image  # noqa: F401
+    import vertexai.preview.vision_models  # noqa: F401
+
+
+# Global warm-up instance
+ai_warmup = AIWarmup()
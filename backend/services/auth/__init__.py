@@ -2,7 +2,10 @@
 Authentication Services - User authentication and authorization.
 """
 from .auth_service import AuthService
+from .password_hasher import PasswordHasher, password_hasher
 
 __all__ = [
-    "AuthService"
+    "AuthService",
+    "PasswordHasher",
+    "password_hasher"
 ]
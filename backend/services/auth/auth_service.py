@@ -2,15 +2,12 @@
 Authentication service for user management.
 """
 from datetime import datetime, timedelta
-from typing import Optional
-from passlib.context import CryptContext
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from fastapi import HTTPException, status
 from config.settings import settings
 from ..base_service import BaseService
-
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from .password_hasher import pwd_context, password_hasher
 
 class AuthService(BaseService):
     """Service for handling authentication operations."""
@@ -29,6 +26,19 @@ class AuthService(BaseService):
         """Hash a plaintext password."""
         return pwd_context.hash(password)
     
+    @staticmethod
+    async def get_password_hash_async(password: str) -> str:
+        """Hash a plaintext password on the bounded hashing pool (non-blocking)."""
+        return await password_hasher.hash(password)
+    
+    @staticmethod
+    async def verify_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password on the bounded hashing pool (non-blocking).
+        Also returns a new hash when the stored one uses outdated cost settings.
+        """
+        return await password_hasher.verify_and_update(plain_password, hashed_password)
+    
     @staticmethod
     def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
         """Create a JWT access token."""
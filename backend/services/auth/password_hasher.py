@@ -0,0 +1,172 @@
+"""
+PasswordHasher - Runs bcrypt off the event loop on a bounded worker pool.
+KISS principle: One small pool, one admission limit, plain counters.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from config import logger
+from config.settings import settings
+from utils.metrics import metrics
+
+QUEUE_WAIT = metrics.histogram(
+    "password_hash_queue_wait_seconds", "Time bcrypt jobs waited for a hashing worker",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+REJECTIONS = metrics.counter("password_hash_rejections_total", "Hashing requests rejected because the queue stayed full")
+
+# Password hashing context.
+# min/max rounds equal to the default make passlib flag every hash created with
+# a different cost as "needs update", which drives rehash-on-login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+
+class PasswordHasher:
+    """
+    Bounded worker pool for bcrypt hashing and verification.
+
+    bcrypt releases the GIL while it works, so a small thread pool keeps the
+    event loop responsive without the start-up cost of a process pool.
+    Callers beyond the pool size wait in a bounded queue; when the queue stays
+    full for longer than ``queue_timeout`` the request is rejected with 503
+    instead of piling up behind a login burst.
+    """
+
+    def __init__(self, crypt_context: CryptContext, workers: int, max_queue: int, queue_timeout: float):
+        self.crypt_context = crypt_context
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._admission = asyncio.Semaphore(self.workers + self.max_queue)
+        self._lock = threading.Lock()
+
+        # Queueing metrics
+        self._waiting = 0  # Callers waiting for admission (queue full)
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._rehashed = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._total_run_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the worker pool on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="password-hasher"
+            )
+        return self._executor
+
+    async def _run(self, func: Callable[..., Any], *args) -> Any:
+        """Run a hashing function on the pool, enforcing the queue bound."""
+        with self._lock:
+            self._waiting += 1
+        try:
+            await asyncio.wait_for(self._admission.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._rejected += 1
+            REJECTIONS.inc()
+            logger.warning("Password hashing queue is full, rejecting request")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service is busy, please try again"
+            )
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+
+        def job():
+            started_at = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                wait_seconds = started_at - submitted_at
+                self._total_wait_seconds += wait_seconds
+                self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+            QUEUE_WAIT.observe(wait_seconds)
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+                    self._total_run_seconds += time.perf_counter() - started_at
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), job)
+        finally:
+            self._admission.release()
+
+    async def hash(self, password: str) -> str:
+        """Hash a plaintext password."""
+        return await self._run(self.crypt_context.hash, password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password and return a replacement hash when the stored one
+        was created with outdated cost parameters.
+
+        Returns:
+            (is_valid, new_hash) - new_hash is None unless a rehash is needed
+        """
+        is_valid, new_hash = await self._run(
+            self.crypt_context.verify_and_update, plain_password, hashed_password
+        )
+        if is_valid and new_hash:
+            with self._lock:
+                self._rehashed += 1
+        return is_valid, new_hash
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queueing metrics for the hashing pool."""
+        with self._lock:
+            completed = self._completed
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "waiting_for_admission": self._waiting,
+                "queued": self._queued,
+                "running": self._running,
+                "completed": completed,
+                "rejected": self._rejected,
+                "rehashed": self._rehashed,
+                "avg_wait_ms": round(self._total_wait_seconds / completed * 1000, 2) if completed else 0.0,
+                "max_wait_ms": round(self._max_wait_seconds * 1000, 2),
+                "avg_run_ms": round(self._total_run_seconds / completed * 1000, 2) if completed else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker pool (called on application shutdown)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global password hasher instance
+password_hasher = PasswordHasher(
+    pwd_context,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT,
+)
@@ -1,9 +1,14 @@
 """
 Communication Services - WebSocket and real-time communication.
 """
+from .pubsub_broker import PubSubBroker, InMemoryBroker, RedisBroker, create_broker
 from .websocket_manager import WebSocketManager, websocket_manager
 
 __all__ = [
+    "PubSubBroker",
+    "InMemoryBroker",
+    "RedisBroker",
+    "create_broker",
     "WebSocketManager",
     "websocket_manager"
 ]
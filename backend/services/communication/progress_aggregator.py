@@ -0,0 +1,183 @@
+"""
+Progress aggregation for mood board jobs.
+
+Rate-limits progress updates per job and coalesces updates within a stage,
+so hundreds of concurrent jobs do not each push a frame for every sub-step.
+Stage changes and terminal updates are always sent immediately.
+"""
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+from config import logger
+from config.settings import settings
+
+# Stages that end a job
+TERMINAL_STAGES = {"completed", "error"}
+
+ProgressSender = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+class GenerationTimeEstimator:
+    """
+    Exponentially weighted moving average of mood board generation times.
+    Seeded from MoodBoard.generation_time_seconds at startup.
+    """
+
+    def __init__(self, default_seconds: float, smoothing: float):
+        self.default_seconds = default_seconds
+        self.smoothing = smoothing
+        self._average: Optional[float] = None
+        self._samples = 0
+        self._lock = threading.Lock()
+
+    def seed(self, durations: Iterable[float]):
+        """Seed the average from historical durations (oldest first)."""
+        for duration in durations:
+            self.record(duration)
+
+    def record(self, duration_seconds: float):
+        """Add a completed generation time."""
+        if duration_seconds is None or duration_seconds <= 0:
+            return
+        with self._lock:
+            if self._average is None:
+                self._average = float(duration_seconds)
+            else:
+                self._average += self.smoothing * (duration_seconds - self._average)
+            self._samples += 1
+
+    @property
+    def expected_seconds(self) -> float:
+        return self._average if self._average is not None else self.default_seconds
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "expected_seconds": round(self.expected_seconds, 2),
+            "samples": self._samples
+        }
+
+
+class _JobProgress:
+    """Progress state of one job."""
+
+    __slots__ = ("connection_id", "started_at", "stage", "last_sent_at", "pending", "timer", "flush_task")
+
+    def __init__(self, connection_id: str):
+        self.connection_id = connection_id
+        self.started_at = time.monotonic()
+        self.stage: Optional[str] = None
+        self.last_sent_at = 0.0
+        self.pending: Optional[Dict[str, Any]] = None
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.flush_task: Optional[asyncio.Task] = None
+
+
+class ProgressAggregator:
+    """
+    Per-job progress throttle.
+
+    - First update, stage changes and terminal stages are sent immediately.
+    - Updates within a stage are sent at most once per ``min_interval``;
+      in between, only the latest one is kept and flushed by a timer.
+    - Every update carries ``eta_seconds`` derived from the estimator.
+    """
+
+    def __init__(self, send: ProgressSender, estimator: GenerationTimeEstimator, min_interval: float):
+        self._send = send
+        self.estimator = estimator
+        self.min_interval = min_interval
+        self._jobs: Dict[str, _JobProgress] = {}
+
+        # Aggregation counters
+        self.submitted = 0
+        self.sent = 0
+
+    async def submit(self, connection_id: str, progress_data: Dict[str, Any]):
+        """Report a progress update for a job."""
+        self.submitted += 1
+        job_key = progress_data.get("mood_board_id") or connection_id
+        stage = progress_data.get("stage")
+
+        job = self._jobs.get(job_key)
+        if job is None:
+            job = self._jobs[job_key] = _JobProgress(connection_id)
+
+        now = time.monotonic()
+        progress_data = dict(progress_data)
+        progress_data.setdefault("eta_seconds", self._eta_seconds(job, now, stage))
+
+        if stage in TERMINAL_STAGES:
+            self._cancel_pending(job)
+            del self._jobs[job_key]
+            await self._deliver(job, progress_data, now)
+            return
+
+        if stage != job.stage or now - job.last_sent_at >= self.min_interval:
+            self._cancel_pending(job)
+            job.stage = stage
+            await self._deliver(job, progress_data, now)
+            return
+
+        # Same stage, too soon: keep only the latest update
+        job.pending = progress_data
+        if job.timer is None:
+            delay = self.min_interval - (now - job.last_sent_at)
+            job.timer = asyncio.get_running_loop().call_later(delay, self._schedule_flush, job_key)
+
+    def _eta_seconds(self, job: _JobProgress, now: float, stage: Optional[str]) -> float:
+        if stage in TERMINAL_STAGES:
+            return 0.0
+        return round(max(0.0, self.estimator.expected_seconds - (now - job.started_at)), 1)
+
+    def _schedule_flush(self, job_key: str):
+        job = self._jobs.get(job_key)
+        if job is None:
+            return
+        job.timer = None
+        if job.pending is not None:
+            job.flush_task = asyncio.create_task(self._flush(job))
+
+    async def _flush(self, job: _JobProgress):
+        pending, job.pending = job.pending, None
+        if pending is not None:
+            now = time.monotonic()
+            pending["eta_seconds"] = self._eta_seconds(job, now, pending.get("stage"))
+            await self._deliver(job, pending, now)
+
+    async def _deliver(self, job: _JobProgress, progress_data: Dict[str, Any], now: float):
+        job.last_sent_at = now
+        self.sent += 1
+        try:
+            await self._send(job.connection_id, progress_data)
+        except Exception as e:
+            logger.error(f"Error sending progress for {job.connection_id}: {str(e)}")
+
+    @staticmethod
+    def _cancel_pending(job: _JobProgress):
+        job.pending = None
+        if job.timer is not None:
+            job.timer.cancel()
+            job.timer = None
+
+    def discard(self, job_key: str):
+        """Forget a job without sending anything (e.g. after an error message)."""
+        job = self._jobs.pop(job_key, None)
+        if job is not None:
+            self._cancel_pending(job)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "active_jobs": len(self._jobs),
+            "submitted_updates": self.submitted,
+            "sent_updates": self.sent,
+            "coalesced_updates": self.submitted - self.sent,
+            "eta": self.estimator.get_stats()
+        }
+
+
+# Global generation time estimator (seeded from the database on startup)
+generation_time_estimator = GenerationTimeEstimator(
+    default_seconds=settings.MOOD_BOARD_DEFAULT_GENERATION_SECONDS,
+    smoothing=settings.MOOD_BOARD_ETA_SMOOTHING
+)
@@ -0,0 +1,237 @@
+"""
+Pub/Sub brokers for WebSocket fan-out across uvicorn workers.
+
+A job that runs in one worker publishes its messages to the broker and every
+worker delivers them to the WebSocket connections it holds locally.
+"""
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import unquote, urlparse
+from config import logger
+from utils.json_codec import dumps, loads
+
+BrokerHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class PubSubBroker(ABC):
+    """
+    Minimal broker interface: one channel, JSON-serialisable envelopes.
+    """
+
+    def __init__(self):
+        self._handler: Optional[BrokerHandler] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._handler is not None
+
+    @abstractmethod
+    async def start(self, handler: BrokerHandler) -> None:
+        """Start receiving envelopes; ``handler`` is called for each one."""
+
+    @abstractmethod
+    async def publish(self, envelope: Dict[str, Any]) -> None:
+        """Publish an envelope to every subscribed worker (including this one)."""
+
+    @abstractmethod
+    async def stop(self) -> None:
+        """Stop receiving and release connections."""
+
+
+class InMemoryBroker(PubSubBroker):
+    """
+    Single-process broker - hands envelopes straight to the local handler.
+    """
+
+    async def start(self, handler: BrokerHandler) -> None:
+        self._handler = handler
+        logger.debug("In-memory WebSocket broker started")
+
+    async def publish(self, envelope: Dict[str, Any]) -> None:
+        if self._handler is not None:
+            await self._handler(envelope)
+
+    async def stop(self) -> None:
+        self._handler = None
+
+
+class RedisProtocolError(Exception):
+    """Error reply received from a Redis-protocol server."""
+
+
+def _encode_command(*parts: Any) -> bytes:
+    """Encode a command as a RESP array of bulk strings."""
+    chunks = [b"*%d\r\n" % len(parts)]
+    for part in parts:
+        if not isinstance(part, bytes):
+            part = str(part).encode("utf-8")
+        chunks.append(b"$%d\r\n%s\r\n" % (len(part), part))
+    return b"".join(chunks)
+
+
+async def _read_reply(reader: asyncio.StreamReader) -> Any:
+    """Read one RESP reply."""
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Broker connection closed")
+
+    prefix, body = line[:1], line[1:-2]
+    if prefix == b"+":
+        return body.decode("utf-8")
+    if prefix == b"-":
+        raise RedisProtocolError(body.decode("utf-8"))
+    if prefix == b":":
+        return int(body)
+    if prefix == b"$":
+        length = int(body)
+        if length == -1:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if prefix == b"*":
+        count = int(body)
+        if count == -1:
+            return None
+        return [await _read_reply(reader) for _ in range(count)]
+
+    raise RedisProtocolError(f"Unexpected reply prefix: {prefix!r}")
+
+
+class RedisBroker(PubSubBroker):
+    """
+    Broker speaking the Redis protocol (RESP) over TCP or a Unix socket.
+
+    Works with Redis, Valkey, KeyDB or any server implementing PUBLISH and
+    SUBSCRIBE. Supported URLs:
+        redis://[:password@]host[:port]
+        unix:///path/to/redis.sock
+    """
+
+    RECONNECT_DELAY_SECONDS = 1.0
+    MAX_RECONNECT_DELAY_SECONDS = 30.0
+
+    def __init__(self, url: str, channel: str):
+        super().__init__()
+        self.url = url
+        self.channel = channel
+
+        parsed = urlparse(url)
+        self._scheme = parsed.scheme
+        self._host = parsed.hostname or "localhost"
+        self._port = parsed.port or 6379
+        self._path = parsed.path
+        self._password = unquote(parsed.password) if parsed.password else None
+
+        if self._scheme not in ("redis", "unix"):
+            raise ValueError(f"Unsupported broker URL scheme: {self._scheme}")
+
+        self._pub_reader: Optional[asyncio.StreamReader] = None
+        self._pub_writer: Optional[asyncio.StreamWriter] = None
+        self._pub_lock = asyncio.Lock()
+        self._subscriber_task: Optional[asyncio.Task] = None
+
+    async def _open_connection(self):
+        """Open a connection and authenticate if a password is configured."""
+        if self._scheme == "unix":
+            reader, writer = await asyncio.open_unix_connection(self._path)
+        else:
+            reader, writer = await asyncio.open_connection(self._host, self._port)
+
+        if self._password:
+            writer.write(_encode_command("AUTH", self._password))
+            await writer.drain()
+            await _read_reply(reader)
+
+        return reader, writer
+
+    async def start(self, handler: BrokerHandler) -> None:
+        self._handler = handler
+        self._subscriber_task = asyncio.create_task(self._subscribe_loop())
+        logger.info(f"Redis-protocol WebSocket broker started on channel '{self.channel}'")
+
+    async def _subscribe_loop(self):
+        """Keep a SUBSCRIBE connection open, reconnecting with backoff."""
+        delay = self.RECONNECT_DELAY_SECONDS
+        while self._handler is not None:
+            writer = None
+            try:
+                reader, writer = await self._open_connection()
+                writer.write(_encode_command("SUBSCRIBE", self.channel))
+                await writer.drain()
+                delay = self.RECONNECT_DELAY_SECONDS
+
+                while True:
+                    reply = await _read_reply(reader)
+                    if isinstance(reply, list) and len(reply) == 3 and reply[0] == b"message":
+                        await self._dispatch(reply[2])
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Broker subscription lost, retrying in {delay:.0f}s: {str(e)}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.MAX_RECONNECT_DELAY_SECONDS)
+            finally:
+                if writer is not None:
+                    writer.close()
+
+    async def _dispatch(self, payload: bytes):
+        """Decode an envelope and pass it to the handler."""
+        try:
+            envelope = loads(payload)
+        except ValueError:
+            logger.warning("Discarding malformed broker message")
+            return
+
+        try:
+            await self._handler(envelope)
+        except Exception as e:
+            logger.error(f"Broker handler error: {str(e)}")
+
+    async def publish(self, envelope: Dict[str, Any]) -> None:
+        payload = dumps(envelope)
+
+        async with self._pub_lock:
+            for attempt in range(2):
+                try:
+                    if self._pub_writer is None:
+                        self._pub_reader, self._pub_writer = await self._open_connection()
+                    self._pub_writer.write(_encode_command("PUBLISH", self.channel, payload))
+                    await self._pub_writer.drain()
+                    await _read_reply(self._pub_reader)
+                    return
+                except (ConnectionError, OSError, asyncio.IncompleteReadError) as e:
+                    self._close_publisher()
+                    if attempt == 1:
+                        logger.error(f"Broker publish failed: {str(e)}")
+
+    def _close_publisher(self):
+        if self._pub_writer is not None:
+            self._pub_writer.close()
+        self._pub_reader = None
+        self._pub_writer = None
+
+    async def stop(self) -> None:
+        self._handler = None
+        if self._subscriber_task is not None:
+            self._subscriber_task.cancel()
+            try:
+                await self._subscriber_task
+            except asyncio.CancelledError:
+                pass
+            self._subscriber_task = None
+        self._close_publisher()
+
+
+def create_broker(backend: str, url: str, channel: str) -> PubSubBroker:
+    """
+    Create a broker for the configured backend ("memory" or "redis").
+    """
+    backend = (backend or "memory").lower()
+    if backend == "memory":
+        return InMemoryBroker()
+    if backend == "redis":
+        return RedisBroker(url, channel)
+    raise ValueError(f"Unknown WebSocket broker backend: {backend}")
+
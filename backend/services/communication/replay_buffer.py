@@ -0,0 +1,61 @@
+"""
+Bounded replay buffer of recent WebSocket events per mood board job.
+
+Lets a client that reconnects mid-job resubscribe by mood_board_id and
+receive the events it missed, instead of regenerating the image.
+"""
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Tuple
+
+
+class JobReplayBuffer:
+    """
+    Ring buffer of encoded frames per job, with LRU eviction across jobs.
+
+    Each job keeps at most ``max_events`` frames. Whole jobs are evicted,
+    least recently used first, once there are more than ``max_jobs`` jobs or
+    the buffered frames exceed ``max_chars`` characters in total.
+    """
+
+    def __init__(self, max_events: int, max_jobs: int, max_chars: int):
+        self.max_events = max(1, max_events)
+        self.max_jobs = max(1, max_jobs)
+        self.max_chars = max_chars
+        self._jobs: "OrderedDict[str, Deque[Tuple[int, str]]]" = OrderedDict()
+        self._chars = 0
+
+    def record(self, mood_board_id: str, seq: int, text: str):
+        """Store an encoded frame for a job."""
+        events = self._jobs.get(mood_board_id)
+        if events is None:
+            events = self._jobs[mood_board_id] = deque()
+        else:
+            self._jobs.move_to_end(mood_board_id)
+
+        if len(events) >= self.max_events:
+            _, dropped = events.popleft()
+            self._chars -= len(dropped)
+
+        events.append((seq, text))
+        self._chars += len(text)
+        self._evict()
+
+    def replay(self, mood_board_id: str, after_seq: int = 0) -> List[str]:
+        """Get the frames of a job with a sequence number above ``after_seq``."""
+        events = self._jobs.get(mood_board_id)
+        if events is None:
+            return []
+        self._jobs.move_to_end(mood_board_id)
+        return [text for seq, text in events if seq > after_seq]
+
+    def _evict(self):
+        # Always keep the job that was just written
+        while len(self._jobs) > 1 and (len(self._jobs) > self.max_jobs or self._chars > self.max_chars):
+            _, events = self._jobs.popitem(last=False)
+            self._chars -= sum(len(text) for _, text in events)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "buffered_jobs": len(self._jobs),
+            "buffered_chars": self._chars
+        }
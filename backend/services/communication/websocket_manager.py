@@ -1,23 +1,332 @@
 from fastapi import WebSocket, WebSocketDisconnect
-from typing import Dict, List
+from typing import Dict, List, Optional, Set
+from collections import OrderedDict, deque
 from config import logger
-import json
+from config.settings import settings
+from utils.json_codec import dumps
+from .pubsub_broker import PubSubBroker, create_broker
+from .progress_aggregator import ProgressAggregator, generation_time_estimator
+from .replay_buffer import JobReplayBuffer
+import asyncio
+import time
 import uuid
 from datetime import datetime
 
+# Message types that can be replaced by a newer frame while still queued
+COALESCABLE_MESSAGE_TYPES = {"room_visualization_progress"}
+# Message types that end a mood board job (its subscriptions are dropped once delivered)
+TERMINAL_MESSAGE_TYPES = {"room_visualization_completed", "room_visualization_error"}
+
+# Close code used when a client cannot keep up with its outbound queue
+SLOW_CONSUMER_CLOSE_CODE = 1013
+# Close code used when a client stops answering heartbeats
+IDLE_CLOSE_CODE = 1001
+
+# Number of jobs whose sequence counters are remembered by the publishing worker
+MAX_TRACKED_JOB_SEQUENCES = 4096
+
+
+class _OutboundFrame:
+    """Encoded frame waiting in a connection's send queue."""
+    
+    __slots__ = ("text", "coalesce_key")
+    
+    def __init__(self, text: str, coalesce_key: Optional[str] = None):
+        self.text = text
+        self.coalesce_key = coalesce_key
+
+
+class ConnectionSender:
+    """
+    Bounded outbound queue for one WebSocket, drained by its own writer task.
+    
+    Producers only enqueue, so a slow client never blocks the job that is
+    generating messages or the other clients. Progress frames for the same
+    job are coalesced in place; when the queue is full the oldest progress
+    frame is dropped first, and if only critical frames remain the client
+    is treated as a slow consumer.
+    """
+    
+    def __init__(self, connection_id: str, websocket: WebSocket, max_queue: int, send_timeout: float, on_failure):
+        self.connection_id = connection_id
+        self.websocket = websocket
+        self.max_queue = max(1, max_queue)
+        self.send_timeout = send_timeout
+        self._on_failure = on_failure
+        
+        self._queue: deque = deque()
+        self._pending_progress: Dict[str, _OutboundFrame] = {}
+        self._ready = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        
+        # Per-connection counters
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+    
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+    
+    def enqueue(self, text: str, coalesce_key: Optional[str] = None) -> bool:
+        """
+        Queue an encoded frame. Returns False when a critical frame cannot be
+        queued and the connection should be dropped.
+        """
+        if coalesce_key is not None:
+            pending = self._pending_progress.get(coalesce_key)
+            if pending is not None:
+                pending.text = text
+                self.coalesced += 1
+                return True
+        
+        if len(self._queue) >= self.max_queue and not self._evict_progress_frame():
+            if coalesce_key is not None:
+                self.dropped += 1
+                return True
+            return False
+        
+        frame = _OutboundFrame(text, coalesce_key)
+        self._queue.append(frame)
+        if coalesce_key is not None:
+            self._pending_progress[coalesce_key] = frame
+        self._ready.set()
+        return True
+    
+    def _evict_progress_frame(self) -> bool:
+        """Drop the oldest queued progress frame to make room."""
+        for frame in self._queue:
+            if frame.coalesce_key is not None:
+                self._queue.remove(frame)
+                del self._pending_progress[frame.coalesce_key]
+                self.dropped += 1
+                return True
+        return False
+    
+    async def _run(self):
+        """Writer loop: send queued frames in order."""
+        while True:
+            if not self._queue:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            
+            frame = self._queue.popleft()
+            if frame.coalesce_key is not None:
+                self._pending_progress.pop(frame.coalesce_key, None)
+            
+            try:
+                await asyncio.wait_for(self.websocket.send_text(frame.text), timeout=self.send_timeout)
+                self.sent += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error sending message to {self.connection_id}: {str(e)}")
+                self._on_failure(self.connection_id)
+                return
+    
+    def close(self):
+        """Stop the writer task."""
+        if self._task is not asyncio.current_task():
+            self._task.cancel()
+
 class WebSocketManager:
     """
     WebSocket connection manager for real-time mood board progress tracking.
     """
     
-    def __init__(self):
-        # Active WebSocket connections
+    def __init__(self, broker: Optional[PubSubBroker] = None):
+        # Active WebSocket connections (local to this worker)
         self.active_connections: Dict[str, WebSocket] = {}
+        # Outbound queue and writer task per connection
+        self.senders: Dict[str, ConnectionSender] = {}
+        self.slow_consumer_disconnects = 0
         # Track mood board generation progress
         self.mood_board_progress: Dict[str, Dict] = {}
+        # Local connections following a mood board job: mood_board_id -> connection IDs
+        self.mood_board_subscribers: Dict[str, Set[str]] = {}
+        # Jobs whose terminal frame was delivered here (late resubscribes only replay)
+        self._finished_jobs: "OrderedDict[str, None]" = OrderedDict()
+        # Last time each connection was heard from (monotonic seconds)
+        self.last_seen: Dict[str, float] = {}
+        self.idle_disconnects = 0
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        # Event sequence numbers of jobs published by this worker
+        self._job_sequences: "OrderedDict[str, int]" = OrderedDict()
+        # Recent events per job for reconnecting clients
+        self.replay_buffer = JobReplayBuffer(
+            max_events=settings.WS_REPLAY_BUFFER_SIZE,
+            max_jobs=settings.WS_REPLAY_MAX_JOBS,
+            max_chars=settings.WS_REPLAY_MAX_CHARS
+        )
+        # Per-job progress throttle
+        self.progress_aggregator = ProgressAggregator(
+            self._publish_progress,
+            generation_time_estimator,
+            min_interval=settings.WS_PROGRESS_MIN_INTERVAL
+        )
+        # Broker used to reach connections held by other workers
+        self.broker = broker or create_broker(
+            settings.WS_BROKER_BACKEND,
+            settings.WS_BROKER_URL,
+            settings.WS_BROKER_CHANNEL
+        )
         
         logger.debug("WebSocket Manager initialized")
     
+    async def start(self):
+        """
+        Start receiving messages published by other workers and the heartbeat loop.
+        """
+        await self.broker.start(self._deliver_envelope)
+        self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+    
+    async def stop(self):
+        """
+        Stop the heartbeat loop and the broker subscription.
+        """
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat_task = None
+        await self.broker.stop()
+    
+    async def _heartbeat_loop(self):
+        """
+        Ping every connection periodically and reap the ones that went quiet.
+        """
+        ping_text = dumps({"type": "ping"})
+        while True:
+            await asyncio.sleep(settings.WS_HEARTBEAT_INTERVAL)
+            try:
+                self._heartbeat(ping_text)
+            except Exception as e:
+                # One bad round must not stop pings and idle reaping for the worker's lifetime
+                logger.error(f"WebSocket heartbeat failed: {str(e)}")
+    
+    def _heartbeat(self, ping_text: str):
+        """
+        One heartbeat round: reap idle connections, ping the others.
+        """
+        now = time.monotonic()
+        for connection_id in list(self.senders):
+            if now - self.last_seen.get(connection_id, now) > settings.WS_IDLE_TIMEOUT:
+                logger.debug(f"Reaping idle WebSocket connection: {connection_id}")
+                self.idle_disconnects += 1
+                websocket = self.active_connections.get(connection_id)
+                self.disconnect(connection_id)
+                if websocket is not None:
+                    asyncio.create_task(self._close_quietly(websocket, IDLE_CLOSE_CODE))
+            else:
+                self._enqueue(connection_id, ping_text)
+    
+    def touch(self, connection_id: str):
+        """
+        Record that a client message was received on a connection.
+        """
+        if connection_id in self.senders:
+            self.last_seen[connection_id] = time.monotonic()
+    
+    def _next_sequence(self, mood_board_id: str) -> int:
+        """Next event sequence number of a job published by this worker."""
+        seq = self._job_sequences.pop(mood_board_id, 0) + 1
+        self._job_sequences[mood_board_id] = seq
+        if len(self._job_sequences) > MAX_TRACKED_JOB_SEQUENCES:
+            self._job_sequences.popitem(last=False)
+        return seq
+    
+    async def publish(self, message: dict, connection_id: Optional[str] = None, mood_board_id: Optional[str] = None):
+        """
+        Publish a message for a connection and/or mood board job.
+        
+        The worker holding the target connection delivers it, so jobs can
+        finish on a different worker than the one the client is connected to.
+        Job messages get a per-job ``seq`` used for replay after reconnects.
+        """
+        if mood_board_id:
+            message["seq"] = self._next_sequence(mood_board_id)
+        
+        envelope = {
+            "connection_id": connection_id,
+            "mood_board_id": mood_board_id,
+            "message": message
+        }
+        
+        if not self.broker.is_running:
+            # Broker not started (scripts, tests) - deliver within this process
+            await self._deliver_envelope(envelope)
+            return
+        
+        await self.broker.publish(envelope)
+    
+    async def _deliver_envelope(self, envelope: dict):
+        """
+        Deliver a published message to the matching local connections.
+        """
+        targets = set()
+        connection_id = envelope.get("connection_id")
+        if connection_id in self.active_connections:
+            targets.add(connection_id)
+        
+        mood_board_id = envelope.get("mood_board_id")
+        if mood_board_id:
+            targets.update(self.mood_board_subscribers.get(mood_board_id, ()))
+        
+        message = envelope["message"]
+        if not targets and not mood_board_id:
+            return
+        
+        # Encode once for the replay buffer and every local recipient
+        text = dumps(message)
+        if mood_board_id and "seq" in message:
+            self.replay_buffer.record(mood_board_id, message["seq"], text)
+        
+        coalesce_key = None
+        if message.get("type") in COALESCABLE_MESSAGE_TYPES:
+            coalesce_key = mood_board_id or connection_id
+        for target in targets:
+            self._enqueue(target, text, coalesce_key)
+        
+        if mood_board_id and message.get("type") in TERMINAL_MESSAGE_TYPES:
+            self._finish_job(mood_board_id)
+    
+    def _finish_job(self, mood_board_id: str):
+        """
+        Drop the subscriptions of a job whose completed/error frame was delivered.
+        """
+        self.mood_board_subscribers.pop(mood_board_id, None)
+        self._finished_jobs.pop(mood_board_id, None)
+        self._finished_jobs[mood_board_id] = None
+        if len(self._finished_jobs) > MAX_TRACKED_JOB_SEQUENCES:
+            self._finished_jobs.popitem(last=False)
+    
+    def subscribe_mood_board(self, connection_id: str, mood_board_id: str):
+        """
+        Follow a mood board job from a local connection.
+        """
+        self.mood_board_subscribers.setdefault(mood_board_id, set()).add(connection_id)
+    
+    def resubscribe(self, connection_id: str, mood_board_id: str, last_seq: int = 0) -> int:
+        """
+        Attach a (re)connected client to a running or recently finished job
+        and replay the events it missed. Returns the number of replayed frames.
+        Finished jobs are only replayed, not subscribed to.
+        """
+        if connection_id not in self.senders:
+            return 0
+        
+        if mood_board_id not in self._finished_jobs:
+            self.subscribe_mood_board(connection_id, mood_board_id)
+        missed = self.replay_buffer.replay(mood_board_id, last_seq)
+        for text in missed:
+            self._enqueue(connection_id, text)
+        
+        logger.debug(f"Connection {connection_id} resubscribed to {mood_board_id}, replayed {len(missed)} events")
+        return len(missed)
+    
     async def connect(self, websocket: WebSocket) -> str:
         """
         Accept new WebSocket connection and return connection ID.
@@ -25,6 +334,14 @@ class WebSocketManager:
         await websocket.accept()
         connection_id = str(uuid.uuid4())
         self.active_connections[connection_id] = websocket
+        self.senders[connection_id] = ConnectionSender(
+            connection_id,
+            websocket,
+            max_queue=settings.WS_SEND_QUEUE_SIZE,
+            send_timeout=settings.WS_SEND_TIMEOUT,
+            on_failure=self.disconnect
+        )
+        self.last_seen[connection_id] = time.monotonic()
         
         logger.debug(f"New WebSocket connection established: {connection_id}")
         
@@ -44,44 +361,74 @@ class WebSocketManager:
         """
         if connection_id in self.active_connections:
             del self.active_connections[connection_id]
+        
+        sender = self.senders.pop(connection_id, None)
+        if sender is not None:
+            sender.close()
+        self.last_seen.pop(connection_id, None)
             
         if connection_id in self.mood_board_progress:
             del self.mood_board_progress[connection_id]
+        
+        for mood_board_id in [
+            mood_board_id for mood_board_id, subscribers in self.mood_board_subscribers.items()
+            if connection_id in subscribers
+        ]:
+            subscribers = self.mood_board_subscribers[mood_board_id]
+            subscribers.discard(connection_id)
+            if not subscribers:
+                del self.mood_board_subscribers[mood_board_id]
             
         logger.debug(f"WebSocket connection removed: {connection_id}")
     
+    def _enqueue(self, connection_id: str, text: str, coalesce_key: Optional[str] = None):
+        """
+        Queue an encoded frame for a local connection without waiting for the send.
+        """
+        sender = self.senders.get(connection_id)
+        if sender is None:
+            return
+        
+        if not sender.enqueue(text, coalesce_key):
+            logger.warning(f"Slow WebSocket consumer disconnected: {connection_id}")
+            self.slow_consumer_disconnects += 1
+            websocket = sender.websocket
+            self.disconnect(connection_id)
+            asyncio.create_task(self._close_quietly(websocket, SLOW_CONSUMER_CLOSE_CODE))
+    
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket, code: int):
+        try:
+            await websocket.close(code=code)
+        except Exception:
+            pass
+    
     async def send_personal_message(self, message: dict, connection_id: str):
         """
         Send message to specific WebSocket connection.
         """
-        if connection_id in self.active_connections:
-            try:
-                websocket = self.active_connections[connection_id]
-                await websocket.send_text(json.dumps(message))
-                logger.debug(f"Message sent to {connection_id}: {message.get('type', 'unknown')}")
-            except Exception as e:
-                logger.error(f"Error sending message to {connection_id}: {str(e)}")
-                self.disconnect(connection_id)
+        if connection_id in self.senders:
+            self._enqueue(connection_id, dumps(message))
+            logger.debug(f"Message queued for {connection_id}: {message.get('type', 'unknown')}")
     
     async def broadcast_message(self, message: dict):
         """
         Send message to all active WebSocket connections.
         """
-        disconnected = []
-        for connection_id, websocket in self.active_connections.items():
-            try:
-                await websocket.send_text(json.dumps(message))
-            except Exception as e:
-                logger.error(f"Error broadcasting to {connection_id}: {str(e)}")
-                disconnected.append(connection_id)
-        
-        # Clean up disconnected connections
-        for connection_id in disconnected:
-            self.disconnect(connection_id)
+        text = dumps(message)
+        for connection_id in list(self.senders):
+            self._enqueue(connection_id, text)
     
     async def update_mood_board_progress(self, connection_id: str, progress_data: dict):
         """
         Update mood board generation progress and notify client.
+        Updates are rate-limited per job by the progress aggregator.
+        """
+        await self.progress_aggregator.submit(connection_id, progress_data)
+    
+    async def _publish_progress(self, connection_id: str, progress_data: dict):
+        """
+        Publish a progress update that passed the aggregator.
         """
         if connection_id not in self.mood_board_progress:
             self.mood_board_progress[connection_id] = {}
@@ -106,8 +453,8 @@ class WebSocketManager:
         if message_type == "room_visualization_completed":
             progress_message["room_visualization"] = progress_data.get("image_data", {})
         
-        await self.send_personal_message(progress_message, connection_id)
-        logger.info(f"Mood board progress updated for {connection_id}: {progress_data.get('stage', 'unknown')}")
+        await self.publish(progress_message, connection_id, progress_data.get("mood_board_id"))
+        logger.debug(f"Mood board progress updated for {connection_id}: {progress_data.get('stage', 'unknown')}")
     
     async def send_mood_board_completed(self, connection_id: str, mood_board_data: dict):
         """
@@ -120,7 +467,7 @@ class WebSocketManager:
             "timestamp": datetime.now().isoformat()
         }
         
-        await self.send_personal_message(completion_message, connection_id)
+        await self.publish(completion_message, connection_id, mood_board_data.get("mood_board_id"))
         
         # Clean up progress tracking
         if connection_id in self.mood_board_progress:
@@ -128,18 +475,20 @@ class WebSocketManager:
         
         logger.info(f"Mood board completed and sent to {connection_id}")
     
-    async def send_mood_board_error(self, connection_id: str, error_message: str):
+    async def send_mood_board_error(self, connection_id: str, error_message: str, mood_board_id: Optional[str] = None):
         """
         Send mood board generation error to client.
         """
         error_response = {
             "type": "room_visualization_error",
             "connection_id": connection_id,
+            "mood_board_id": mood_board_id,
             "error": error_message,
             "timestamp": datetime.now().isoformat()
         }
         
-        await self.send_personal_message(error_response, connection_id)
+        await self.publish(error_response, connection_id, mood_board_id)
+        self.progress_aggregator.discard(mood_board_id or connection_id)
         
         # Clean up progress tracking
         if connection_id in self.mood_board_progress:
@@ -158,6 +507,21 @@ class WebSocketManager:
         Get list of active connection IDs.
         """
         return list(self.active_connections.keys())
+    
+    def get_send_queue_stats(self) -> Dict[str, int]:
+        """
+        Get aggregate outbound queue statistics for local connections.
+        """
+        senders = list(self.senders.values())
+        return {
+            "queued_frames": sum(sender.queue_depth for sender in senders),
+            "max_queue_depth": max((sender.queue_depth for sender in senders), default=0),
+            "sent_frames": sum(sender.sent for sender in senders),
+            "coalesced_frames": sum(sender.coalesced for sender in senders),
+            "dropped_frames": sum(sender.dropped for sender in senders),
+            "slow_consumer_disconnects": self.slow_consumer_disconnects,
+            "idle_disconnects": self.idle_disconnects,
+        }
 
 
 # Global WebSocket manager instance
@@ -3,17 +3,32 @@ Design Services - Design generation, history, and mood board management.
 """
 from .design_history_service import DesignHistoryService
 from .hashtag_service import HashtagService
+from .hashtag_translation_service import HashtagTranslationService, hashtag_translation_service
 from .mood_board_service import MoodBoardService, mood_board_service
+from .imagen_cache import ImagenResultCache, imagen_cache
 from .mood_board_log_service import MoodBoardLogService, mood_board_log_service
 from .local_image_service import LocalImageService, local_image_service
+from .hashtag_index import HashtagIndex, hashtag_index
+from .related_design_index import RelatedDesignIndex, related_design_index
+from .design_index_sync import DesignIndexSync, design_index_sync
 
 __all__ = [
     "DesignHistoryService",
     "HashtagService", 
+    "HashtagTranslationService",
+    "hashtag_translation_service",
     "MoodBoardService",
     "mood_board_service",
+    "ImagenResultCache",
+    "imagen_cache",
     "MoodBoardLogService",
     "mood_board_log_service",
     "LocalImageService",
-    "local_image_service"
+    "local_image_service",
+    "HashtagIndex",
+    "hashtag_index",
+    "RelatedDesignIndex",
+    "related_design_index",
+    "DesignIndexSync",
+    "design_index_sync"
 ]
@@ -0,0 +1,140 @@
+"""
+DesignIndexSync - Keeps the hashtag and related design indexes of every worker in step.
+KISS principle: The writing worker updates its own indexes and sends a NOTIFY; the other workers replay the change.
+
+    await design_index_sync.notify(db, "saved", design_id)   # before db.commit()
+
+Events: saved (index the design from the database), published,
+rebuild (reload both indexes, e.g. after reset_database_data.py).
+The NOTIFY is part of the writer's transaction, so it is only delivered if
+the change is committed. Notifications are applied one at a time in arrival
+order; after a lost connection both indexes are rebuilt, since changes may
+have been missed.
+
+Without PostgreSQL (SQLite in tests and the load test) there is no
+notification channel: run a single worker there.
+"""
+import asyncio
+import json
+import uuid
+from typing import Optional
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import logger, settings
+from config.database import async_session_maker
+from models.design_models_db import BlogPost, Design, DesignHashtag
+from utils.pg_listener import PgNotifyListener, notifications_supported
+from .hashtag_index import hashtag_index
+from .related_design_index import related_design_index
+
+# Identifies this worker's own notifications (already applied locally)
+WORKER_ID = uuid.uuid4().hex
+
+
+class DesignIndexSync(PgNotifyListener):
+    """Sends and applies design index changes over DESIGN_INDEX_NOTIFY_CHANNEL."""
+
+    EVENTS = ("saved", "published", "rebuild")
+
+    def __init__(self, channel: str):
+        super().__init__(channel, "Design index sync")
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._applied = 0
+
+    async def notify(self, db: AsyncSession, event: str, design_id: Optional[str] = None):
+        """Queue a notification in the session's transaction (no-op without PostgreSQL)."""
+        if event not in self.EVENTS:
+            raise ValueError(f"Unknown design index event: {event}")
+        if not notifications_supported():
+            return
+        payload = json.dumps({"event": event, "design_id": design_id, "worker": WORKER_ID})
+        await db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": self.channel, "payload": payload})
+
+    async def rebuild(self):
+        """Reload both indexes from the database."""
+        await hashtag_index.rebuild()
+        await related_design_index.rebuild()
+
+    # --- listener side ---
+
+    async def start(self):
+        await super().start()
+        if self._task is not None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._apply_loop())
+
+    async def stop(self):
+        await super().stop()
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    def on_notification(self, payload: str):
+        change = json.loads(payload)
+        if change.get("worker") == WORKER_ID:
+            return
+        self._queue.put_nowait(change)
+
+    async def on_reconnect(self):
+        self._queue.put_nowait({"event": "rebuild"})
+
+    async def _apply_loop(self):
+        while True:
+            change = await self._queue.get()
+            try:
+                await self._apply(change)
+                self._applied += 1
+            except Exception as e:
+                logger.error(f"Could not apply design index change {change}: {str(e)}")
+
+    async def _apply(self, change: dict):
+        event = change.get("event")
+        design_id = change.get("design_id")
+        if event == "rebuild":
+            await self.rebuild()
+        elif event == "saved":
+            await self._index_design(design_id)
+        elif event == "published":
+            hashtag_index.mark_published(design_id)
+        else:
+            logger.warning(f"Unknown design index event: {event}")
+
+    async def _index_design(self, design_id: str):
+        """Index a design saved by another worker (the row is committed before the NOTIFY is delivered)."""
+        async with async_session_maker() as db:
+            design = (await db.execute(
+                select(Design.user_id, Design.products, Design.design_style).where(Design.id == design_id)
+            )).first()
+            if design is None:
+                return
+            hashtags = (await db.execute(
+                select(DesignHashtag.hashtag)
+                .where(DesignHashtag.design_id == design_id)
+                .order_by(DesignHashtag.order_index)
+            )).scalars().all()
+            published = (await db.execute(
+                select(BlogPost.id).where(BlogPost.design_id == design_id, BlogPost.is_published == True).limit(1)
+            )).first() is not None
+
+        hashtag_index.add_design(design_id, hashtags, design.user_id)
+        related_design_index.add_design(design_id, hashtags, design.products, design.design_style)
+        if published:
+            hashtag_index.mark_published(design_id)
+
+    def get_stats(self) -> dict:
+        return {
+            "listening": self._task is not None,
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "applied": self._applied,
+            "hashtag_index_designs": len(hashtag_index),
+            "related_index_designs": len(related_design_index)
+        }
+
+
+# Global design index sync instance
+design_index_sync = DesignIndexSync(settings.DESIGN_INDEX_NOTIFY_CHANNEL)
@@ -0,0 +1,192 @@
+"""
+HashtagIndex - In-memory inverted index for hashtag discovery.
+KISS principle: Load DesignHashtag rows once, answer tag combinations from memory.
+"""
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import select
+from config import logger
+from config.database import async_session_maker
+from models.design_models_db import BlogPost, Design, DesignHashtag
+
+
+def normalize_hashtag(tag: str) -> str:
+    """Normalize a hashtag the way ResponseProcessor stores it ("Modern Salon" -> "#modern_salon")."""
+    tag = tag.strip().lower().replace(' ', '_').replace('-', '_')
+    if tag and not tag.startswith('#'):
+        tag = '#' + tag
+    return tag
+
+
+def _gallop(postings: List[int], target: int, low: int) -> int:
+    """First index >= low whose posting is >= target (exponential probe, then binary search)."""
+    high, step, size = low, 1, len(postings)
+    while high < size and postings[high] < target:
+        low = high + 1
+        high += step
+        step *= 2
+    return bisect_left(postings, target, low, min(high, size))
+
+
+def intersect_postings(lists: List[List[int]]) -> List[int]:
+    """
+    Intersect sorted posting lists.
+
+    Lists are merged smallest first and every element of the (shrinking)
+    result gallops forward in the next list, so the cost follows the
+    shortest list instead of the longest one.
+    """
+    if not lists:
+        return []
+
+    lists = sorted(lists, key=len)
+    result = lists[0]
+    for other in lists[1:]:
+        matched = []
+        position = 0
+        for doc in result:
+            position = _gallop(other, doc, position)
+            if position == len(other):
+                break
+            if other[position] == doc:
+                matched.append(doc)
+                position += 1
+        result = matched
+        if not result:
+            break
+    return list(result)
+
+
+class HashtagIndex:
+    """
+    Hashtag -> design posting lists.
+
+    Designs get a dense document number in creation order, so every posting
+    list is a sorted list of ints and new designs are appended at the end.
+    The published designs and each user's designs are posting lists too, so
+    the discovery scope is just one more list in the intersection.
+
+    Every worker keeps its own index; DesignIndexSync applies the changes
+    made by other workers (see design_index_sync.py).
+    """
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self._design_ids: List[str] = []  # doc -> design id
+        self._docs: Dict[str, int] = {}  # design id -> doc
+        self._doc_tags: List[Tuple[str, ...]] = []  # doc -> hashtags
+        self._postings: Dict[str, List[int]] = {}
+        self._published: List[int] = []
+        self._by_user: Dict[int, List[int]] = {}
+
+    async def rebuild(self):
+        """Rebuild the index from the database (designs in creation order)."""
+        try:
+            async with async_session_maker() as db:
+                designs = (await db.execute(
+                    select(Design.id, Design.user_id).order_by(Design.created_at, Design.id)
+                )).all()
+                hashtags = (await db.execute(
+                    select(DesignHashtag.design_id, DesignHashtag.hashtag).order_by(DesignHashtag.order_index)
+                )).all()
+                published = (await db.execute(
+                    select(BlogPost.design_id).where(BlogPost.is_published == True)
+                )).scalars().all()
+
+            tags_by_design: Dict[str, List[str]] = {}
+            for design_id, hashtag in hashtags:
+                tags_by_design.setdefault(design_id, []).append(hashtag)
+
+            self._reset()
+            for design_id, user_id in designs:
+                self.add_design(design_id, tags_by_design.get(design_id, []), user_id)
+            for design_id in published:
+                self.mark_published(design_id)
+
+            logger.info(f"Hashtag index built: {len(self._design_ids)} designs, "
+                        f"{len(self._postings)} hashtags, {len(self._published)} published")
+        except Exception as e:
+            logger.warning(f"Could not build hashtag index: {str(e)}")
+
+    def add_design(self, design_id: str, hashtags: Iterable[str], user_id: Optional[int] = None):
+        """Index a saved design (hashtags of an already indexed design are merged)."""
+        doc = self._docs.get(design_id)
+        if doc is None:
+            doc = len(self._design_ids)
+            self._docs[design_id] = doc
+            self._design_ids.append(design_id)
+            self._doc_tags.append(())
+            if user_id is not None:
+                self._by_user.setdefault(user_id, []).append(doc)
+
+        tags = list(self._doc_tags[doc])
+        for tag in map(normalize_hashtag, hashtags):
+            if tag and tag not in tags:
+                tags.append(tag)
+                insort(self._postings.setdefault(tag, []), doc)
+        self._doc_tags[doc] = tuple(tags)
+
+    def mark_published(self, design_id: str):
+        """Make an indexed design visible to public discovery."""
+        doc = self._docs.get(design_id)
+        if doc is None:
+            return
+        position = bisect_left(self._published, doc)
+        if position == len(self._published) or self._published[position] != doc:
+            self._published.insert(position, doc)
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def search(
+        self,
+        tags: Iterable[str],
+        user_id: Optional[int] = None,
+        offset: int = 0,
+        limit: int = 20,
+        facet_limit: int = 20
+    ) -> Dict:
+        """
+        Find designs carrying all given hashtags, newest first.
+
+        Args:
+            tags: Required hashtags (with or without '#')
+            user_id: Search this user's designs instead of the published ones
+            offset, limit: Page of design ids to return
+            facet_limit: Number of co-occurring hashtags to count
+
+        Returns:
+            Dict: tags, total, design_ids (page) and facets [{"tag", "count"}]
+        """
+        query_tags = list(dict.fromkeys(tag for tag in map(normalize_hashtag, tags) if tag))
+        scope = self._published if user_id is None else self._by_user.get(user_id, [])
+
+        if any(tag not in self._postings for tag in query_tags):
+            matches = []
+        else:
+            matches = intersect_postings([scope] + [self._postings[tag] for tag in query_tags])
+
+        # Facets: hashtags of the matching designs, excluding the ones already selected
+        facet_counts = Counter()
+        for doc in matches:
+            facet_counts.update(self._doc_tags[doc])
+        for tag in query_tags:
+            facet_counts.pop(tag, None)
+
+        # Docs are numbered in creation order: newest first is reverse doc order
+        end = max(len(matches) - offset, 0)
+        page = matches[max(end - limit, 0):end][::-1]
+
+        return {
+            "tags": query_tags,
+            "total": len(matches),
+            "design_ids": [self._design_ids[doc] for doc in page],
+            "facets": [{"tag": tag, "count": count} for tag, count in facet_counts.most_common(facet_limit)]
+        }
+
+
+# Global hashtag index instance
+hashtag_index = HashtagIndex()
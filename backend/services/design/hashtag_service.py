@@ -2,7 +2,10 @@
 Hashtag translation and management service.
 """
 from typing import List, Dict, Any
+from sqlalchemy import select, literal, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from config import logger
+from .hashtag_translation_service import HASHTAG_TRANSLATIONS, hashtag_translation_service
 
 class HashtagService:
     """
@@ -10,161 +13,20 @@ class HashtagService:
     Handles English-to-Turkish hashtag mapping for better user experience.
     """
     
-    # English to Turkish hashtag mapping
-    HASHTAG_TRANSLATIONS = {
-        # General Categories
-        "#interior_design": "#ic_tasarim",
-        "#home_decor": "#ev_dekorasyonu", 
-        "#room_design": "#oda_tasarimi",
-        
-        # Styles
-        "#modern": "#modern",
-        "#contemporary": "#cagdas",
-        "#classic": "#klasik",
-        "#traditional": "#geleneksel",
-        "#minimalist": "#minimalist",
-        "#industrial": "#endustriyel",
-        "#scandinavian": "#iskandinavya",
-        "#rustic": "#rustik",
-        "#vintage": "#vintage",
-        "#bohemian": "#bohem",
-        "#art_deco": "#art_deco",
-        "#mediterranean": "#akdeniz",
-        "#nordic": "#kuzey",
-        
-        # Room Types
-        "#living_room": "#oturma_odasi",
-        "#bedroom": "#yatak_odasi",
-        "#kitchen": "#mutfak",
-        "#bathroom": "#banyo",
-        "#dining_room": "#yemek_odasi",
-        "#office": "#ofis",
-        "#study_room": "#calisma_odasi",
-        "#guest_room": "#misafir_odasi",
-        "#kids_room": "#cocuk_odasi",
-        "#master_bedroom": "#ana_yatak_odasi",
-        
-        # Colors
-        "#neutral_tones": "#notr_tonlar",
-        "#warm_colors": "#sicak_renkler",
-        "#cool_colors": "#soguk_renkler",
-        "#monochrome": "#tek_renk",
-        "#colorful": "#renkli",
-        "#pastel": "#pastel",
-        "#earth_tones": "#toprak_tonlari",
-        "#bold_colors": "#cesur_renkler",
-        
-        # Atmosphere
-        "#cozy": "#rahat",
-        "#elegant": "#sik",
-        "#luxurious": "#luks",
-        "#comfortable": "#konforlu",
-        "#relaxing": "#rahatlatici",
-        "#energetic": "#enerjik",
-        "#peaceful": "#huzurlu",
-        "#dramatic": "#dramatik",
-        "#romantic": "#romantik",
-        "#sophisticated": "#sofistike",
-        
-        # Space Characteristics
-        "#spacious": "#ferah",
-        "#compact": "#kompakt",
-        "#open_plan": "#acik_plan",
-        "#bright": "#aydinlik",
-        "#dark": "#karanlik",
-        "#airy": "#havadar",
-        "#intimate": "#samimi",
-        
-        # Lighting
-        "#natural_light": "#dogal_isik",
-        "#ambient_lighting": "#ortam_aydinlatmasi",
-        "#task_lighting": "#gorev_aydinlatmasi",
-        "#accent_lighting": "#vurgu_aydinlatmasi",
-        "#soft_lighting": "#yumusak_isik",
-        
-        # Materials
-        "#wood": "#ahsap",
-        "#metal": "#metal",
-        "#glass": "#cam",
-        "#stone": "#tas",
-        "#fabric": "#kumas",
-        "#leather": "#deri",
-        "#marble": "#mermer",
-        "#concrete": "#beton",
-        "#ceramic": "#seramik",
-        "#velvet": "#kadife",
-        
-        # Furniture Types
-        "#furniture": "#mobilya",
-        "#seating": "#oturma",
-        "#storage": "#depolama",
-        "#tables": "#masalar",
-        "#lighting": "#aydinlatma",
-        "#textiles": "#tekstil",
-        "#accessories": "#aksesuarlar",
-        
-        # Features
-        "#functional": "#fonksiyonel",
-        "#decorative": "#dekoratif",
-        "#artistic": "#sanatsal",
-        "#ergonomic": "#ergonomik",
-        "#sustainable": "#surdurulebilir",
-        "#smart_home": "#akilli_ev",
-        "#eco_friendly": "#cevre_dostu",
-        
-        # Specific Design Elements
-        "#geometric": "#geometrik",
-        "#floral": "#cicekli",
-        "#striped": "#cizgili",
-        "#textured": "#dokulu",
-        "#glossy": "#parlak",
-        "#matte": "#mat",
-        "#patterned": "#desenli",
-        "#solid": "#duz"
-    }
+    # Column limits: design_hashtags.hashtag / hashtags.name
+    DESIGN_HASHTAG_MAX_LENGTH = 100
+    HASHTAG_NAME_MAX_LENGTH = 50
+    
+    # English to Turkish hashtag mapping (shared with the translation service)
+    HASHTAG_TRANSLATIONS = HASHTAG_TRANSLATIONS
     
     def __init__(self):
         """Initialize hashtag service."""
         pass
     
     def translate_hashtags(self, english_hashtags: List[str]) -> Dict[str, Any]:
-        """
-        Translate English hashtags to Turkish.
-        
-        Args:
-            english_hashtags: List of English hashtags
-            
-        Returns:
-            Dict containing both English and Turkish hashtags
-        """
-        turkish_hashtags = []
-        unknown_hashtags = []
-        
-        for hashtag in english_hashtags:
-            # Ensure hashtag starts with #
-            if not hashtag.startswith('#'):
-                hashtag = '#' + hashtag
-            
-            # Get Turkish translation, fallback to original if not found
-            if hashtag in self.HASHTAG_TRANSLATIONS:
-                turkish_version = self.HASHTAG_TRANSLATIONS[hashtag]
-            else:
-                turkish_version = hashtag  # Keep English as fallback
-                unknown_hashtags.append(hashtag)
-            
-            turkish_hashtags.append(turkish_version)
-        
-        # Log unknown hashtags for future mapping (only in debug mode)
-        if unknown_hashtags:
-            logger.debug(f"Unknown hashtags found (kept as English): {unknown_hashtags}")
-            logger.debug(f"Consider adding these to HASHTAG_TRANSLATIONS mapping")
-        
-        return {
-            "en": english_hashtags,
-            "tr": turkish_hashtags,
-            "display": turkish_hashtags,  # Default display language is Turkish (with English fallbacks)
-            "unknown": unknown_hashtags  # For analytics/tracking
-        }
+        """Translate English hashtags to Turkish (see HashtagTranslationService)."""
+        return hashtag_translation_service.translate_hashtags(english_hashtags)
     
     def get_all_hashtag_mappings(self) -> Dict[str, str]:
         """
@@ -183,12 +45,7 @@ class HashtagService:
             english: English hashtag
             turkish: Turkish hashtag
         """
-        if not english.startswith('#'):
-            english = '#' + english
-        if not turkish.startswith('#'):
-            turkish = '#' + turkish
-        
-        self.HASHTAG_TRANSLATIONS[english] = turkish
+        hashtag_translation_service.add_mapping(english, turkish)
     
     def search_hashtags(self, query: str, language: str = "both") -> List[str]:
         """
@@ -215,46 +72,59 @@ class HashtagService:
         
         return list(set(matches))  # Remove duplicates
     
-    async def save_hashtags_to_db(self, db, design_id: str, english_hashtags: list, turkish_hashtags: list) -> None:
+    async def save_hashtags_to_db(self, db, design_id: str, english_hashtags: list, turkish_hashtags: list) -> int:
         """
-        Save hashtags to database for a design.
-        Uses the new simplified hashtag system where hashtags are stored directly as strings.
+        Save hashtags for a design and bump their usage counters in one statement.
+        
+        A single round-trip: a multi-row INSERT ... ON CONFLICT DO NOTHING into
+        design_hashtags whose RETURNING rows feed the hashtags.usage_count upsert,
+        so re-saving the same design never counts a hashtag twice.
+        Runs in the caller's transaction; the caller commits.
         
         Args:
             db: Database session
             design_id: Design ID
             english_hashtags: List of English hashtags
             turkish_hashtags: List of Turkish hashtags
-        """
-        try:
-            from models.design_models_db import DesignHashtag
-            
-            # Save both English and Turkish hashtags with order_index
-            all_hashtags = []
-            
-            # Add English hashtags
-            for i, en_tag in enumerate(english_hashtags):
-                if en_tag.strip():  # Skip empty hashtags
-                    all_hashtags.append((en_tag, i))
-            
-            # Add Turkish hashtags (with offset to preserve order)
-            for i, tr_tag in enumerate(turkish_hashtags):
-                if tr_tag.strip() and tr_tag not in [h[0] for h in all_hashtags]:  # Skip duplicates
-                    all_hashtags.append((tr_tag, len(english_hashtags) + i))
             
-            # Save hashtags to database
-            for hashtag_text, order_index in all_hashtags:
-                design_hashtag = DesignHashtag(
-                    design_id=design_id,
-                    hashtag=hashtag_text,
-                    order_index=order_index
-                )
-                db.add(design_hashtag)
-            
-            await db.commit()
-            logger.info(f"Saved {len(all_hashtags)} hashtags for design {design_id}")
-            
-        except Exception as e:
-            await db.rollback()
-            logger.error(f"Error saving hashtags for design {design_id}: {str(e)}")
-            raise e
+        Returns:
+            Number of hashtags sent for the design
+        """
+        from models.design_models_db import DesignHashtag, Hashtag
+        
+        # English first, then Turkish (with offset to preserve order); skip empties and duplicates
+        order_by_tag = {}
+        for offset, tags in ((0, english_hashtags), (len(english_hashtags), turkish_hashtags)):
+            for i, tag in enumerate(tags):
+                tag = tag.strip()
+                if tag and tag not in order_by_tag and len(tag) <= self.DESIGN_HASHTAG_MAX_LENGTH:
+                    order_by_tag[tag] = offset + i
+        
+        if not order_by_tag:
+            return 0
+        
+        new_links = (
+            pg_insert(DesignHashtag)
+            .values([
+                {"design_id": design_id, "hashtag": tag, "order_index": order_index}
+                for tag, order_index in order_by_tag.items()
+            ])
+            .on_conflict_do_nothing(index_elements=["design_id", "hashtag"])
+            .returning(DesignHashtag.hashtag)
+            .cte("new_links")
+        )
+        
+        usage = pg_insert(Hashtag).from_select(
+            ["name", "usage_count"],
+            select(new_links.c.hashtag, literal(1)).where(
+                func.char_length(new_links.c.hashtag) <= self.HASHTAG_NAME_MAX_LENGTH
+            )
+        )
+        usage = usage.on_conflict_do_update(
+            index_elements=["name"],
+            set_={"usage_count": Hashtag.usage_count + usage.excluded.usage_count, "updated_at": func.now()}
+        )
+        
+        await db.execute(usage)
+        logger.info(f"Saved {len(order_by_tag)} hashtags for design {design_id}")
+        return len(order_by_tag)
@@ -0,0 +1,191 @@
+"""
+HashtagTranslationService - English to Turkish hashtag translation.
+KISS principle: One process-wide lookup table, compiled once; translation is a dict lookup per tag.
+"""
+from typing import Dict, List, Tuple, Any
+from config import logger
+
+# English to Turkish hashtag mapping
+HASHTAG_TRANSLATIONS = {
+    # General Categories
+    "#interior_design": "#ic_tasarim",
+    "#home_decor": "#ev_dekorasyonu", 
+    "#room_design": "#oda_tasarimi",
+
+    # Styles
+    "#modern": "#modern",
+    "#contemporary": "#cagdas",
+    "#classic": "#klasik",
+    "#traditional": "#geleneksel",
+    "#minimalist": "#minimalist",
+    "#industrial": "#endustriyel",
+    "#scandinavian": "#iskandinavya",
+    "#rustic": "#rustik",
+    "#vintage": "#vintage",
+    "#bohemian": "#bohem",
+    "#art_deco": "#art_deco",
+    "#mediterranean": "#akdeniz",
+    "#nordic": "#kuzey",
+
+    # Room Types
+    "#living_room": "#oturma_odasi",
+    "#bedroom": "#yatak_odasi",
+    "#kitchen": "#mutfak",
+    "#bathroom": "#banyo",
+    "#dining_room": "#yemek_odasi",
+    "#office": "#ofis",
+    "#study_room": "#calisma_odasi",
+    "#guest_room": "#misafir_odasi",
+    "#kids_room": "#cocuk_odasi",
+    "#master_bedroom": "#ana_yatak_odasi",
+
+    # Colors
+    "#neutral_tones": "#notr_tonlar",
+    "#warm_colors": "#sicak_renkler",
+    "#cool_colors": "#soguk_renkler",
+    "#monochrome": "#tek_renk",
+    "#colorful": "#renkli",
+    "#pastel": "#pastel",
+    "#earth_tones": "#toprak_tonlari",
+    "#bold_colors": "#cesur_renkler",
+
+    # Atmosphere
+    "#cozy": "#rahat",
+    "#elegant": "#sik",
+    "#luxurious": "#luks",
+    "#comfortable": "#konforlu",
+    "#relaxing": "#rahatlatici",
+    "#energetic": "#enerjik",
+    "#peaceful": "#huzurlu",
+    "#dramatic": "#dramatik",
+    "#romantic": "#romantik",
+    "#sophisticated": "#sofistike",
+
+    # Space Characteristics
+    "#spacious": "#ferah",
+    "#compact": "#kompakt",
+    "#open_plan": "#acik_plan",
+    "#bright": "#aydinlik",
+    "#dark": "#karanlik",
+    "#airy": "#havadar",
+    "#intimate": "#samimi",
+
+    # Lighting
+    "#natural_light": "#dogal_isik",
+    "#ambient_lighting": "#ortam_aydinlatmasi",
+    "#task_lighting": "#gorev_aydinlatmasi",
+    "#accent_lighting": "#vurgu_aydinlatmasi",
+    "#soft_lighting": "#yumusak_isik",
+
+    # Materials
+    "#wood": "#ahsap",
+    "#metal": "#metal",
+    "#glass": "#cam",
+    "#stone": "#tas",
+    "#fabric": "#kumas",
+    "#leather": "#deri",
+    "#marble": "#mermer",
+    "#concrete": "#beton",
+    "#ceramic": "#seramik",
+    "#velvet": "#kadife",
+
+    # Furniture Types
+    "#furniture": "#mobilya",
+    "#seating": "#oturma",
+    "#storage": "#depolama",
+    "#tables": "#masalar",
+    "#lighting": "#aydinlatma",
+    "#textiles": "#tekstil",
+    "#accessories": "#aksesuarlar",
+
+    # Features
+    "#functional": "#fonksiyonel",
+    "#decorative": "#dekoratif",
+    "#artistic": "#sanatsal",
+    "#ergonomic": "#ergonomik",
+    "#sustainable": "#surdurulebilir",
+    "#smart_home": "#akilli_ev",
+    "#eco_friendly": "#cevre_dostu",
+
+    # Specific Design Elements
+    "#geometric": "#geometrik",
+    "#floral": "#cicekli",
+    "#striped": "#cizgili",
+    "#textured": "#dokulu",
+    "#glossy": "#parlak",
+    "#matte": "#mat",
+    "#patterned": "#desenli",
+    "#solid": "#duz"
+}
+
+
+class HashtagTranslationService:
+    """
+    Translates design hashtags for display.
+    
+    The lookup table is compiled once per process and accepts tags with or
+    without the leading '#', so known tags cost a single dict lookup.
+    """
+    
+    def __init__(self, translations: Dict[str, str] = HASHTAG_TRANSLATIONS):
+        self.translations = translations
+        self._lookup: Dict[str, str] = {}
+        self._compile()
+    
+    def _compile(self):
+        lookup = {}
+        for english, turkish in self.translations.items():
+            lookup[english] = turkish
+            lookup[english.lstrip('#')] = turkish
+        self._lookup = lookup
+    
+    def translate(self, hashtag: str) -> Tuple[str, bool]:
+        """Turkish version of one hashtag and whether it was known (unknown tags are kept as is)."""
+        turkish = self._lookup.get(hashtag)
+        if turkish is not None:
+            return turkish, True
+        return (hashtag if hashtag.startswith('#') else '#' + hashtag), False
+    
+    def translate_hashtags(self, english_hashtags: List[str]) -> Dict[str, Any]:
+        """
+        Translate English hashtags to Turkish.
+        
+        Args:
+            english_hashtags: List of English hashtags
+            
+        Returns:
+            Dict containing both English and Turkish hashtags
+        """
+        turkish_hashtags = []
+        unknown_hashtags = []
+        
+        for hashtag in english_hashtags:
+            turkish_version, known = self.translate(hashtag)
+            if not known:
+                unknown_hashtags.append(turkish_version)  # Keep English as fallback
+            turkish_hashtags.append(turkish_version)
+        
+        # Log unknown hashtags for future mapping (only in debug mode)
+        if unknown_hashtags:
+            logger.debug(f"Unknown hashtags found (kept as English): {unknown_hashtags}")
+        
+        return {
+            "en": english_hashtags,
+            "tr": turkish_hashtags,
+            "display": turkish_hashtags,  # Default display language is Turkish (with English fallbacks)
+            "unknown": unknown_hashtags  # For analytics/tracking
+        }
+    
+    def add_mapping(self, english: str, turkish: str) -> None:
+        """Add a mapping and recompile the lookup table."""
+        if not english.startswith('#'):
+            english = '#' + english
+        if not turkish.startswith('#'):
+            turkish = '#' + turkish
+        
+        self.translations[english] = turkish
+        self._compile()
+
+
+# Global hashtag translation service instance
+hashtag_translation_service = HashtagTranslationService()
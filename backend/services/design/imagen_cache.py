@@ -0,0 +1,268 @@
+"""
+ImagenResultCache - Generated room images on disk, keyed by everything that determines the Imagen request.
+KISS principle: One PNG (+ small JSON sidecar) per key; least recently used entries are deleted once the total size exceeds the limit.
+
+    key = imagen_cache.key(prompt, reference_images, params)
+    image_data = await imagen_cache.get(key)
+    ...
+    await imagen_cache.put(key, image_data)
+
+The key hashes the whitespace-normalized prompt, the digests of the
+reference images (order does not matter) and the generation parameters,
+so hybrid boards with the same final prompt and the same catalog picks
+reuse one paid generation. Fallback placeholders are never stored.
+
+Every worker shares the directory: a lookup reads the file directly, so
+an image stored by another worker is a hit, and eviction scans the
+directory under an exclusive lock file, so the size limit holds for the
+directory as a whole rather than per process. File modification times
+serve as recency (touched on every hit) and survive restarts.
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: eviction runs without the cross-process lock
+    fcntl = None
+
+from config import logger, settings
+from utils.metrics import metrics
+
+CACHE_REQUESTS = metrics.counter("imagen_cache_requests_total", "Imagen result cache lookups", ["mode", "outcome"])
+CACHE_EVICTIONS = metrics.counter("imagen_cache_evictions_total", "Imagen results evicted to stay under the size limit")
+
+_WHITESPACE = re.compile(r"\s+")
+LOCK_FILE = ".lock"
+
+
+class ImagenResultCache:
+    """Size-bounded LRU of Imagen results in a directory shared by all workers (file I/O runs in worker threads)."""
+
+    def __init__(self, directory: str, max_bytes: int, enabled: bool = True):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.enabled = enabled and max_bytes > 0
+        self._lock = threading.Lock()  # Counters
+        self._directory_mutex = threading.Lock()  # Threads of this worker; the lock file covers the others
+        self._loaded = False
+
+        # Directory totals as of the last scan (load or store)
+        self._entries = 0
+        self._total_bytes = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+
+    # --- keys ---
+
+    @staticmethod
+    def normalize_prompt(prompt: str) -> str:
+        return _WHITESPACE.sub(" ", prompt or "").strip()
+
+    @staticmethod
+    def image_digest(base64_image: str) -> str:
+        return hashlib.sha256(base64_image.encode("ascii")).hexdigest()
+
+    def key(self, prompt: str, reference_images: Iterable[str], params: Dict[str, Any]) -> str:
+        """Cache key for one Imagen request."""
+        payload = {
+            "prompt": self.normalize_prompt(prompt),
+            "references": sorted(self.image_digest(image) for image in reference_images),
+            "params": params
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    # --- directory ---
+
+    def _paths(self, key: str):
+        return os.path.join(self.directory, f"{key}.png"), os.path.join(self.directory, f"{key}.json")
+
+    @contextmanager
+    def _directory_lock(self):
+        """Exclusive lock shared by every worker using the directory."""
+        os.makedirs(self.directory, exist_ok=True)
+        with self._directory_mutex, open(os.path.join(self.directory, LOCK_FILE), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _scan(self):
+        """(mtime, key, bytes) for every cached image, oldest first."""
+        found = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".png"):
+                    continue
+                key = entry.name[:-4]
+                try:
+                    stat = entry.stat()
+                    meta_path = self._paths(key)[1]
+                    size = stat.st_size + (os.path.getsize(meta_path) if os.path.exists(meta_path) else 0)
+                except OSError:
+                    continue  # Evicted by another worker meanwhile
+                found.append((stat.st_mtime, key, size))
+        found.sort()
+        return found
+
+    def _remove(self, key: str):
+        for path in self._paths(key):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not delete cached image {path}: {str(e)}")
+
+    def _evict(self):
+        """Delete the least recently used images until the directory fits (call with the directory lock held)."""
+        found = self._scan()
+        total = sum(size for _, _, size in found)
+        evicted = 0
+        for _, key, size in found:
+            if total <= self.max_bytes:
+                break
+            self._remove(key)
+            total -= size
+            evicted += 1
+        self._entries = len(found) - evicted
+        self._total_bytes = total
+        if evicted:
+            self._evictions += evicted
+            CACHE_EVICTIONS.inc(evicted)
+
+    def _load(self):
+        """Apply the size limit to what is already on disk and record the totals (once per worker)."""
+        if self._loaded:
+            return
+        self._loaded = True
+        with self._directory_lock():
+            self._evict()
+        if self._entries:
+            logger.info(f"Imagen cache loaded: {self._entries} images, {self._total_bytes / 1048576:.1f} MB")
+
+    # --- blocking operations ---
+
+    def get_sync(self, key: str) -> Optional[Dict[str, Any]]:
+        self._load()
+        image_path, meta_path = self._paths(key)
+        try:
+            with open(image_path, "rb") as f:
+                image_bytes = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Could not read cached image {key[:12]}: {str(e)}")
+            return None
+        try:
+            meta = {}
+            if os.path.exists(meta_path):
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+            os.utime(image_path)  # Recency for every worker's eviction
+        except FileNotFoundError:
+            pass  # Evicted right after the read; the bytes are still good
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable cached image {key[:12]}: {str(e)}")
+            with self._directory_lock():
+                self._remove(key)
+            return None
+        return {**meta, "base64": base64.b64encode(image_bytes).decode("utf-8"), "success": True, "cached": True}
+
+    def put_sync(self, key: str, image_data: Dict[str, Any]):
+        image_bytes = base64.b64decode(image_data["base64"])
+        meta = {name: value for name, value in image_data.items() if name not in ("base64", "success", "cached")}
+        meta_bytes = json.dumps(meta).encode("utf-8")
+        if len(image_bytes) + len(meta_bytes) > self.max_bytes:
+            return
+        with self._directory_lock():
+            image_path, meta_path = self._paths(key)
+            temp_path = f"{image_path}.{os.getpid()}.tmp"
+            try:
+                with open(meta_path, "wb") as f:
+                    f.write(meta_bytes)
+                with open(temp_path, "wb") as f:
+                    f.write(image_bytes)
+                os.replace(temp_path, image_path)  # A reader never sees a partial PNG
+            except OSError as e:
+                logger.warning(f"Could not store image in the Imagen cache: {str(e)}")
+                return
+            self._loaded = True
+            self._stores += 1
+            self._evict()
+
+    # --- public API ---
+
+    async def get(self, key: str, mode: str = "text") -> Optional[Dict[str, Any]]:
+        """Cached result for ``key`` (marked ``cached``), or None."""
+        if not self.enabled:
+            return None
+        try:
+            image_data = await asyncio.to_thread(self.get_sync, key)
+        except Exception as e:
+            logger.warning(f"Imagen cache lookup failed: {str(e)}")
+            image_data = None
+        with self._lock:
+            if image_data is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        CACHE_REQUESTS.labels(mode, "miss" if image_data is None else "hit").inc()
+        return image_data
+
+    async def put(self, key: str, image_data: Optional[Dict[str, Any]]):
+        """Store a generated result; fallback placeholders and empty results are skipped."""
+        if not self.enabled or not image_data or not image_data.get("base64") or image_data.get("fallback"):
+            return
+        try:
+            await asyncio.to_thread(self.put_sync, key, image_data)
+        except Exception as e:
+            logger.warning(f"Imagen cache store failed: {str(e)}")
+
+    def clear(self):
+        with self._directory_lock():
+            for _, key, _ in self._scan():
+                self._remove(key)
+            self._entries = 0
+            self._total_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit and store counts are per worker; entries and bytes describe the shared directory at the last scan."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "directory": self.directory,
+                "entries": self._entries,
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "stores": self._stores,
+                "evictions": self._evictions
+            }
+
+
+# Global Imagen result cache
+imagen_cache = ImagenResultCache(
+    settings.IMAGEN_CACHE_DIR,
+    max_bytes=settings.IMAGEN_CACHE_MAX_MB * 1024 * 1024,
+    enabled=settings.IMAGEN_CACHE_ENABLED
+)
+
+metrics.gauge_callback("imagen_cache_bytes", "Bytes of Imagen results on disk", lambda: imagen_cache.get_stats()["bytes"])
+metrics.gauge_callback("imagen_cache_entries", "Imagen results on disk", lambda: imagen_cache.get_stats()["entries"])
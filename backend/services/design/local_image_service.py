@@ -6,6 +6,7 @@ Optimizes and converts them for AI model consumption.
 """
 
 import os
+import json
 import base64
 from typing import List, Dict, Optional, Any
 from config import logger
@@ -22,11 +23,19 @@ class LocalImageService:
     - Image optimization for AI model requirements
     - Error handling and fallbacks
     - Support for IKEA product naming conventions
+    - Pre-sized AI derivatives from data/products/manifest.json (build_image_derivatives.py)
     """
     
+    # Derivative already sized/encoded for the AI model (see build_image_derivatives.py)
+    AI_DERIVATIVE = "size1024"
+    
     def __init__(self):
         # Base path for product images
-        self.products_base_path = os.path.join("data", "products", "size2000")
+        self.products_root = os.path.join("data", "products")
+        self.products_base_path = os.path.join(self.products_root, "size2000")
+        self.manifest_path = os.path.join(self.products_root, "manifest.json")
+        self._manifest_images: Dict[str, Any] = {}
+        self._manifest_mtime: Optional[float] = None
         self.image_utils = ImageUtils()
         
         # Supported image formats
@@ -144,6 +153,44 @@ class LocalImageService:
             logger.error(f"Error finding image path for product {product}: {str(e)}")
             return None
     
+    def _get_ai_derivative_path(self, image_path: str) -> Optional[str]:
+        """
+        Path of the pre-built AI derivative of a size2000 image, if the manifest lists it
+        and both the source (mtime_ns, bytes) and the derivative on disk still match. The manifest is reloaded when it changes.
+        """
+        try:
+            mtime = os.path.getmtime(self.manifest_path)
+        except OSError:
+            return None
+        
+        if mtime != self._manifest_mtime:
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    self._manifest_images = json.load(f).get("images", {})
+                self._manifest_mtime = mtime
+                logger.info(f"Product image manifest loaded: {len(self._manifest_images)} images")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read product image manifest: {str(e)}")
+                return None
+        
+        key = os.path.relpath(image_path, self.products_base_path).replace(os.sep, '/')
+        entry = self._manifest_images.get(key, {})
+        derivative = entry.get("derivatives", {}).get(self.AI_DERIVATIVE)
+        if not derivative:
+            return None
+        
+        derivative_path = os.path.join(self.products_root, *derivative["path"].split('/'))
+        try:
+            # A source replaced since the last build would otherwise get the old picture
+            source = os.stat(image_path)
+            if source.st_mtime_ns != entry.get("mtime_ns") or source.st_size != entry.get("bytes"):
+                return None
+            if os.path.getsize(derivative_path) != derivative["bytes"]:
+                return None
+        except OSError:
+            return None
+        return derivative_path
+    
     async def load_product_image(self, product: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Load and process a single product image from local filesystem.
@@ -169,6 +216,11 @@ class LocalImageService:
             if not image_path:
                 return None
             
+            # Prefer the pre-built AI derivative: no decode/resize/re-encode per request
+            derivative_path = self._get_ai_derivative_path(image_path)
+            if derivative_path:
+                image_path = derivative_path
+            
             # Check if file exists and is readable
             if not os.path.exists(image_path):
                 logger.warning(f"Image file not found: {image_path}")
@@ -182,16 +234,20 @@ class LocalImageService:
                 logger.warning(f"Empty image file: {image_path}")
                 return None
             
-            # Optimize image for AI model
-            try:
-                optimized_base64 = self.image_utils.prepare_for_ai_model(
-                    base64.b64encode(image_bytes).decode('utf-8')
-                )
-                optimized = True
-            except Exception as e:
-                logger.warning(f"Image optimization failed for {image_path}: {str(e)}, using original")
+            if derivative_path:
                 optimized_base64 = base64.b64encode(image_bytes).decode('utf-8')
-                optimized = False
+                optimized = True
+            else:
+                # Optimize image for AI model
+                try:
+                    optimized_base64 = self.image_utils.prepare_for_ai_model(
+                        base64.b64encode(image_bytes).decode('utf-8')
+                    )
+                    optimized = True
+                except Exception as e:
+                    logger.warning(f"Image optimization failed for {image_path}: {str(e)}, using original")
+                    optimized_base64 = base64.b64encode(image_bytes).decode('utf-8')
+                    optimized = False
             
             product_name = (
                 product.get('name') or 
@@ -1,16 +1,20 @@
-import google.generativeai as genai
-from google.cloud import aiplatform
 from config.settings import Settings
 from config import logger
 from config.prompts import GeminiPrompts, PromptUtils
 from config.database import get_async_session
 from models.design_models_db import MoodBoard, Design
 from services.communication.websocket_manager import websocket_manager
+from services.communication.progress_aggregator import generation_time_estimator
 from services.ai.notes_parser import NotesParser
+from services.ai.rate_limits import gemini_limiter, imagen_limiter
+from services.ai.resilience import prompt_resilience, image_resilience
 from services.design.mood_board_log_service import mood_board_log_service
 from services.design.imagen_prompt_log_service import ImagenPromptLogService
+from services.design.imagen_cache import imagen_cache
 from services.design.local_image_service import local_image_service
 from utils.image_utils import ImageUtils
+from utils.timing import span, timed_job
+from utils.metrics import metrics, track_in_progress
 from typing import Dict, Any, Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
@@ -21,25 +25,32 @@ import uuid
 import os
 import re
 import time
+import functools
 from datetime import datetime
 
+IMAGEN_LATENCY = metrics.histogram("imagen_request_duration_seconds", "Vertex Imagen generate_images latency", ["mode", "outcome"])
+MOOD_BOARD_JOBS_IN_PROGRESS = metrics.gauge("mood_board_jobs_in_progress", "Room visualization background jobs running in this worker")
+MOOD_BOARD_DURATION = metrics.histogram("mood_board_duration_seconds", "Room visualization job duration", ["image"])
+MOOD_BOARD_FAILURES = metrics.counter("mood_board_failures_total", "Room visualization jobs that ended with an error")
+
+# Imagen request parameters (part of the result cache key)
+IMAGEN_MODEL = "imagegeneration@006"
+TEXT_GENERATION_PARAMS = {
+    "number_of_images": 1,
+    "aspect_ratio": "1:1",  # Square format for room visualizations
+    "safety_filter_level": "block_some",
+    "person_generation": "dont_allow"  # Skip person generation for faster results
+}
+MULTIMODAL_GENERATION_PARAMS = {**TEXT_GENERATION_PARAMS, "guidance_scale": 18}
+
 class MoodBoardService:
     """Room visualization service using Imagen 4 with real-time progress tracking."""
     
     def __init__(self):
         self.settings = Settings()
         
-        # Initialize Google Cloud AI Platform for Imagen
-        aiplatform.init(
-            project=self.settings.GOOGLE_CLOUD_PROJECT_ID,
-            location="us-central1"
-        )
-        
-        # Configure Gemini API for prompt enhancement
-        genai.configure(api_key=self.settings.GEMINI_API_KEY)
-        self.gemini_model = genai.GenerativeModel(
-            model_name=self.settings.GENERATIVE_MODEL_NAME
-        )
+        # Vertex AI is initialized by the generation calls themselves and the
+        # Gemini prompt model is built on first use (see gemini_model)
         
         # Initialize NotesParser for notes parsing
         self.notes_parser = NotesParser()
@@ -53,6 +64,15 @@ class MoodBoardService:
         
         logger.info("Room Visualization Service initialized with Imagen 4 - Enhanced 19+ step progress tracking enabled")
     
+    @functools.cached_property
+    def gemini_model(self):
+        """Gemini model for prompt enhancement (the SDK is imported on first use)."""
+        import google.generativeai as genai
+        genai.configure(api_key=self.settings.GEMINI_API_KEY)
+        return genai.GenerativeModel(
+            model_name=self.settings.GENERATIVE_MODEL_NAME
+        )
+    
     async def generate_mood_board(
         self, 
         connection_id: str,
@@ -73,6 +93,7 @@ class MoodBoardService:
         """Generate room visualization with real-time progress tracking and WebSocket updates."""
         
         mood_board_id = str(uuid.uuid4())
+        started_at = time.monotonic()
         
         try:
             # Stage 1: Preparing room visualization prompt (0-15%)
@@ -84,7 +105,6 @@ class MoodBoardService:
             })
             
             # Parse notes to extract structured information
-            await asyncio.sleep(0.5)  # Small delay for realistic progress
             await websocket_manager.update_mood_board_progress(connection_id, {
                 "stage": "preparing_prompt",
                 "progress_percentage": 10,
@@ -137,7 +157,7 @@ class MoodBoardService:
             })
             
             # Create enhanced prompt for Imagen
-            enhanced_prompt = self._create_imagen_prompt(
+            enhanced_prompt = await self._create_imagen_prompt(
                 room_type, design_style, notes, design_title, design_description, 
                 products, parsed_info, color_info, dimensions_info
             )
@@ -273,7 +293,8 @@ class MoodBoardService:
                     user_id=user_id,
                     design_id=design_id,
                     image_file_path=image_file_path,
-                    prompt_used=enhanced_prompt
+                    prompt_used=enhanced_prompt,
+                    generation_time_seconds=self._record_generation_time(started_at, image_data)
                 )
                 logger.info(f"Mood board saved to database: {mood_board_id}")
             except Exception as db_error:
@@ -287,7 +308,8 @@ class MoodBoardService:
             logger.error(f"Error generating room visualization: {str(e)}")
             await websocket_manager.send_mood_board_error(
                 connection_id, 
-                f"Oda görseli oluşturulurken hata oluştu: {str(e)}"
+                f"Oda görseli oluşturulurken hata oluştu: {str(e)}",
+                mood_board_id
             )
             
             # Save error log
@@ -316,7 +338,7 @@ class MoodBoardService:
                 mood_board_id, room_type, design_style, str(e)
             )
     
-    def _create_imagen_prompt(
+    async def _create_imagen_prompt(
         self, 
         room_type: str, 
         design_style: str, 
@@ -367,7 +389,7 @@ class MoodBoardService:
         )
         
         try:
-            response = self.gemini_model.generate_content(prompt_enhancement_request)
+            response = await self._generate_prompt_enhancement(prompt_enhancement_request)
             enhanced_prompt = response.text.strip()
             
             # Gemini'den ne gelirse onu kullan - hiç kontrol etme!
@@ -394,35 +416,72 @@ class MoodBoardService:
             # FALLBACK KALDIRILDI - Hatayı görmek için exception'ı raise et
             raise Exception(f"Gemini prompt generation failed: {str(e)}")
     
-    async def _simulate_image_generation_progress(self, connection_id: str, mood_board_id: str):
-        """Background progress simulation for smooth user experience during AI image generation."""
+    def _record_generation_time(self, started_at: float, image_data: Optional[Dict[str, Any]]) -> Optional[int]:
+        """Measure a finished generation and feed it to the ETA estimator."""
+        elapsed = time.monotonic() - started_at
+        generation_time_seconds = max(1, int(round(elapsed)))
+        image_kind = ("none" if not image_data else "fallback" if image_data.get("fallback")
+                      else "cached" if image_data.get("cached") else "generated")
+        MOOD_BOARD_DURATION.labels(image_kind).observe(elapsed)
+        
+        # Placeholder and cached images finish instantly and would skew the estimate
+        if image_kind == "generated":
+            generation_time_estimator.record(generation_time_seconds)
+            return generation_time_seconds
+        return None
+    
+    async def _run_imagen_call(self, mode: str, generate) -> Any:
+        """Run a blocking Imagen call in the thread pool (image resilience policy, Imagen quota) and record its latency."""
+        def timed_generate():
+            started_at = time.perf_counter()
+            outcome = "error"
+            try:
+                images = generate()
+                outcome = "success"
+                return images
+            finally:
+                IMAGEN_LATENCY.labels(mode, outcome).observe(time.perf_counter() - started_at)
+        
+        # The Imagen slot stays taken until the thread returns, also after a timeout
+        return await image_resilience.call(lambda number: imagen_limiter.run(timed_generate))
+    
+    async def _generate_prompt_enhancement(self, prompt_enhancement_request: str):
+        """Gemini prompt enhancement call (prompt resilience policy, Gemini quota) in a worker thread."""
+        return await prompt_resilience.call(
+            lambda number: gemini_limiter.run(self.gemini_model.generate_content, prompt_enhancement_request)
+        )
+    
+    async def load_generation_time_history(self, limit: int = 50):
+        """Seed the ETA estimator from recent MoodBoard generation times."""
         try:
-            progress_steps = [
-                (58, "Görsel kompozisyonu hazırlanıyor..."),
-                (61, "Renk paleti uygulanıyor..."),
-                (64, "Mekan detayları oluşturuluyor..."),
-                (67, "Dekoratif öğeler ekleniyor..."),
-                (68, "Işık ve gölge efektleri hesaplanıyor..."),
-                (69, "Görsel kalitesi optimize ediliyor...")
-            ]
-            
-            for progress, message in progress_steps:
-                await asyncio.sleep(1.5)  # Wait 1.5 seconds between updates
+            async for db in get_async_session():
+                result = await db.execute(
+                    select(MoodBoard.generation_time_seconds)
+                    .where(MoodBoard.generation_time_seconds.isnot(None))
+                    .order_by(MoodBoard.created_at.desc())
+                    .limit(limit)
+                )
+                durations = list(result.scalars().all())
+                generation_time_estimator.seed(reversed(durations))
+                logger.info(f"Mood board ETA seeded from {len(durations)} generations: "
+                            f"{generation_time_estimator.expected_seconds:.1f}s")
+        except Exception as e:
+            logger.warning(f"Could not load mood board generation times: {str(e)}")
+    
+    async def _get_cached_image(self, cache_key: str, mode: str, connection_id: str = None, mood_board_id: str = None) -> Optional[Dict[str, Any]]:
+        """Imagen result cache lookup; a hit skips the model call entirely."""
+        image_data = await imagen_cache.get(cache_key, mode)
+        if image_data:
+            logger.info(f"🎨 Room visualization served from the Imagen cache ({mode}, {cache_key[:12]})")
+            if connection_id and mood_board_id:
                 await websocket_manager.update_mood_board_progress(connection_id, {
                     "stage": "generating_image",
-                    "progress_percentage": progress,
-                    "message": message,
+                    "progress_percentage": 70,
+                    "message": "Görsel önbellekten alındı...",
                     "mood_board_id": mood_board_id
                 })
-                
-        except asyncio.CancelledError:
-            # Progress simulation was cancelled (image generation completed)
-            logger.debug("Image generation progress simulation cancelled")
-            # Re-raise to properly handle cancellation
-            raise
-        except Exception as e:
-            logger.error(f"Error in progress simulation: {str(e)}")
-
+        return image_data
+    
     def _save_mood_board_image(self, mood_board_id: str, base64_image: str) -> Optional[str]:
         """Save room visualization image to data/mood_boards directory."""
         try:
@@ -449,6 +508,12 @@ class MoodBoardService:
         # Start timer for generation time tracking
         start_time = time.time()
         
+        # Same prompt and parameters -> reuse the stored image
+        cache_key = imagen_cache.key(prompt, [], {"model": IMAGEN_MODEL, **TEXT_GENERATION_PARAMS})
+        cached_image = await self._get_cached_image(cache_key, "text", connection_id, mood_board_id)
+        if cached_image:
+            return cached_image
+        
         try:
             # Import Google Cloud libraries
             from google.cloud import aiplatform
@@ -486,7 +551,7 @@ class MoodBoardService:
                 })
             
             # Load the Imagen model
-            generation_model = ImageGenerationModel.from_pretrained("imagegeneration@006")
+            generation_model = ImageGenerationModel.from_pretrained(IMAGEN_MODEL)
             
             # Progress update: Starting generation (45%)
             if connection_id and mood_board_id:
@@ -499,13 +564,7 @@ class MoodBoardService:
             
             # Generate image with optimized parameters for speed
             def generate_sync():
-                images = generation_model.generate_images(
-                    prompt=prompt,
-                    number_of_images=1,
-                    aspect_ratio="1:1",  # Square format for room visualizations
-                    safety_filter_level="block_some",
-                    person_generation="dont_allow"  # Skip person generation for faster results
-                )
+                images = generation_model.generate_images(prompt=prompt, **TEXT_GENERATION_PARAMS)
                 return images
             
             # Progress update: Generation in progress (55%)
@@ -517,26 +576,9 @@ class MoodBoardService:
                     "mood_board_id": mood_board_id
                 })
             
-            # Create a background task for progress simulation during image generation
-            progress_task = None
-            if connection_id and mood_board_id:
-                progress_task = asyncio.create_task(
-                    self._simulate_image_generation_progress(connection_id, mood_board_id)
-                )
-            
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            images = await loop.run_in_executor(None, generate_sync)
-            
-            # Cancel progress simulation if it's still running
-            if progress_task and not progress_task.done():
-                progress_task.cancel()
-                try:
-                    await progress_task
-                except asyncio.CancelledError:
-                    # Expected cancellation when image generation completes, continue with processing
-                    logger.debug("Progress simulation cancelled as expected")
-                    # No need to re-raise here as this is expected cleanup
+            # Run in thread pool to avoid blocking; the client derives
+            # intermediate progress from eta_seconds in the last update
+            images = await self._run_imagen_call("text", generate_sync)
             
             # Progress update: Processing result (65%)
             if connection_id and mood_board_id:
@@ -588,10 +630,12 @@ class MoodBoardService:
                 )
                 
                 logger.info("✅ Vertex AI room visualization generated successfully")
-                return {
+                image_data = {
                     "base64": base64_string,
                     "success": True
                 }
+                await imagen_cache.put(cache_key, image_data)
+                return image_data
             else:
                 # Calculate generation time for failed case
                 generation_time_ms = int((time.time() - start_time) * 1000)
@@ -656,6 +700,12 @@ class MoodBoardService:
             logger.info("No reference images provided, falling back to text-only generation")
             return await self._generate_image_with_imagen(prompt, connection_id, mood_board_id)
         
+        # Same prompt, reference images and parameters -> reuse the stored image
+        cache_key = imagen_cache.key(prompt, reference_images, {"model": IMAGEN_MODEL, **MULTIMODAL_GENERATION_PARAMS})
+        cached_image = await self._get_cached_image(cache_key, "multimodal", connection_id, mood_board_id)
+        if cached_image:
+            return cached_image
+        
         try:
             # Import Google Cloud libraries
             from google.cloud import aiplatform
@@ -691,7 +741,7 @@ class MoodBoardService:
                 })
             
             # Load the Imagen model
-            generation_model = ImageGenerationModel.from_pretrained("imagegeneration@006")
+            generation_model = ImageGenerationModel.from_pretrained(IMAGEN_MODEL)
             
             # Progress update: Preparing reference images (50%)
             if connection_id and mood_board_id:
@@ -739,11 +789,7 @@ class MoodBoardService:
                     # Generate with PURE Gemini prompt - NO MODIFICATIONS
                     images = generation_model.generate_images(
                         prompt=prompt,  # Gemini'den gelen prompt'u direkt kullan
-                        number_of_images=1,
-                        aspect_ratio="1:1",
-                        safety_filter_level="block_some",
-                        person_generation="dont_allow",
-                        guidance_scale=18
+                        **MULTIMODAL_GENERATION_PARAMS
                     )
                     
                     logger.info(f"Pure Gemini multimodal generation completed (no modifications)")
@@ -754,24 +800,9 @@ class MoodBoardService:
                     # FALLBACK KALDIRILDI - Gerçek hatayı görmek için exception raise et
                     raise multimodal_error
             
-            # Create a background task for progress simulation during generation
-            progress_task = None
-            if connection_id and mood_board_id:
-                progress_task = asyncio.create_task(
-                    self._simulate_multimodal_generation_progress(connection_id, mood_board_id)
-                )
-            
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            images = await loop.run_in_executor(None, generate_multimodal_sync)
-            
-            # Cancel progress simulation if it's still running
-            if progress_task and not progress_task.done():
-                progress_task.cancel()
-                try:
-                    await progress_task
-                except asyncio.CancelledError:
-                    logger.debug("Multimodal progress simulation cancelled as expected")
+            # Run in thread pool to avoid blocking; the client derives
+            # intermediate progress from eta_seconds in the last update
+            images = await self._run_imagen_call("multimodal", generate_multimodal_sync)
             
             # Progress update: Processing multimodal result (70%)
             if connection_id and mood_board_id:
@@ -813,12 +844,14 @@ class MoodBoardService:
                 )
                 
                 logger.info(f"✅ Vertex AI multimodal room visualization generated successfully with {len(reference_pil_images)} reference images")
-                return {
+                image_data = {
                     "base64": base64_string,
                     "success": True,
                     "multimodal": True,
                     "reference_images_used": len(reference_pil_images)
                 }
+                await imagen_cache.put(cache_key, image_data)
+                return image_data
             else:
                 # Calculate generation time for failed case
                 generation_time_ms = int((time.time() - start_time) * 1000)
@@ -868,33 +901,6 @@ class MoodBoardService:
             # Fall back to text-only generation if multimodal fails
             return await self._generate_image_with_imagen(prompt, connection_id, mood_board_id)
     
-    async def _simulate_multimodal_generation_progress(self, connection_id: str, mood_board_id: str):
-        """Progress simulation for multimodal image generation with enhanced timing."""
-        try:
-            progress_steps = [
-                (58, "Referans fotoğrafları analiz ediliyor..."),
-                (61, "Ürün özelliklerini öğreniyor..."),
-                (64, "Mekan kompozisyonunu hesaplıyor..."),
-                (67, "Gerçek ürünleri tasarıma entegre ediyor..."),
-                (68, "Hibrit görsel sentezi yapılıyor..."),
-                (69, "Multimodal görsel optimize ediliyor...")
-            ]
-            
-            for progress, message in progress_steps:
-                await asyncio.sleep(1.8)  # Slightly longer for multimodal
-                await websocket_manager.update_mood_board_progress(connection_id, {
-                    "stage": "generating_image",
-                    "progress_percentage": progress,
-                    "message": message,
-                    "mood_board_id": mood_board_id
-                })
-                
-        except asyncio.CancelledError:
-            logger.debug("Multimodal generation progress simulation cancelled")
-            raise
-        except Exception as e:
-            logger.error(f"Error in multimodal progress simulation: {str(e)}")
-    
     async def _generate_fallback_image(self, prompt: str, connection_id: str = None, mood_board_id: str = None) -> Optional[Dict[str, Any]]:
         """Reliable fallback system for room visualization when Vertex AI fails."""
         # Start timer for fallback generation time tracking
@@ -910,25 +916,6 @@ class MoodBoardService:
                     "mood_board_id": mood_board_id
                 })
             
-            # Create more detailed progress simulation for fallback
-            fallback_steps = [
-                (52, "Placeholder görsel hazırlanıyor..."),
-                (55, "Temel görsel yapısı oluşturuluyor..."),
-                (58, "Görsel formatı belirleniyor..."),
-                (62, "Demo içeriği ekleniyor..."),
-                (66, "Görsel son haline getiriliyor...")
-            ]
-            
-            for progress, message in fallback_steps:
-                await asyncio.sleep(0.8)  # Shorter delays for fallback
-                if connection_id and mood_board_id:
-                    await websocket_manager.update_mood_board_progress(connection_id, {
-                        "stage": "generating_image",
-                        "progress_percentage": progress,
-                        "message": message,
-                        "mood_board_id": mood_board_id
-                    })
-            
             # Create a more realistic placeholder (still fake but bigger)
             import random
             
@@ -956,7 +943,8 @@ class MoodBoardService:
             
             placeholder_image_data = {
                 "base64": fake_image_data,
-                "success": True
+                "success": True,
+                "fallback": True
             }
             
             # Calculate fallback generation time
@@ -1026,7 +1014,8 @@ class MoodBoardService:
         user_id: int = None,
         design_id: str = None,
         image_file_path: str = None,
-        prompt_used: str = None
+        prompt_used: str = None,
+        generation_time_seconds: int = None
     ):
         """Save mood board to database and update design record."""
         # Debug log to check parameters before database operation
@@ -1075,6 +1064,7 @@ class MoodBoardService:
                 db_mood_board.mood_board_id = mood_board_id
                 db_mood_board.image_path = image_file_path or ""
                 db_mood_board.prompt_used = prompt_used or ""
+                db_mood_board.generation_time_seconds = generation_time_seconds
                 
                 db.add(db_mood_board)
                 await db.flush()  # Flush to get the ID
@@ -1097,6 +1087,8 @@ class MoodBoardService:
             finally:
                 await db.close()
     
+    @track_in_progress(MOOD_BOARD_JOBS_IN_PROGRESS)
+    @timed_job("mood_board")
     async def generate_hybrid_mood_board(
         self,
         connection_id: str,
@@ -1116,6 +1108,7 @@ class MoodBoardService:
     ) -> Dict[str, Any]:
         """Generate room visualization using hybrid system with real product images + AI descriptions."""
         mood_board_id = str(uuid.uuid4())
+        started_at = time.monotonic()
         
         # Debug log to check user_id type
         logger.info(f"Hybrid mood board generation - User ID: {user_id} (type: {type(user_id)})")
@@ -1191,7 +1184,8 @@ class MoodBoardService:
                 })
                 
                 # Load product images from local filesystem
-                loaded_images = await local_image_service.load_product_images_batch(real_product_images)
+                with span("product_images"):
+                    loaded_images = await local_image_service.load_product_images_batch(real_product_images)
                 
                 # Prepare loaded images for multimodal API
                 for image_data in loaded_images:
@@ -1247,10 +1241,11 @@ class MoodBoardService:
                     dimensions_info = f"Oda Boyutları: {width}cm x {length}cm"
             
             # Create hybrid prompt combining real product references and AI descriptions  
-            enhanced_prompt = await self._create_hybrid_imagen_prompt(
-                room_type, design_style, notes, design_title, design_description,
-                loaded_real_products, fake_product_descriptions, color_info, dimensions_info, product_categories
-            )
+            with span("prompt"):
+                enhanced_prompt = await self._create_hybrid_imagen_prompt(
+                    room_type, design_style, notes, design_title, design_description,
+                    loaded_real_products, fake_product_descriptions, color_info, dimensions_info, product_categories
+                )
             
             await websocket_manager.update_mood_board_progress(connection_id, {
                 "stage": "optimizing_prompt", 
@@ -1269,9 +1264,10 @@ class MoodBoardService:
             
             # Generate image using multimodal Imagen 4 with reference images
             reference_images = [product['base64_image'] for product in loaded_real_products]
-            image_data = await self._generate_image_with_imagen_multimodal(
-                enhanced_prompt, reference_images, loaded_real_products, connection_id, mood_board_id
-            )
+            with span("imagen"):
+                image_data = await self._generate_image_with_imagen_multimodal(
+                    enhanced_prompt, reference_images, loaded_real_products, connection_id, mood_board_id
+                )
             
             # Stage 3: Processing hybrid image (70-85%)
             await websocket_manager.update_mood_board_progress(connection_id, {
@@ -1290,7 +1286,8 @@ class MoodBoardService:
                     "message": "Hibrit görsel kaydediliyor...",
                     "mood_board_id": mood_board_id
                 })
-                image_file_path = self._save_mood_board_image(mood_board_id, image_data["base64"])
+                with span("save_image"):
+                    image_file_path = self._save_mood_board_image(mood_board_id, image_data["base64"])
             
             # Stage 4: Finalizing (85-95%)
             await websocket_manager.update_mood_board_progress(connection_id, {
@@ -1357,20 +1354,24 @@ class MoodBoardService:
             })
             
             # Save to database if design_id provided
+            generation_time_seconds = self._record_generation_time(started_at, image_data)
             if design_id:
-                await self._save_mood_board_to_database(
-                    mood_board_id=mood_board_id,
-                    user_id=user_id,
-                    design_id=design_id,
-                    image_file_path=image_file_path,
-                    prompt_used=enhanced_prompt
-                )
+                with span("db_save"):
+                    await self._save_mood_board_to_database(
+                        mood_board_id=mood_board_id,
+                        user_id=user_id,
+                        design_id=design_id,
+                        image_file_path=image_file_path,
+                        prompt_used=enhanced_prompt,
+                        generation_time_seconds=generation_time_seconds
+                    )
             
             logger.info(f"Hybrid mood board generated successfully: {mood_board_id} with {len(real_product_images)} real + {len(fake_product_descriptions)} fake products")
             return mood_board_data
             
         except Exception as e:
             logger.error(f"Error generating hybrid mood board: {str(e)}")
+            MOOD_BOARD_FAILURES.inc()
             await websocket_manager.update_mood_board_progress(connection_id, {
                 "stage": "error",
                 "progress_percentage": 0,
@@ -1422,7 +1423,7 @@ class MoodBoardService:
         
         try:
             # Gemini'den prompt al
-            response = self.gemini_model.generate_content(prompt_enhancement_request)
+            response = await self._generate_prompt_enhancement(prompt_enhancement_request)
             enhanced_prompt = response.text.strip()
             
             logger.info(f"✅ Gemini'den hybrid prompt alındı: {enhanced_prompt[:100]}...")
@@ -0,0 +1,143 @@
+"""
+RelatedDesignIndex - MinHash/LSH index for "similar designs".
+KISS principle: One signature per design, compare only designs that share an LSH bucket.
+"""
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Set
+import numpy as np
+from sqlalchemy import select
+from config import logger
+from config.database import async_session_maker
+from models.design_models_db import Design, DesignHashtag
+from .hashtag_index import normalize_hashtag
+
+
+def design_features(hashtags: Iterable[str], products: Optional[List[Dict[str, Any]]], design_style: Optional[str]) -> Set[str]:
+    """Feature set of a design: its hashtags, product categories and style."""
+    features = {"tag:" + tag for tag in map(normalize_hashtag, hashtags) if tag}
+    for product in products or []:
+        if isinstance(product, dict) and product.get("category"):
+            features.add("category:" + str(product["category"]).strip().lower())
+    if design_style:
+        features.add("style:" + design_style.strip().lower())
+    return features
+
+
+class RelatedDesignIndex:
+    """
+    MinHash signatures of design feature sets with LSH banding.
+
+    Signatures live in one NumPy array (row = design). Each signature is cut
+    into BANDS bands of ROWS values; designs with an identical band share a
+    bucket. A lookup only scores the designs found in the query design's
+    buckets, so its cost follows the bucket sizes instead of the number of
+    designs. With 32 bands of 4 rows, pairs with Jaccard similarity >= 0.5
+    become candidates with ~87% probability, pairs at 0.2 with ~5%.
+
+    Every worker keeps its own index; DesignIndexSync applies the changes
+    made by other workers (see design_index_sync.py).
+    """
+
+    NUM_PERM = 128
+    BANDS = 32
+    ROWS = NUM_PERM // BANDS
+    _PRIME = np.uint64(4294967311)  # smallest prime > 2^32: (a * x + b) stays below 2^64
+
+    def __init__(self, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2**32, size=self.NUM_PERM, dtype=np.uint64)
+        self._b = rng.integers(0, 2**32, size=self.NUM_PERM, dtype=np.uint64)
+        self._reset()
+
+    def _reset(self):
+        self._signatures = np.empty((64, self.NUM_PERM), dtype=np.uint64)
+        self._design_ids: List[str] = []  # row -> design id
+        self._rows: Dict[str, int] = {}  # design id -> row
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(self.BANDS)]
+
+    def signature(self, features: Set[str]) -> np.ndarray:
+        """MinHash signature of a feature set."""
+        hashes = np.fromiter((zlib.crc32(feature.encode("utf-8")) for feature in features), dtype=np.uint64, count=len(features))
+        return ((np.outer(hashes, self._a) + self._b) % self._PRIME).min(axis=0)
+
+    async def rebuild(self):
+        """Rebuild the index from the database."""
+        try:
+            async with async_session_maker() as db:
+                designs = (await db.execute(
+                    select(Design.id, Design.products, Design.design_style).order_by(Design.created_at, Design.id)
+                )).all()
+                hashtags = (await db.execute(
+                    select(DesignHashtag.design_id, DesignHashtag.hashtag)
+                )).all()
+
+            tags_by_design: Dict[str, List[str]] = {}
+            for design_id, hashtag in hashtags:
+                tags_by_design.setdefault(design_id, []).append(hashtag)
+
+            self._reset()
+            for design_id, products, design_style in designs:
+                self.add_design(design_id, tags_by_design.get(design_id, []), products, design_style)
+
+            logger.info(f"Related design index built: {len(self._design_ids)} designs")
+        except Exception as e:
+            logger.warning(f"Could not build related design index: {str(e)}")
+
+    def add_design(self, design_id: str, hashtags: Iterable[str], products: Optional[List[Dict[str, Any]]], design_style: Optional[str]):
+        """Index a new design (designs without any feature are skipped)."""
+        if design_id in self._rows:
+            return
+        features = design_features(hashtags, products, design_style)
+        if not features:
+            return
+
+        row = len(self._design_ids)
+        if row == len(self._signatures):
+            self._signatures = np.concatenate([self._signatures, np.empty_like(self._signatures)])
+        self._signatures[row] = self.signature(features)
+        self._design_ids.append(design_id)
+        self._rows[design_id] = row
+
+        for band, key in enumerate(self._band_keys(self._signatures[row])):
+            self._buckets[band].setdefault(key, []).append(row)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def related(self, design_id: str, limit: Optional[int] = None, min_similarity: float = 0.1) -> List[Dict[str, Any]]:
+        """
+        Designs most similar to the given one.
+
+        Returns:
+            List of {"design_id", "similarity"} (estimated Jaccard), most similar first
+        """
+        row = self._rows.get(design_id)
+        if row is None:
+            return []
+
+        signature = self._signatures[row]
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band][key])
+        candidates.discard(row)
+        if not candidates:
+            return []
+
+        rows = np.fromiter(candidates, dtype=np.intp, count=len(candidates))
+        similarities = (self._signatures[rows] == signature).mean(axis=1)
+        order = np.argsort(-similarities, kind="stable")
+        if limit is not None:
+            order = order[:limit]
+
+        return [
+            {"design_id": self._design_ids[rows[i]], "similarity": round(float(similarities[i]), 3)}
+            for i in order
+            if similarities[i] >= min_similarity
+        ]
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self.ROWS:(band + 1) * self.ROWS].tobytes() for band in range(self.BANDS)]
+
+
+# Global related design index instance
+related_design_index = RelatedDesignIndex()
@@ -0,0 +1,29 @@
+"""
+Test settings - the required Settings fields, so importing config works without a .env.
+Values from the environment (or a developer's exported .env) win; the database is never contacted
+and the log file goes to the temp directory, not logs/.
+"""
+import os
+import tempfile
+
+TEST_SETTINGS = {
+    "APP_TITLE": "Deko Assistant AI API (tests)",
+    "APP_DESCRIPTION": "Test run",
+    "APP_VERSION": "0.0.0",
+    "ALLOWED_ORIGINS": "http://localhost:3000",
+    "SECRET_KEY": "test-secret-key",
+    "DATABASE_URL": "sqlite+aiosqlite:///:memory:",
+    "GEMINI_API_KEY": "test",
+    "GOOGLE_CLOUD_PROJECT_ID": "test",
+    "GENERATIVE_MODEL_NAME": "gemini-test",
+    "IMAGEN_MODEL_NAME": "imagen-test",
+    "IMAGEN_API_ENDPOINT": "http://127.0.0.1",
+    "LOG_LEVEL": "WARNING",
+    "LOG_FORMAT": "%(asctime)s - %(levelname)s - %(message)s",
+    "LOG_FILE": os.path.join(tempfile.gettempdir(), "deko_assistant_tests.log"),
+    "LOG_BACKUP_COUNT": "1",
+    "LOG_ENCODING": "utf-8",
+}
+
+for name, value in TEST_SETTINGS.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,191 @@
+"""
+BatchIkeaImageDownloader tests against a local HTTP server - resume, 304 re-checks, per-host limits and atomic writes.
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from data.batch_image_downloader import BatchIkeaImageDownloader
+
+PRODUCT_COUNT = 6
+
+
+class ProductSite:
+    """Product pages and images served from memory; records requests and image concurrency."""
+
+    def __init__(self):
+        self.images = {f"PE{number}.jpg": f"image-{number}".encode() * 1000 for number in range(PRODUCT_COUNT)}
+        self.requests = []
+        self.image_delay = 0.0
+        self.truncate = set()  # Image names sent with a short body
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.host = f"127.0.0.1:{self.server.server_port}"
+
+    def _handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                site.requests.append((self.path, self.headers.get("If-None-Match")))
+                if self.path.startswith("/page/"):
+                    name = self.path.rsplit("/", 1)[1]
+                    body = f'<html><img src="http://{site.host}/urunler/500_500/{name}"></html>'.encode()
+                    self._send(200, body, {"Content-Type": "text/html"})
+                elif self.path.startswith("/urunler/2000_2000/"):
+                    self._image(self.path.rsplit("/", 1)[1])
+                else:
+                    self._send(404, b"")
+
+            def _image(self, name):
+                body = site.images[name]
+                etag = f'"{hash(body)}"'
+                with site._lock:
+                    site.active += 1
+                    site.max_active = max(site.max_active, site.active)
+                try:
+                    time.sleep(site.image_delay)
+                    if self.headers.get("If-None-Match") == etag:
+                        self._send(304, None, {"ETag": etag})
+                    elif name in site.truncate:
+                        self.send_response(200)
+                        self.send_header("Content-Length", str(len(body)))
+                        self.end_headers()
+                        self.wfile.write(body[:len(body) // 2])
+                        self.close_connection = True
+                    else:
+                        self._send(200, body, {"ETag": etag, "Content-Type": "image/jpeg"})
+                finally:
+                    with site._lock:
+                        site.active -= 1
+
+            def _send(self, code, body, headers=None):
+                self.send_response(code)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                if body is not None:
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+        return Handler
+
+    def paths(self, prefix):
+        return [path for path, _ in self.requests if path.startswith(prefix)]
+
+
+@pytest.fixture
+def site():
+    site = ProductSite()
+    thread = threading.Thread(target=site.server.serve_forever, daemon=True)
+    thread.start()
+    yield site
+    site.server.shutdown()
+    site.server.server_close()
+
+
+@pytest.fixture
+def catalog(tmp_path, site):
+    json_path = tmp_path / "jsonlaryeni" / "ayna.json"
+    json_path.parent.mkdir()
+    products = [
+        {"product_name": f"Ayna {number}", "product_link": f"http://{site.host}/page/PE{number}.jpg", "category": "Ayna"}
+        for number in range(PRODUCT_COUNT)
+    ]
+    json_path.write_text(json.dumps(products), encoding="utf-8")
+    return str(json_path)
+
+
+def run(site, tmp_path, catalog, **options):
+    options.setdefault("host_delay", 0.0)
+    downloader = BatchIkeaImageDownloader(
+        str(tmp_path / "jsonlaryeni"), str(tmp_path / "productsyeni"), image_host=site.host, **options
+    )
+    asyncio.run(downloader.process_json_files([catalog]))
+    return downloader
+
+
+def image_path(tmp_path, number):
+    return tmp_path / "productsyeni" / "products" / "ayna" / f"ayna-{number}.jpg"
+
+
+def test_downloads_every_image_and_records_it(site, tmp_path, catalog):
+    downloader = run(site, tmp_path, catalog)
+
+    assert downloader.stats == {"downloaded": PRODUCT_COUNT, "not_modified": 0, "skipped": 0, "failed": 0}
+    for number in range(PRODUCT_COUNT):
+        assert image_path(tmp_path, number).read_bytes() == site.images[f"PE{number}.jpg"]
+    manifest = json.loads((tmp_path / "productsyeni" / "manifest.json").read_text(encoding="utf-8"))["files"]
+    entry = manifest[os.path.join("products", "ayna", "ayna-0.jpg")]
+    assert entry["status"] == "done"
+    assert entry["size"] == len(site.images["PE0.jpg"])
+    assert entry["etag"]
+
+
+def test_resume_skips_completed_files(site, tmp_path, catalog):
+    run(site, tmp_path, catalog)
+    image_path(tmp_path, 3).unlink()  # Interrupted/removed: only this one is fetched again
+    site.requests.clear()
+
+    downloader = run(site, tmp_path, catalog)
+
+    assert downloader.stats["skipped"] == PRODUCT_COUNT - 1
+    assert downloader.stats["downloaded"] == 1
+    # The image URL is remembered in the manifest, so no product page is fetched again
+    assert site.paths("/page/") == []
+    assert site.paths("/urunler/") == ["/urunler/2000_2000/PE3.jpg"]
+
+
+def test_refresh_sends_conditional_requests(site, tmp_path, catalog):
+    run(site, tmp_path, catalog)
+    site.requests.clear()
+    site.images["PE1.jpg"] = b"changed" * 1000
+
+    downloader = run(site, tmp_path, catalog, refresh=True)
+
+    assert downloader.stats["not_modified"] == PRODUCT_COUNT - 1
+    assert downloader.stats["downloaded"] == 1
+    assert all(etag for path, etag in site.requests)
+    assert site.paths("/page/") == []
+    assert image_path(tmp_path, 1).read_bytes() == b"changed" * 1000
+
+
+def test_per_host_concurrency_limit(site, tmp_path, catalog):
+    site.image_delay = 0.2
+
+    run(site, tmp_path, catalog, per_host=2, max_connections=8)
+
+    assert site.max_active == 2
+
+
+def test_failed_download_keeps_previous_file(site, tmp_path, catalog):
+    run(site, tmp_path, catalog)
+    previous = image_path(tmp_path, 2).read_bytes()
+    site.images["PE2.jpg"] = b"new" * 1000
+    site.truncate.add("PE2.jpg")
+    manifest_path = tmp_path / "productsyeni" / "manifest.json"
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    manifest["files"][os.path.join("products", "ayna", "ayna-2.jpg")]["status"] = "failed"
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+
+    downloader = BatchIkeaImageDownloader(
+        str(tmp_path / "jsonlaryeni"), str(tmp_path / "productsyeni"), image_host=site.host, host_delay=0.0
+    )
+    downloader.MAX_ATTEMPTS = 1
+    asyncio.run(downloader.process_json_files([catalog]))
+
+    assert downloader.stats["failed"] == 1
+    # The truncated body never replaced the file, and no temporary file is left behind
+    assert image_path(tmp_path, 2).read_bytes() == previous
+    assert not [name for name in os.listdir(image_path(tmp_path, 2).parent) if name.endswith(".part")]
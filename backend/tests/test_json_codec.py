@@ -0,0 +1,34 @@
+"""
+json_codec tests - the wire format of WebSocket frames and broker envelopes.
+"""
+import datetime
+import decimal
+import uuid
+
+from utils.json_codec import dumps, loads
+
+
+def test_compact_utf8_output():
+    assert dumps({"başlık": "Işıklı ayna", "items": [1, 2]}) == '{"başlık":"Işıklı ayna","items":[1,2]}'
+
+
+def test_non_string_keys_and_extra_types():
+    design_id = uuid.UUID("12345678-1234-5678-1234-567812345678")
+    value = {
+        1: "one",
+        None: "none",
+        "id": design_id,
+        "price": decimal.Decimal("1499.90"),
+        "at": datetime.datetime(2024, 1, 2, 3, 4, 5),
+    }
+    assert loads(dumps(value)) == {
+        "1": "one",
+        "null": "none",
+        "id": "12345678-1234-5678-1234-567812345678",
+        "price": "1499.90",
+        "at": "2024-01-02T03:04:05",
+    }
+
+
+def test_loads_accepts_bytes():
+    assert loads(b'{"seq":3}') == loads('{"seq":3}') == {"seq": 3}
@@ -0,0 +1,161 @@
+"""
+ResiliencePolicy tests against a stubbed model call with injected latency spikes and failures.
+"""
+import asyncio
+import time
+
+import pytest
+
+from services.ai.resilience import CircuitBreaker, CircuitOpenError, ResilienceConfig, ResiliencePolicy
+
+
+class StubModel:
+    """Model call whose latency and outcome are scripted per attempt number."""
+
+    def __init__(self, latency: float = 0.01, fail: bool = False):
+        self.latency = latency
+        self.fail = fail
+        self.spikes = {}  # attempt number -> latency
+        self.calls = []  # (attempt number, start time)
+        self.cancelled = []
+
+    async def __call__(self, number: int):
+        self.calls.append((number, time.perf_counter()))
+        try:
+            await asyncio.sleep(self.spikes.get(number, self.latency))
+        except asyncio.CancelledError:
+            self.cancelled.append(number)
+            raise
+        if self.fail:
+            raise ConnectionError("model unavailable")
+        return f"result-{number}"
+
+
+def policy(**options) -> ResiliencePolicy:
+    options.setdefault("attempt_timeout", 5.0)
+    options.setdefault("retry_backoff", 0.0)
+    return ResiliencePolicy("test", ResilienceConfig(**options))
+
+
+def test_hedge_fires_after_observed_p95_and_first_result_wins():
+    async def scenario():
+        resilience = policy(hedge=True, hedge_default_delay=10.0, hedge_min_delay=0.01)
+        model = StubModel(latency=0.05)
+        for _ in range(resilience.latencies.min_samples):
+            await resilience.call(model)
+        p95 = resilience.hedge_delay()
+        assert 0.04 <= p95 < 0.5  # Learned from the calls, not the 10s default
+
+        model.calls.clear()
+        model.spikes = {0: 2.0}  # Primary hits a latency spike, the hedge (attempt 1) does not
+        started = time.perf_counter()
+        result = await resilience.call(model)
+        elapsed = time.perf_counter() - started
+        await asyncio.sleep(0)  # Let the cancelled primary run its handler
+        return resilience, model, p95, result, elapsed
+
+    resilience, model, p95, result, elapsed = asyncio.run(scenario())
+
+    assert result == "result-1"
+    assert elapsed < 1.0
+    (primary, primary_start), (hedge, hedge_start) = model.calls
+    assert (primary, hedge) == (0, 1)
+    assert hedge_start - primary_start >= p95 * 0.9
+    assert model.cancelled == [0]
+    stats = resilience.get_stats()
+    assert stats["hedges"] == 1
+    assert stats["hedge_wins"] == 1
+
+
+def test_no_hedge_when_primary_finishes_before_p95():
+    async def scenario():
+        resilience = policy(hedge=True, hedge_default_delay=0.5)
+        model = StubModel(latency=0.01)
+        await resilience.call(model)
+        return resilience, model
+
+    resilience, model = asyncio.run(scenario())
+
+    assert [number for number, _ in model.calls] == [0]
+    assert resilience.get_stats()["hedges"] == 0
+
+
+def test_breaker_opens_fails_fast_and_closes_after_one_probe():
+    async def scenario():
+        resilience = policy(failure_threshold=3, reset_timeout=0.2, max_retries=0)
+        failing = StubModel(fail=True)
+        for _ in range(3):
+            with pytest.raises(ConnectionError):
+                await resilience.call(failing)
+        assert resilience.breaker.state == CircuitBreaker.OPEN
+
+        # Open: rejected without calling the model
+        with pytest.raises(CircuitOpenError):
+            await resilience.call(failing)
+        assert len(failing.calls) == 3
+
+        await asyncio.sleep(0.25)
+        healthy = StubModel(latency=0.1)
+        probe = asyncio.create_task(resilience.call(healthy))
+        await asyncio.sleep(0.02)
+        assert resilience.breaker.state == CircuitBreaker.HALF_OPEN
+        # Only one probe at a time
+        with pytest.raises(CircuitOpenError):
+            await resilience.call(healthy)
+        assert await probe == "result-0"
+        assert len(healthy.calls) == 1
+        return resilience
+
+    resilience = asyncio.run(scenario())
+
+    assert resilience.breaker.state == CircuitBreaker.CLOSED
+    assert resilience.get_stats()["short_circuited"] == 2
+
+
+def test_failed_probe_reopens_breaker():
+    async def scenario():
+        resilience = policy(failure_threshold=1, reset_timeout=0.05, max_retries=0)
+        failing = StubModel(fail=True)
+        with pytest.raises(ConnectionError):
+            await resilience.call(failing)
+        await asyncio.sleep(0.1)
+        with pytest.raises(ConnectionError):
+            await resilience.call(failing)  # The probe
+        return resilience
+
+    resilience = asyncio.run(scenario())
+
+    assert resilience.breaker.state == CircuitBreaker.OPEN
+    assert resilience.breaker.get_stats()["times_opened"] == 2
+
+
+def test_retries_stop_once_budget_is_spent():
+    async def scenario():
+        # Two extra attempts in the budget and no refill from traffic
+        resilience = policy(max_retries=5, budget_ratio=0.0, budget_min=2.0, failure_threshold=100)
+        model = StubModel(fail=True)
+        with pytest.raises(ConnectionError):
+            await resilience.call(model)
+        first_call_attempts = len(model.calls)
+        with pytest.raises(ConnectionError):
+            await resilience.call(model)
+        return resilience, first_call_attempts, len(model.calls) - first_call_attempts
+
+    resilience, first_call_attempts, second_call_attempts = asyncio.run(scenario())
+
+    assert first_call_attempts == 3  # 1 + the 2 budgeted retries, not 1 + max_retries
+    assert second_call_attempts == 1  # Budget empty: no retry at all
+    assert resilience.get_stats()["retries"] == 2
+
+
+def test_timeouts_not_retried_when_disabled():
+    async def scenario():
+        resilience = policy(attempt_timeout=0.05, retry_timeouts=False, max_retries=3)
+        model = StubModel(latency=1.0)
+        with pytest.raises(asyncio.TimeoutError):
+            await resilience.call(model)
+        return model
+
+    model = asyncio.run(scenario())
+
+    assert len(model.calls) == 1
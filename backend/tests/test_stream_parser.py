@@ -0,0 +1,43 @@
+"""
+DesignStreamParser tests - top-level scalars, streamed chunks and truncated text.
+"""
+import json
+
+import pytest
+
+from services.ai.stream_parser import DesignStreamParser
+
+DOCUMENT = {
+    "title": "x",
+    "description": "d",
+    "budget": 12500,
+    "ratio": -1.5e2,
+    "ok": False,
+    "featured": True,
+    "note": None,
+    "products": [{"name": "Sofa", "price": 100}],
+    "hashtags": ["#modern"],
+}
+
+
+def parse(text: str, chunk_size: int) -> dict:
+    parser = DesignStreamParser()
+    for start in range(0, len(text), chunk_size):
+        parser.feed(text[start:start + chunk_size])
+    return parser.finish()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 1000])
+@pytest.mark.parametrize("separators", [(",", ":"), (", ", ": ")])
+def test_top_level_scalars(chunk_size, separators):
+    text = json.dumps(DOCUMENT, separators=separators)
+    assert parse(text, chunk_size) == DOCUMENT
+
+
+def test_scalar_before_closing_brace():
+    assert parse('{"title":"x","budget":12500}', 4) == {"title": "x", "budget": 12500}
+
+
+def test_truncated_scalar_is_dropped():
+    document = parse('{"title":"x","budget":125', 5)
+    assert document == {"title": "x"}
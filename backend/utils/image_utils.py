@@ -3,12 +3,21 @@ Image utilities for multimodal AI integration
 """
 
 import base64
+import functools
 import io
-from PIL import Image
 from typing import Optional, Tuple, Dict, Any
 from config import logger
 
 
+@functools.lru_cache(maxsize=None)
+def _pil_image():
+    """
+    PIL.Image, imported on first use: the Pillow import is slow and not every worker handles images.
+    """
+    from PIL import Image
+    return Image
+
+
 class ImageUtils:
     """Utility functions for image processing and validation."""
     
@@ -28,7 +37,7 @@ class ImageUtils:
             image_bytes = base64.b64decode(base64_string)
             
             # Try to open with PIL
-            with Image.open(io.BytesIO(image_bytes)) as img:
+            with _pil_image().open(io.BytesIO(image_bytes)) as img:
                 img.verify()  # Verify it's a valid image
                 return True
                 
@@ -50,7 +59,7 @@ class ImageUtils:
         try:
             image_bytes = base64.b64decode(base64_string)
             
-            with Image.open(io.BytesIO(image_bytes)) as img:
+            with _pil_image().open(io.BytesIO(image_bytes)) as img:
                 return img.size  # (width, height)
                 
         except Exception as e:
@@ -73,7 +82,7 @@ class ImageUtils:
         try:
             image_bytes = base64.b64decode(base64_string)
             
-            with Image.open(io.BytesIO(image_bytes)) as img:
+            with _pil_image().open(io.BytesIO(image_bytes)) as img:
                 # Check if resize is needed
                 if img.width <= max_width and img.height <= max_height:
                     return base64_string  # No resize needed
@@ -89,7 +98,7 @@ class ImageUtils:
                     new_width = int(new_height * aspect_ratio)
                 
                 # Resize image
-                resized_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+                resized_img = img.resize((new_width, new_height), _pil_image().Resampling.LANCZOS)
                 
                 # Convert back to base64
                 output_buffer = io.BytesIO()
@@ -119,11 +128,11 @@ class ImageUtils:
         try:
             image_bytes = base64.b64decode(base64_string)
             
-            with Image.open(io.BytesIO(image_bytes)) as img:
+            with _pil_image().open(io.BytesIO(image_bytes)) as img:
                 # Convert RGBA to RGB if saving as JPEG
                 if target_format.upper() == 'JPEG' and img.mode in ('RGBA', 'LA'):
                     # Create white background
-                    rgb_img = Image.new('RGB', img.size, (255, 255, 255))
+                    rgb_img = _pil_image().new('RGB', img.size, (255, 255, 255))
                     if img.mode == 'RGBA':
                         rgb_img.paste(img, mask=img.split()[-1])  # Use alpha channel as mask
                     else:
@@ -211,7 +220,7 @@ class ImageUtils:
         try:
             image_bytes = base64.b64decode(base64_string)
             
-            with Image.open(io.BytesIO(image_bytes)) as img:
+            with _pil_image().open(io.BytesIO(image_bytes)) as img:
                 return {
                     "format": img.format,
                     "mode": img.mode,
@@ -0,0 +1,25 @@
+"""
+JSON encoding for hot paths (WebSocket frames, broker envelopes).
+Uses orjson (see requirements.txt): compact separators, non-ASCII kept as UTF-8,
+int/bool/None dict keys written as strings, datetimes in ISO 8601.
+"""
+from typing import Any
+
+import orjson
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """Serialize types orjson does not know natively (Decimal, ...)."""
+    return str(value)
+
+
+def dumps(value: Any) -> str:
+    """Serialize ``value`` to a JSON string."""
+    return orjson.dumps(value, default=_default, option=_ORJSON_OPTIONS).decode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """Parse a JSON string or bytes."""
+    return orjson.loads(data)
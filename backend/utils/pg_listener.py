@@ -0,0 +1,90 @@
+"""
+PgNotifyListener - Base class for workers that react to PostgreSQL NOTIFY messages.
+KISS principle: One dedicated asyncpg connection per channel, reconnect with backoff, subclasses handle payloads.
+
+Writers send ``pg_notify(channel, payload)`` in the transaction that changes
+the data, so every worker hears about the change right after it is committed.
+Notifications sent while a listener was disconnected are lost; subclasses
+that keep derived state resynchronise in on_reconnect().
+"""
+import asyncio
+from typing import Optional
+from config import logger
+from config.database import DATABASE_URL
+
+
+def notifications_supported() -> bool:
+    """LISTEN/NOTIFY needs PostgreSQL through asyncpg."""
+    return DATABASE_URL.startswith("postgresql+asyncpg")
+
+
+class PgNotifyListener:
+    """Keeps a LISTEN connection open on one channel and calls on_notification for each message."""
+
+    RECONNECT_DELAY_SECONDS = 1.0
+    MAX_RECONNECT_DELAY_SECONDS = 30.0
+
+    def __init__(self, channel: str, name: str):
+        self.channel = channel
+        self.name = name
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if not notifications_supported():
+            logger.info(f"{self.name} disabled (not a PostgreSQL/asyncpg database)")
+            return
+        self._task = asyncio.create_task(self._listen_loop())
+
+    async def _listen_loop(self):
+        """Keep a LISTEN connection open, reconnecting with backoff."""
+        import asyncpg
+
+        delay = self.RECONNECT_DELAY_SECONDS
+        dsn = DATABASE_URL.replace("postgresql+asyncpg", "postgresql", 1)
+        connected_before = False
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(dsn)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _connection: lost.set())
+                await connection.add_listener(self.channel, self._dispatch)
+                logger.info(f"{self.name} started on channel '{self.channel}'")
+                delay = self.RECONNECT_DELAY_SECONDS
+                if connected_before:
+                    await self.on_reconnect()
+                connected_before = True
+                await lost.wait()
+                raise ConnectionError("connection closed")
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"{self.name} lost, retrying in {delay:.0f}s: {str(e)}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.MAX_RECONNECT_DELAY_SECONDS)
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+
+    def _dispatch(self, connection, pid: int, channel: str, payload: str):
+        try:
+            self.on_notification(payload)
+        except Exception as e:
+            logger.error(f"{self.name} failed to handle a notification: {str(e)}")
+
+    def on_notification(self, payload: str):
+        """Handle one notification (runs on the event loop; schedule slow work)."""
+        raise NotImplementedError
+
+    async def on_reconnect(self):
+        """Called after the connection was re-established (notifications may have been missed)."""
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
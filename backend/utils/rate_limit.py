@@ -0,0 +1,293 @@
+"""
+Model call limiter - token bucket for the per-minute quota plus an AIMD concurrency limit.
+KISS principle: One limiter per quota; callers wait in FIFO order until their deadline instead of hitting 429s.
+
+    async with gemini_limiter.limit():
+        response = chat.send_message(prompt)
+
+The token bucket keeps the request rate under the quota. The concurrency
+limit grows by one per window of successful calls and halves when the
+API answers with a quota error (additive increase, multiplicative decrease),
+so bursts are queued instead of turning into error storms.
+
+limit() is for the event loop, limit_sync() for code already running in a
+worker thread (never call it on the event loop: it blocks while waiting).
+run() calls a blocking SDK function in the thread pool and holds the slot
+until the thread returns, also when the awaiting task is cancelled (threads
+cannot be stopped, so an abandoned call still occupies the provider).
+
+Async waits are reported to the QueueWatch of the current context (see
+watch_queueing), so the resilience layer can leave queue time out of its
+attempt timeouts.
+"""
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Callable, Dict, Optional
+
+from utils.metrics import metrics
+
+QUEUE_WAIT = metrics.histogram(
+    "model_call_queue_wait_seconds", "Time model calls waited for the rate/concurrency limiter", ["limiter"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+)
+QUEUE_TIMEOUTS = metrics.counter("model_call_queue_timeouts_total", "Model calls that gave up waiting for the limiter", ["limiter"])
+THROTTLED = metrics.counter("model_call_throttled_total", "Model calls rejected by the provider's quota (429)", ["limiter"])
+
+_POLL_SECONDS = 0.05  # Upper bound between checks while queued
+
+
+class RateLimitTimeout(Exception):
+    """A model call waited for the limiter past its deadline."""
+
+
+def is_quota_error(error: BaseException) -> bool:
+    """Whether an SDK exception is a quota / rate limit rejection (HTTP 429, RESOURCE_EXHAUSTED)."""
+    if getattr(error, "code", None) == 429:
+        return True
+    name = type(error).__name__
+    if name in ("ResourceExhausted", "TooManyRequests"):
+        return True
+    text = str(error)
+    return "429" in text or "RESOURCE_EXHAUSTED" in text or "Quota exceeded" in text
+
+
+class QueueWatch:
+    """Seconds the calls of one context (e.g. one resilience attempt) spent queued for a limiter slot."""
+
+    def __init__(self):
+        self._queued = 0.0
+        self._waiting = 0
+        self._since = 0.0
+
+    def enter(self):
+        if self._waiting == 0:
+            self._since = time.monotonic()
+        self._waiting += 1
+
+    def leave(self):
+        self._waiting -= 1
+        if self._waiting == 0:
+            self._queued += time.monotonic() - self._since
+
+    @property
+    def seconds(self) -> float:
+        """Queued time so far, including a wait that is still going on."""
+        return self._queued + (time.monotonic() - self._since if self._waiting else 0.0)
+
+
+_queue_watch: contextvars.ContextVar = contextvars.ContextVar("model_call_queue_watch", default=None)
+
+
+def watch_queueing() -> QueueWatch:
+    """Start a QueueWatch for the current context (tasks created afterwards inherit it)."""
+    watch = QueueWatch()
+    _queue_watch.set(watch)
+    return watch
+
+
+class ModelCallLimiter:
+    """Token bucket + AIMD concurrency limit for one provider quota (thread-safe)."""
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float,
+        max_concurrency: int,
+        min_concurrency: int = 1,
+        queue_timeout: float = 30.0,
+        burst: Optional[float] = None,
+        decrease_factor: float = 0.5
+    ):
+        self.name = name
+        self.rate = requests_per_minute / 60.0  # tokens per second
+        self.capacity = burst if burst is not None else max(1.0, min(float(max_concurrency), requests_per_minute / 6))
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.queue_timeout = queue_timeout
+        self.decrease_factor = decrease_factor
+
+        self._tokens = self.capacity
+        self._refilled_at = time.monotonic()
+        self._limit = float(max_concurrency)
+        self._in_flight = 0
+        self._queue: deque = deque()  # tickets of waiting callers, FIFO
+        self._next_ticket = 0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+
+        self._acquired = 0
+        self._throttled = 0
+        self._timeouts = 0
+
+        self._wait_metric = QUEUE_WAIT.labels(name)
+
+    # --- core (call with the lock held) ---
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def _try_acquire(self, ticket: int) -> float:
+        """Take a slot for ``ticket`` if it is at the head of the queue; else seconds to wait."""
+        now = time.monotonic()
+        self._refill(now)
+        if self._queue[0] != ticket or self._in_flight >= int(self._limit):
+            return _POLL_SECONDS
+        if self._tokens < 1.0:
+            return min((1.0 - self._tokens) / self.rate, _POLL_SECONDS) if self.rate > 0 else _POLL_SECONDS
+        self._tokens -= 1.0
+        self._in_flight += 1
+        self._acquired += 1
+        self._queue.popleft()
+        return 0.0
+
+    def _enqueue(self) -> int:
+        with self._lock:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            self._queue.append(ticket)
+            return ticket
+
+    def _leave_queue(self, ticket: int, timed_out: bool = True):
+        with self._lock:
+            try:
+                self._queue.remove(ticket)
+            except ValueError:
+                pass
+            if timed_out:
+                self._timeouts += 1
+            self._released.notify_all()
+        if timed_out:
+            QUEUE_TIMEOUTS.labels(self.name).inc()
+
+    def _release(self, error: Optional[BaseException]):
+        throttled = error is not None and is_quota_error(error)
+        with self._lock:
+            self._in_flight -= 1
+            now = time.monotonic()
+            if throttled:
+                self._throttled += 1
+                self._tokens = 0.0  # Let the provider's window recover before the next call
+                # One decrease per round trip: calls already in flight fail together
+                if now - self._last_decrease > 1.0:
+                    self._limit = max(float(self.min_concurrency), self._limit * self.decrease_factor)
+                    self._last_decrease = now
+            elif error is None:
+                self._limit = min(float(self.max_concurrency), self._limit + 1.0 / max(self._limit, 1.0))
+            self._released.notify_all()
+        if throttled:
+            THROTTLED.labels(self.name).inc()
+
+    def _timeout_error(self, waited: float) -> RateLimitTimeout:
+        return RateLimitTimeout(f"{self.name} limiter: no slot after {waited:.1f}s")
+
+    # --- public API ---
+
+    async def acquire(self, timeout: Optional[float] = None):
+        """Wait (on the event loop) for a token and a concurrency slot."""
+        timeout = self.queue_timeout if timeout is None else timeout
+        started_at = time.monotonic()
+        ticket = self._enqueue()
+        watch = _queue_watch.get()
+        if watch is not None:
+            watch.enter()
+        try:
+            while True:
+                with self._lock:
+                    wait = self._try_acquire(ticket)
+                if wait == 0.0:
+                    break
+                remaining = timeout - (time.monotonic() - started_at)
+                if remaining <= 0:
+                    self._leave_queue(ticket)
+                    raise self._timeout_error(time.monotonic() - started_at)
+                await asyncio.sleep(min(wait, remaining))
+        except asyncio.CancelledError:
+            self._leave_queue(ticket, timed_out=False)
+            raise
+        finally:
+            if watch is not None:
+                watch.leave()
+        self._wait_metric.observe(time.monotonic() - started_at)
+
+    def acquire_sync(self, timeout: Optional[float] = None):
+        """Blocking acquire for worker threads."""
+        timeout = self.queue_timeout if timeout is None else timeout
+        started_at = time.monotonic()
+        ticket = self._enqueue()
+        with self._lock:
+            while True:
+                wait = self._try_acquire(ticket)
+                if wait == 0.0:
+                    break
+                remaining = timeout - (time.monotonic() - started_at)
+                if remaining <= 0:
+                    break
+                self._released.wait(min(wait, remaining))
+        if wait != 0.0:
+            self._leave_queue(ticket)
+            raise self._timeout_error(time.monotonic() - started_at)
+        self._wait_metric.observe(time.monotonic() - started_at)
+
+    @asynccontextmanager
+    async def limit(self, timeout: Optional[float] = None):
+        """Hold a slot for one model call; quota errors raised inside shrink the limit."""
+        await self.acquire(timeout)
+        try:
+            yield
+        except BaseException as e:
+            self._release(e)
+            raise
+        else:
+            self._release(None)
+
+    async def run(self, func: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """Call blocking ``func(*args)`` in the thread pool while holding a slot (released when the thread returns)."""
+        await self.acquire(timeout)
+        try:
+            call = functools.partial(contextvars.copy_context().run, func, *args)
+            future = asyncio.get_running_loop().run_in_executor(None, call)
+        except BaseException as e:
+            self._release(e)
+            raise
+        future.add_done_callback(self._release_when_done)
+        # shield: cancelling the caller must not mark the still running call as finished
+        return await asyncio.shield(future)
+
+    def _release_when_done(self, future: asyncio.Future):
+        self._release(None if future.cancelled() else future.exception())
+
+    @contextmanager
+    def limit_sync(self, timeout: Optional[float] = None):
+        """limit() for worker threads."""
+        self.acquire_sync(timeout)
+        try:
+            yield
+        except BaseException as e:
+            self._release(e)
+            raise
+        else:
+            self._release(None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "name": self.name,
+                "requests_per_minute": round(self.rate * 60, 2),
+                "tokens": round(self._tokens, 2),
+                "burst": self.capacity,
+                "concurrency_limit": int(self._limit),
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self._in_flight,
+                "waiting": len(self._queue),
+                "acquired": self._acquired,
+                "throttled": self._throttled,
+                "timeouts": self._timeouts
+            }
@@ -0,0 +1,106 @@
+"""
+SingleFlight - Coalesces identical concurrent calls into one execution.
+KISS principle: One future per in-flight key; duplicates await it instead of starting their own call.
+
+    result, shared = await design_flight.do(fingerprint, lambda: generate(...))
+
+Only calls that overlap in time are coalesced; nothing is cached after the
+first call finishes. Every caller gets the same result object (copy it before
+mutating). Coalescing is per worker process.
+"""
+import asyncio
+import hashlib
+import threading
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from utils.json_codec import dumps
+
+
+class _LeaderCancelled(Exception):
+    """The call that was running for a key was cancelled; waiters retry."""
+
+
+class SingleFlight:
+    """In-flight call registry for one kind of call (e.g. design generation)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[str, asyncio.Future] = {}
+        self._leaders = 0  # calls that ran
+        self._shared = 0  # calls answered by another call's result
+        self._lock = threading.Lock()
+
+    async def do(self, key: str, call: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run ``call`` unless an identical call is already in flight.
+
+        Returns (result, shared): shared is True when the result came from
+        another caller's execution. Exceptions are shared the same way.
+        """
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                break
+            try:
+                # shield: a waiter's cancellation must not cancel the leader's result
+                result = await asyncio.shield(future)
+            except _LeaderCancelled:
+                continue  # Take over (or join the next leader)
+            except Exception:
+                self._count(shared=True)
+                raise
+            self._count(shared=True)
+            return result, True
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self._count(shared=False)
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+            if future.done() and not future.cancelled():
+                future.exception()  # Marks the exception retrieved when nobody waited
+
+    def _count(self, shared: bool):
+        with self._lock:
+            if shared:
+                self._shared += 1
+            else:
+                self._leaders += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            leaders, shared = self._leaders, self._shared
+        total = leaders + shared
+        return {
+            "name": self.name,
+            "requests": total,
+            "executions": leaders,
+            "coalesced": shared,
+            "coalesced_rate": round(shared / total, 4) if total else 0.0,
+            "in_flight": len(self._calls)
+        }
+
+
+def fingerprint(payload: Any) -> str:
+    """Stable key for a JSON-serializable payload (dict key order does not matter)."""
+    return hashlib.sha256(dumps(_sorted(payload)).encode("utf-8")).hexdigest()
+
+
+def _sorted(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {str(key): _sorted(value[key]) for key in sorted(value, key=str)}
+    if isinstance(value, (list, tuple)):
+        return [_sorted(item) for item in value]
+    return value
@@ -0,0 +1,145 @@
+"""
+Per-request stage timing - lightweight spans, Server-Timing header and timing records.
+KISS principle: One timing object per sampled request in a context variable; spans are no-ops otherwise.
+
+    with span("gemini"):
+        response_text = await ...
+
+Spans with the same name are summed (e.g. one "products" span per product search).
+Only a sample of requests is timed (TIMING_SAMPLE_RATE); for the others span()
+returns a shared no-op object, so instrumented code costs one context variable read.
+"""
+import functools
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Iterator, Optional
+
+from config import logger, settings
+from utils.json_codec import dumps
+
+_current_timing: ContextVar[Optional["Timing"]] = ContextVar("current_timing", default=None)
+
+
+class Timing:
+    """Stage durations of one request or background job."""
+
+    __slots__ = ("name", "started_at", "stages", "attributes")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = time.perf_counter()
+        self.stages: Dict[str, list] = {}  # stage -> [total seconds, count]
+        self.attributes: Dict[str, Any] = {}
+
+    def add(self, stage: str, seconds: float):
+        entry = self.stages.get(stage)
+        if entry is None:
+            self.stages[stage] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def server_timing_header(self) -> str:
+        """Server-Timing header value, durations in milliseconds."""
+        entries = [f"{stage};dur={seconds * 1000:.1f}" for stage, (seconds, _count) in self.stages.items()]
+        entries.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(entries)
+
+    def record(self) -> Dict[str, Any]:
+        """Structured timing record (milliseconds)."""
+        return {
+            "name": self.name,
+            "total_ms": round(self.elapsed() * 1000, 1),
+            "stages": {
+                stage: {"ms": round(seconds * 1000, 1), "count": count}
+                for stage, (seconds, count) in self.stages.items()
+            },
+            **self.attributes,
+        }
+
+
+class _Span:
+    __slots__ = ("timing", "stage", "started_at")
+
+    def __init__(self, timing: Timing, stage: str):
+        self.timing = timing
+        self.stage = stage
+
+    def __enter__(self):
+        self.started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.timing.add(self.stage, time.perf_counter() - self.started_at)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(stage: str):
+    """Time a stage of the current request (no-op when the request is not sampled)."""
+    timing = _current_timing.get()
+    if timing is None:
+        return _NOOP_SPAN
+    return _Span(timing, stage)
+
+
+def set_current_timing(timing: Optional[Timing]) -> Token:
+    """Make ``timing`` the current request's timing (None stops timing)."""
+    return _current_timing.set(timing)
+
+
+def reset_current_timing(token: Token):
+    _current_timing.reset(token)
+
+
+def is_sampled() -> bool:
+    return random.random() < settings.TIMING_SAMPLE_RATE
+
+
+def log_timing(timing: Timing):
+    logger.info(f"timing {dumps(timing.record())}")
+
+
+@contextmanager
+def timing_scope(name: str) -> Iterator[Optional[Timing]]:
+    """
+    Time a background job as its own record.
+
+    Replaces the timing inherited from the request that scheduled the job
+    (that request's header is already sent) and logs the record at the end.
+    """
+    timing = Timing(name) if is_sampled() else None
+    token = _current_timing.set(timing)
+    try:
+        yield timing
+    finally:
+        _current_timing.reset(token)
+        if timing is not None:
+            log_timing(timing)
+
+
+def timed_job(name: str):
+    """Decorator for async background jobs: run the job inside timing_scope(name)."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with timing_scope(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -11,6 +11,9 @@ export const useWebSocket = () => {
   const [connectionId, setConnectionId] = useState(null);
   const [isConnected, setIsConnected] = useState(false);
   const wsRef = useRef(null);
+  // Job being followed, so it can be resumed after a reconnect
+  const activeMoodBoardIdRef = useRef(null);
+  const lastSeqRef = useRef(0);
 
   /**
    * Connect to WebSocket server
@@ -57,19 +60,43 @@ export const useWebSocket = () => {
    * @private
    */
   const handleWebSocketMessage = (data) => {
+    if (data.seq) {
+      lastSeqRef.current = Math.max(lastSeqRef.current, data.seq);
+    }
+
     switch (data.type) {
       case 'connection_established':
         setConnectionId(data.connection_id);
+        // Resume a job that was running when the previous connection dropped
+        if (activeMoodBoardIdRef.current) {
+          sendMessage({
+            type: 'resubscribe',
+            mood_board_id: activeMoodBoardIdRef.current,
+            last_seq: lastSeqRef.current
+          });
+        }
+        break;
+
+      case 'ping':
+        sendMessage({ type: 'pong' });
+        break;
+
+      case 'pong':
         break;
 
       case 'room_visualization_progress':
       case 'mood_board_progress': // Backward compatibility
+        if (data.progress?.mood_board_id && data.progress.mood_board_id !== activeMoodBoardIdRef.current) {
+          activeMoodBoardIdRef.current = data.progress.mood_board_id;
+          lastSeqRef.current = data.seq || 0;
+        }
         setProgress(data.progress);
         setIsMoodBoardLoading(true);
         break;
 
       case 'room_visualization_completed':
       case 'mood_board_completed': // Backward compatibility
+        activeMoodBoardIdRef.current = null;
         setMoodBoard(data.room_visualization || data.mood_board);
         setProgress(null);
         setIsMoodBoardLoading(false);
@@ -77,6 +104,7 @@ export const useWebSocket = () => {
 
       case 'room_visualization_error':
       case 'mood_board_error': // Backward compatibility
+        activeMoodBoardIdRef.current = null;
         setProgress({ type: 'room_visualization_error', error: data.error });
         setIsMoodBoardLoading(false);
         console.error('❌ Room visualization error:', data.error);
@@ -87,10 +115,22 @@ export const useWebSocket = () => {
     }
   };
 
+  /**
+   * Send a JSON message if the socket is open
+   * @private
+   */
+  const sendMessage = (message) => {
+    if (wsRef.current && wsRef.current.readyState === WebSocket.OPEN) {
+      wsRef.current.send(JSON.stringify(message));
+    }
+  };
+
   /**
    * Reset mood board state for new requests
    */
   const resetMoodBoardState = () => {
+    activeMoodBoardIdRef.current = null;
+    lastSeqRef.current = 0;
     setMoodBoard(null);
     setProgress(null);
     setIsMoodBoardLoading(false);